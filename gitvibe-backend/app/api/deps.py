@@ -0,0 +1,49 @@
+from typing import Awaitable, Callable
+from ..core.config import settings
+from ..services.github_service import GitHubService
+from ..services.http_client import http_client
+from ..services.cache import response_cache
+from ..services.singleflight import github_flights
+from ..services.stats import stats_warmer
+from ..services.rate_limiter import rate_limiter, Priority
+from ..services.history import history_store
+from ..services.circuit_breaker import github_breakers
+from ..services.revalidator import revalidator
+from ..services.leaderboard import leaderboards
+from ..services import deadline
+
+
+def _build_github_service(priority: Priority) -> GitHubService:
+    return GitHubService(
+        settings.GITHUB_ACCESS_TOKEN,
+        session=http_client.session,
+        cache=response_cache,
+        flights=github_flights,
+        warmer=stats_warmer,
+        scheduler=rate_limiter,
+        priority=priority,
+        history=history_store,
+        breakers=github_breakers,
+        revalidator=revalidator,
+        leaderboards=leaderboards
+    )
+
+
+def get_github_service() -> GitHubService:
+    """Provide a GitHubService bound to the app-scoped HTTP session and shared GitHub state"""
+    return _build_github_service(Priority.HIGH)
+
+
+def get_background_github_service() -> GitHubService:
+    """A GitHubService for speculative background work, shed first when budgets run low"""
+    return _build_github_service(Priority.LOW)
+
+
+def request_deadline(setting: str, extra: float = 0.0) -> Callable[[], Awaitable[None]]:
+    """Route dependency replacing REQUEST_DEADLINE_SECONDS with the named setting
+    (plus extra seconds); a setting of 0 means no deadline"""
+    async def set_deadline() -> None:
+        # Async, so it runs in the request's context rather than a worker thread
+        seconds = getattr(settings, setting)
+        deadline.override(seconds + extra if seconds else None)
+    return set_deadline
@@ -0,0 +1,18 @@
+import math
+from fastapi import HTTPException
+from ..services.circuit_breaker import CircuitOpen
+from ..services.deadline import DeadlineExceeded
+
+
+def service_unavailable(error: CircuitOpen) -> HTTPException:
+    """503 with Retry-After for a call refused by an open circuit breaker"""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
+
+
+def gateway_timeout(error: DeadlineExceeded) -> HTTPException:
+    """504 for a request whose upstream calls did not finish within its deadline"""
+    return HTTPException(status_code=504, detail=str(error))
@@ -0,0 +1,74 @@
+import time
+from typing import Awaitable, Callable
+from fastapi import Request, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..core.config import settings
+from ..services import freshness, deadline
+from ..services.metrics import http_requests, http_request_duration, http_requests_in_flight
+
+
+async def freshness_middleware(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    """Track how fresh the data behind each response is and report it in headers.
+
+    X-Data-Freshness is fresh, stale or degraded; stale responses also carry
+    X-Data-Stale-Seconds and degraded ones X-Degraded-Upstreams.
+    """
+    tracker = freshness.track()
+    response = await call_next(request)
+    response.headers.update(tracker.headers())
+    return response
+
+
+class DeadlineMiddleware:
+    """Give every request REQUEST_DEADLINE_SECONDS to finish.
+
+    Outbound GitHub and LLM calls made while serving the request stop at the
+    deadline with DeadlineExceeded. Routes can set their own budget with the
+    request_deadline dependency.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            deadline.start(settings.REQUEST_DEADLINE_SECONDS)
+        await self.app(scope, receive, send)
+
+
+class MetricsMiddleware:
+    """Count requests and time them per route until the response is complete.
+
+    A plain ASGI middleware rather than a call_next one: it adds no task or
+    stream copy per request, and a streamed (SSE) response is timed until
+    its last chunk, not until its headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        http_requests_in_flight.labels().inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.labels().dec()
+            # The route template (set by the router), so /repos/{owner}/{repo} is one series
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            method = scope["method"]
+            http_requests.labels(method, path, str(status)).inc()
+            http_request_duration.labels(method, path).observe(time.perf_counter() - start)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.endpoints import github, analyze, roast, search
+from app.endpoints import github, analyze, roast, search, diagnostics, webhooks, leaderboard
 
 api_router = APIRouter()
 
@@ -8,3 +8,6 @@ api_router.include_router(github.router, prefix="/github", tags=["GitHub"])
 api_router.include_router(analyze.router, prefix="/analyze", tags=["Analysis"])
 api_router.include_router(roast.router, prefix="/roast", tags=["Roast"])
 api_router.include_router(search.router, prefix="/search", tags=["Search"])
+api_router.include_router(leaderboard.router, prefix="/leaderboard", tags=["Leaderboard"])
+api_router.include_router(diagnostics.router, prefix="/diagnostics", tags=["Diagnostics"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["Webhooks"])
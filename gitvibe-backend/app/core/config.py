@@ -14,19 +14,118 @@ class Settings(BaseSettings):
     
     # GitHub API Settings
     GITHUB_ACCESS_TOKEN: str = os.getenv("GITHUB_ACCESS_TOKEN", "")
+    GITHUB_ACCESS_TOKENS: str = os.getenv("GITHUB_ACCESS_TOKENS", "")  # comma-separated token pool
     GITHUB_API_URL: str = "https://api.github.com"
+    GITHUB_GRAPHQL_URL: str = os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+    GRAPHQL_ENABLED: bool = os.getenv("GRAPHQL_ENABLED", "True").lower() == "true"
+    GRAPHQL_BATCH_SIZE: int = int(os.getenv("GRAPHQL_BATCH_SIZE", "50"))
+    GITHUB_WEBHOOK_SECRET: str = os.getenv("GITHUB_WEBHOOK_SECRET", "")  # empty: /webhooks/github disabled
+    
+    # Outbound HTTP Settings (shared aiohttp session)
+    HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", "100"))
+    HTTP_POOL_SIZE_PER_HOST: int = int(os.getenv("HTTP_POOL_SIZE_PER_HOST", "20"))
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+    HTTP_DNS_CACHE_TTL: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT: float = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+    HTTP_TOTAL_TIMEOUT: float = float(os.getenv("HTTP_TOTAL_TIMEOUT", "15"))
+    
+    # Request deadline: one budget per request, shared by all of its GitHub and LLM calls (0: none)
+    REQUEST_DEADLINE_SECONDS: float = float(os.getenv("REQUEST_DEADLINE_SECONDS", "10"))
     
     # Redis Settings
     REDIS_HOST: str = os.getenv("REDIS_HOST", "redis")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
     REDIS_CACHE_TTL: int = 3600  # 1 hour
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.25"))
+    REDIS_RETRY_INTERVAL: float = float(os.getenv("REDIS_RETRY_INTERVAL", "30"))
+    
+    # Response Cache Settings (L1 in-process LRU + L2 Redis)
+    CACHE_REDIS_ENABLED: bool = os.getenv("CACHE_REDIS_ENABLED", "True").lower() == "true"
+    CACHE_L1_MAX_ENTRIES: int = int(os.getenv("CACHE_L1_MAX_ENTRIES", "5000"))
+    CACHE_TTL_REPO: int = int(os.getenv("CACHE_TTL_REPO", "3600"))  # repo metadata, contributors
+    CACHE_TTL_SEARCH: int = int(os.getenv("CACHE_TTL_SEARCH", "300"))  # search/repositories
+    CACHE_TTL_STATS: int = int(os.getenv("CACHE_TTL_STATS", "1800"))  # stats/*, issue & PR counts
+    CACHE_STALE_RETENTION: int = int(os.getenv("CACHE_STALE_RETENTION", "86400"))  # keep validators after expiry
+    CACHE_STALE_WHILE_REVALIDATE: int = int(os.getenv("CACHE_STALE_WHILE_REVALIDATE", "300"))  # serve stale, refresh in background
+    
+    # Circuit breakers (GitHub REST, GitHub search, LLM)
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))  # consecutive failures to open
+    CIRCUIT_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))  # seconds open before a probe
+    
+    # Repository search (autocomplete)
+    SEARCH_FETCH_SIZE: int = int(os.getenv("SEARCH_FETCH_SIZE", "50"))  # hits fetched and cached per query
+    SEARCH_DEBOUNCE_SECONDS: float = float(os.getenv("SEARCH_DEBOUNCE_SECONDS", "0"))  # off: delays every uncached query
+    SEARCH_RESULTS_MAX_ENTRIES: int = int(os.getenv("SEARCH_RESULTS_MAX_ENTRIES", "2000"))
+    SEARCH_INDEX_MAX_REPOS: int = int(os.getenv("SEARCH_INDEX_MAX_REPOS", "20000"))
+    
+    # Speculative prefetch of the top search hits
+    PREFETCH_ENABLED: bool = os.getenv("PREFETCH_ENABLED", "False").lower() == "true"
+    PREFETCH_TOP_K: int = int(os.getenv("PREFETCH_TOP_K", "3"))
+    PREFETCH_MAX_CONCURRENCY: int = int(os.getenv("PREFETCH_MAX_CONCURRENCY", "2"))
+    PREFETCH_MIN_BUDGET: float = float(os.getenv("PREFETCH_MIN_BUDGET", "0.5"))  # core budget fraction
+    PREFETCH_TTL: int = int(os.getenv("PREFETCH_TTL", "1800"))  # window in which a visit counts as a hit
+    PREFETCH_MAX_TRACKED: int = int(os.getenv("PREFETCH_MAX_TRACKED", "5000"))
+    
+    # Background precompute of popular and tracked repositories
+    PRECOMPUTE_ENABLED: bool = os.getenv("PRECOMPUTE_ENABLED", "False").lower() == "true"
+    PRECOMPUTE_TOP_N: int = int(os.getenv("PRECOMPUTE_TOP_N", "50"))  # most requested repos kept warm
+    PRECOMPUTE_TRACKED_REPOS: str = os.getenv("PRECOMPUTE_TRACKED_REPOS", "")  # comma-separated owner/repo
+    PRECOMPUTE_INTERVAL: float = float(os.getenv("PRECOMPUTE_INTERVAL", "60"))  # seconds between passes
+    PRECOMPUTE_REFRESH_AHEAD: float = float(os.getenv("PRECOMPUTE_REFRESH_AHEAD", "300"))  # refresh this long before expiry
+    PRECOMPUTE_BUDGET_FRACTION: float = float(os.getenv("PRECOMPUTE_BUDGET_FRACTION", "0.25"))  # of each rate limit
+    PRECOMPUTE_MIN_BUDGET: float = float(os.getenv("PRECOMPUTE_MIN_BUDGET", "0.3"))  # pause below this core budget
+    PRECOMPUTE_MAX_CONCURRENCY: int = int(os.getenv("PRECOMPUTE_MAX_CONCURRENCY", "2"))
+    PRECOMPUTE_HALF_LIFE: float = float(os.getenv("PRECOMPUTE_HALF_LIFE", "3600"))  # request counts decay
+    PRECOMPUTE_MAX_TRACKED: int = int(os.getenv("PRECOMPUTE_MAX_TRACKED", "10000"))  # repos with request counts
     
     # OpenAI Settings
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "https://api.nexus.navigatelabsai.com")
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "llama-4-scout-17b-16e-instruct")
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "5"))
+    LLM_STREAM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_STREAM_TIMEOUT_SECONDS", "30"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_POOL_SIZE: int = int(os.getenv("LLM_POOL_SIZE", "20"))
+    
+    # Metric history (SQLite time series)
+    HISTORY_ENABLED: bool = os.getenv("HISTORY_ENABLED", "True").lower() == "true"
+    HISTORY_DB_PATH: str = os.getenv("HISTORY_DB_PATH", "data/history.db")
+    HISTORY_MAX_DAYS: int = int(os.getenv("HISTORY_MAX_DAYS", "365"))  # longest window /github/history serves
+    
+    # Roast cache (pools of AI roasts per repo state)
+    ROAST_CACHE_MAX_ENTRIES: int = int(os.getenv("ROAST_CACHE_MAX_ENTRIES", "2000"))
+    ROAST_CACHE_TTL: int = int(os.getenv("ROAST_CACHE_TTL", "21600"))
+    ROAST_POOL_SIZE: int = int(os.getenv("ROAST_POOL_SIZE", "3"))
+    ROAST_REFILL_IDLE_DELAY: float = float(os.getenv("ROAST_REFILL_IDLE_DELAY", "1"))
+    
+    # Batch roasts (many repos per LLM prompt)
+    ROAST_BATCH_MAX_REPOS: int = int(os.getenv("ROAST_BATCH_MAX_REPOS", "50"))
+    ROAST_BATCH_CHUNK_SIZE: int = int(os.getenv("ROAST_BATCH_CHUNK_SIZE", "10"))
+    ROAST_BATCH_TIMEOUT_SECONDS: float = float(os.getenv("ROAST_BATCH_TIMEOUT_SECONDS", "15"))
+    
+    # Background warm-up of stats endpoints that answer 202
+    STATS_POLL_INITIAL_DELAY: float = float(os.getenv("STATS_POLL_INITIAL_DELAY", "2"))
+    STATS_POLL_MAX_DELAY: float = float(os.getenv("STATS_POLL_MAX_DELAY", "60"))
+    STATS_POLL_MAX_ATTEMPTS: int = int(os.getenv("STATS_POLL_MAX_ATTEMPTS", "8"))
+    
+    # Repository comparison
+    COMPARE_MAX_REPOS: int = int(os.getenv("COMPARE_MAX_REPOS", "100"))
+    COMPARE_MAX_CONCURRENCY: int = int(os.getenv("COMPARE_MAX_CONCURRENCY", "10"))
+    COMPARE_TIMEOUT_SECONDS: float = float(os.getenv("COMPARE_TIMEOUT_SECONDS", "20"))
+    
+    # Leaderboards over an organization or a list of repositories
+    LEADERBOARD_MAX_REPOS: int = int(os.getenv("LEADERBOARD_MAX_REPOS", "1000"))
+    LEADERBOARD_MAX_CONCURRENCY: int = int(os.getenv("LEADERBOARD_MAX_CONCURRENCY", "10"))  # repos scored per wave
+    LEADERBOARD_MAX_BOARDS: int = int(os.getenv("LEADERBOARD_MAX_BOARDS", "50"))
+    LEADERBOARD_REFRESH_INTERVAL: int = int(os.getenv("LEADERBOARD_REFRESH_INTERVAL", "3600"))  # rescore boards older than this
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
+    RATE_LIMIT_LOW_PRIORITY_RESERVE: float = float(os.getenv("RATE_LIMIT_LOW_PRIORITY_RESERVE", "0.2"))
+    RATE_LIMIT_MAX_WAIT: float = float(os.getenv("RATE_LIMIT_MAX_WAIT", "10"))
+    RATE_LIMIT_MAX_RETRIES: int = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "2"))
     
     class Config:
         case_sensitive = True
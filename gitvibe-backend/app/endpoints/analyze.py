@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Dict, Any, Optional
-from ..services.github_service import GitHubService
+from ..services.github_service import GitHubService, is_upstream_failure
+from ..services import freshness, deadline
+from ..services.deadline import DeadlineExceeded
+from ..api.deps import get_github_service, request_deadline
 from ..core.config import settings
 import logging
 import asyncio
@@ -8,60 +11,76 @@ import asyncio
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-@router.get("/compare")
+@router.get("/compare", dependencies=[Depends(request_deadline("COMPARE_TIMEOUT_SECONDS"))])
 async def compare_repos(
-    repos: List[str] = Query(..., description="List of GitHub repository URLs to compare")
+    repos: List[str] = Query(..., description="List of GitHub repository URLs to compare"),
+    github_service: GitHubService = Depends(get_github_service)
 ) -> Dict[str, Any]:
     """
-    Compare multiple GitHub repositories
+    Compare multiple GitHub repositories.
+
+    Repositories not analyzed by the request deadline (COMPARE_TIMEOUT_SECONDS)
+    are skipped, so the comparison covers those that finished in time.
     """
-    if len(repos) < 2 or len(repos) > 5:
+    repos = list(dict.fromkeys(repos))  # Drop duplicates, keep order
+    if len(repos) < 2 or len(repos) > settings.COMPARE_MAX_REPOS:
         raise HTTPException(
             status_code=400,
-            detail="Please provide between 2 and 5 repositories to compare"
+            detail=f"Please provide between 2 and {settings.COMPARE_MAX_REPOS} repositories to compare"
         )
     
     try:
-        github_service = GitHubService(settings.GITHUB_ACCESS_TOKEN)
+        # Fetch and score every repository: batched over GraphQL when a token
+        # is configured, otherwise over REST with bounded concurrency
+        loader = github_service.batch_loader()
+        semaphore = asyncio.Semaphore(settings.COMPARE_MAX_CONCURRENCY)
+        
+        async def analyze_repo(repo_url: str) -> Dict[str, Any]:
+            if loader is not None:
+                owner, repo_name = github_service.parse_repo_url(repo_url)
+                data = await loader.load(owner, repo_name)
+                repo_info = data["info"]
+                owner, repo_name = repo_info["full_name"].split("/")
+                score = await github_service.score_and_record(owner, repo_name, repo_info, data["stats"])
+                return {**repo_info, "vibe_score": score}
+            
+            async with semaphore:
+                repo_info = await github_service.get_repo_info(repo_url)
+                score = await github_service.calculate_vibe_score_from_info(repo_info)
+                return {**repo_info, "vibe_score": score}
         
-        # Fetch data for all repositories in parallel
-        tasks = [github_service.get_repo_info(repo) for repo in repos]
-        repos_data = await asyncio.gather(*tasks, return_exceptions=True)
+        # Every outbound call stops at the deadline; the wait is a backstop for the rest
+        tasks = [asyncio.ensure_future(analyze_repo(repo)) for repo in repos]
+        done, pending = await asyncio.wait(tasks, timeout=deadline.remaining())
+        for task in pending:
+            task.cancel()
+        # Let the cancelled tasks unwind (release the semaphore, close responses) before answering
+        await asyncio.gather(*pending, return_exceptions=True)
         
-        # Check for any errors
-        valid_repos = []
-        for i, repo_data in enumerate(repos_data):
-            if isinstance(repo_data, Exception):
-                logger.warning(f"Error fetching data for {repos[i]}: {str(repo_data)}")
-                continue
-            valid_repos.append(repo_data)
+        # Collect results, noting repos that failed or missed the latency budget
+        results = []
+        skipped = []
+        for repo_url, task in zip(repos, tasks):
+            if task in pending or isinstance(task.exception(), DeadlineExceeded):
+                logger.warning(f"Timed out analyzing {repo_url}")
+                skipped.append({"repo": repo_url, "reason": "timeout"})
+                freshness.note_degraded("github")
+            elif task.exception() is not None:
+                logger.warning(f"Error analyzing {repo_url}: {str(task.exception())}")
+                skipped.append({"repo": repo_url, "reason": str(task.exception())})
+                if is_upstream_failure(task.exception()):
+                    freshness.note_degraded("github")
+            else:
+                results.append(task.result())
         
-        if len(valid_repos) < 2:
+        if len(results) < 2:
+            timed_out = any(s["reason"] == "timeout" for s in skipped)
             raise HTTPException(
-                status_code=400,
+                status_code=504 if timed_out else 400,
                 detail="Could not fetch data for enough repositories to compare"
+                + (" in time" if timed_out else "")
             )
         
-        # Calculate scores for each repo
-        score_tasks = []
-        for repo in valid_repos:
-            owner, repo_name = repo["full_name"].split('/')
-            score_tasks.append(github_service.calculate_vibe_score(owner, repo_name))
-        
-        scores = await asyncio.gather(*score_tasks, return_exceptions=True)
-        
-        # Combine data
-        results = []
-        for repo, score in zip(valid_repos, scores):
-            if isinstance(score, Exception):
-                logger.warning(f"Error calculating score for {repo['full_name']}: {str(score)}")
-                continue
-                
-            results.append({
-                **repo,
-                "vibe_score": score
-            })
-        
         # Sort by score (descending)
         results.sort(key=lambda x: x["vibe_score"]["score"], reverse=True)
         
@@ -83,9 +102,12 @@ async def compare_repos(
         return {
             "status": "success",
             "count": len(results),
-            "repositories": results
+            "repositories": results,
+            "skipped": skipped
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error comparing repositories: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
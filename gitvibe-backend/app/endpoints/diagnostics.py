@@ -0,0 +1,123 @@
+from fastapi import APIRouter
+from typing import Dict, Any
+from ..services.cache import response_cache
+from ..services.singleflight import github_flights
+from ..services.stats import stats_warmer
+from ..services.rate_limiter import rate_limiter
+from ..services.llm_service import llm_client
+from ..services.roast_cache import roast_cache
+from ..services.search_service import repo_search
+from ..services.prefetch import prefetcher
+from ..services.precompute import precomputer
+from ..services.leaderboard import leaderboards
+from ..services.history import history_store
+from ..services.circuit_breaker import github_breaker, github_search_breaker, llm_breaker
+from ..services.revalidator import revalidator
+from ..services.webhooks import webhooks
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/cache")
+async def cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss counters for the GitHub response cache
+    """
+    return {"status": "success", "data": response_cache.stats()}
+
+@router.get("/singleflight")
+async def singleflight_stats() -> Dict[str, Any]:
+    """
+    Coalescing counters for identical in-flight GitHub requests
+    """
+    return {
+        "status": "success",
+        "data": {**github_flights.counters, "in_flight": github_flights.in_flight()}
+    }
+
+@router.get("/stats-warmup")
+async def stats_warmup() -> Dict[str, Any]:
+    """
+    Background polling of GitHub statistics that are still being computed
+    """
+    return {
+        "status": "success",
+        "data": {**stats_warmer.counters, "pending": stats_warmer.pending()}
+    }
+
+@router.get("/rate-limit")
+async def rate_limit_budgets() -> Dict[str, Any]:
+    """
+    Current GitHub rate-limit budgets per token and bucket
+    """
+    return {"status": "success", "data": rate_limiter.snapshot()}
+
+@router.get("/llm")
+async def llm_stats() -> Dict[str, Any]:
+    """
+    Call, timeout and concurrency counters for the shared LLM client
+    """
+    return {"status": "success", "data": llm_client.stats()}
+
+@router.get("/roast-cache")
+async def roast_cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss and background refill counters for the AI roast pools
+    """
+    return {"status": "success", "data": roast_cache.stats()}
+
+@router.get("/search")
+async def search_stats() -> Dict[str, Any]:
+    """
+    Where repository searches were answered from, and the size of the local repo index
+    """
+    return {"status": "success", "data": repo_search.stats()}
+
+@router.get("/prefetch")
+async def prefetch_stats() -> Dict[str, Any]:
+    """
+    Speculative prefetch of top search hits, and how often the prefetched repos were then opened
+    """
+    return {"status": "success", "data": prefetcher.stats()}
+
+@router.get("/precompute")
+async def precompute_stats() -> Dict[str, Any]:
+    """
+    Background refreshes of popular and tracked repositories, and the current watchlist
+    """
+    return {"status": "success", "data": precomputer.stats()}
+
+@router.get("/leaderboards")
+async def leaderboard_stats() -> Dict[str, Any]:
+    """
+    Leaderboards held in memory, with their ingestion state, and repositories scored for them
+    """
+    return {"status": "success", "data": leaderboards.stats()}
+
+@router.get("/history")
+async def history_stats() -> Dict[str, Any]:
+    """
+    Snapshots and commit weeks written to the metric history store, and its row counts
+    """
+    return {"status": "success", "data": await history_store.stats()}
+
+@router.get("/circuits")
+async def circuit_stats() -> Dict[str, Any]:
+    """
+    Circuit breaker state per upstream, and background refreshes of stale cache entries
+    """
+    return {
+        "status": "success",
+        "data": {
+            "circuits": {breaker.name: breaker.stats() for breaker in (github_breaker, github_search_breaker, llm_breaker)},
+            "revalidation": revalidator.stats()
+        }
+    }
+
+@router.get("/webhooks")
+async def webhook_stats() -> Dict[str, Any]:
+    """
+    GitHub webhook deliveries received, applied to the cache, ignored and rejected
+    """
+    return {"status": "success", "data": webhooks.stats()}
@@ -1,6 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional, Dict, Any
 from ..services.github_service import GitHubService
+from ..api.deps import get_github_service
+from ..api.errors import service_unavailable, gateway_timeout
+from ..services.circuit_breaker import CircuitOpen
+from ..services.deadline import DeadlineExceeded
+from ..services.prefetch import prefetcher
+from ..services.precompute import precomputer
+from ..services.history import history_store
 from ..core.config import settings
 import logging
 
@@ -9,15 +16,22 @@ logger = logging.getLogger(__name__)
 
 @router.get("/repo-info")
 async def get_repo_info(
-    repo_url: str = Query(..., description="GitHub repository URL (e.g., https://github.com/username/repo)")
+    repo_url: str = Query(..., description="GitHub repository URL (e.g., https://github.com/username/repo)"),
+    github_service: GitHubService = Depends(get_github_service)
 ) -> Dict[str, Any]:
     """
     Get basic information about a GitHub repository
     """
     try:
-        github_service = GitHubService(settings.GITHUB_ACCESS_TOKEN)
+        owner, repo = github_service.parse_repo_url(repo_url)
+        prefetcher.record_visit(owner, repo)
+        precomputer.record_request(owner, repo)
         repo_info = await github_service.get_repo_info(repo_url)
         return {"status": "success", "data": repo_info}
+    except CircuitOpen as e:
+        raise service_unavailable(e)
+    except DeadlineExceeded as e:
+        raise gateway_timeout(e)
     except Exception as e:
         logger.error(f"Error fetching repo info: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -26,15 +40,19 @@ async def get_repo_info(
 async def get_repo_stats(
     owner: str = Query(..., description="Repository owner"),
     repo: str = Query(..., description="Repository name"),
-    days: int = Query(30, description="Number of days to analyze")
+    days: int = Query(30, description="Number of days to analyze"),
+    github_service: GitHubService = Depends(get_github_service)
 ) -> Dict[str, Any]:
     """
     Get repository statistics including commits, issues, and PRs
     """
     try:
-        github_service = GitHubService(settings.GITHUB_ACCESS_TOKEN)
         stats = await github_service.get_repo_stats(owner, repo, days)
         return {"status": "success", "data": stats}
+    except CircuitOpen as e:
+        raise service_unavailable(e)
+    except DeadlineExceeded as e:
+        raise gateway_timeout(e)
     except Exception as e:
         logger.error(f"Error fetching repo stats: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -43,15 +61,39 @@ async def get_repo_stats(
 async def get_vibe_score(
     owner: str = Query(..., description="Repository owner"),
     repo: str = Query(..., description="Repository name"),
-    days: int = Query(30, description="Days to analyze for activity")
+    days: int = Query(30, description="Days to analyze for activity"),
+    github_service: GitHubService = Depends(get_github_service)
 ) -> Dict[str, Any]:
     """
     Calculate a 'vibe score' for the repository
     """
     try:
-        github_service = GitHubService(settings.GITHUB_ACCESS_TOKEN)
+        prefetcher.record_visit(owner, repo)
+        precomputer.record_request(owner, repo)
         vibe_score = await github_service.calculate_vibe_score(owner, repo, days)
         return {"status": "success", "data": vibe_score}
+    except CircuitOpen as e:
+        raise service_unavailable(e)
+    except DeadlineExceeded as e:
+        raise gateway_timeout(e)
     except Exception as e:
         logger.error(f"Error calculating vibe score: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/history")
+async def get_history(
+    owner: str = Query(..., description="Repository owner"),
+    repo: str = Query(..., description="Repository name"),
+    days: int = Query(90, ge=1, description="Number of days of history to return")
+) -> Dict[str, Any]:
+    """
+    Recorded daily snapshots (stars, forks, open issues/PRs, score) and weekly commits
+    """
+    if not settings.HISTORY_ENABLED:
+        raise HTTPException(status_code=404, detail="Metric history is disabled")
+    try:
+        history = await history_store.history(owner, repo, min(days, settings.HISTORY_MAX_DAYS))
+        return {"status": "success", "data": history}
+    except Exception as e:
+        logger.error(f"Error reading history: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
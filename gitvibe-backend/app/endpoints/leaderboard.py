@@ -0,0 +1,71 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, Any, Tuple
+from ..services.github_service import GitHubService
+from ..services.leaderboard import Leaderboard, leaderboards, org_board_id, repos_board_id
+from ..api.deps import get_background_github_service
+from ..models.leaderboard import LeaderboardRequest
+from ..core.config import settings
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+PAGE = Query(1, ge=1, description="Page of the ranking, 1-based")
+PER_PAGE = Query(25, ge=1, le=100, description="Repositories per page")
+
+
+def parse_repo_name(value: str) -> Tuple[str, str]:
+    """(owner, repo) from a GitHub repository URL or an owner/repo name"""
+    if "github.com" in value:
+        return GitHubService.parse_repo_url(value)
+    owner, _, repo = value.strip().strip("/").partition("/")
+    if not owner or not repo or "/" in repo:
+        raise ValueError(f"Invalid repository: {value}")
+    return owner, repo
+
+
+@router.get("/orgs/{org}")
+async def org_leaderboard(org: str, page: int = PAGE, per_page: int = PER_PAGE) -> Dict[str, Any]:
+    """
+    Repositories of a GitHub organization ranked by vibe score.
+
+    The first request starts scoring the organization in the background:
+    `state` is `ingesting` and rows appear as repositories are scored.
+    """
+    board = leaderboards.ensure(Leaderboard(org_board_id(org), org=org), get_background_github_service)
+    return {"status": "success", "data": board.page(page, per_page)}
+
+
+@router.post("/repos")
+async def repos_leaderboard(request: LeaderboardRequest, per_page: int = PER_PAGE) -> Dict[str, Any]:
+    """
+    Rank a list of repositories by vibe score; returns the board's id and first page.
+
+    Page through it with GET /leaderboard/{id}. The same set of repositories
+    always gets the same board.
+    """
+    names = list(dict.fromkeys(request.repos))
+    if not names or len(names) > settings.LEADERBOARD_MAX_REPOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Please provide between 1 and {settings.LEADERBOARD_MAX_REPOS} repositories to rank"
+        )
+    try:
+        repos = list(dict.fromkeys(parse_repo_name(name) for name in names))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    board_id = repos_board_id([f"{owner}/{repo}" for owner, repo in repos])
+    board = leaderboards.ensure(Leaderboard(board_id, repos=repos), get_background_github_service)
+    return {"status": "success", "data": board.page(1, per_page)}
+
+
+@router.get("/{board_id}")
+async def get_leaderboard(board_id: str, page: int = PAGE, per_page: int = PER_PAGE) -> Dict[str, Any]:
+    """
+    One page of a leaderboard created by /leaderboard/orgs/{org} or /leaderboard/repos
+    """
+    board = leaderboards.get(board_id)
+    if board is None:
+        raise HTTPException(status_code=404, detail="Leaderboard not found (it may have expired)")
+    board = leaderboards.ensure(board, get_background_github_service)
+    return {"status": "success", "data": board.page(page, per_page)}
@@ -1,23 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Dict, Any, Optional
-import openai
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, AsyncIterator, List, Optional
 from ..core.config import settings
+from ..services.llm_service import llm_client, LLMTimeout
+from ..services.circuit_breaker import CircuitOpen
+from ..services.deadline import DeadlineExceeded
+from ..api.deps import request_deadline
+from ..services.roast_cache import roast_cache, roast_key
+from ..services.precompute import precomputer
+from ..services.roast_batch import BatchItem, batch_messages, parse_batch_roasts
+from ..models.roast import BatchRoastRequest
+import asyncio
 import logging
 import json
-import openai
-from functools import lru_cache
-import time
+import random
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Roast API client
-if settings.OPENAI_API_KEY:
-    client = openai.OpenAI(
-        api_key=settings.OPENAI_API_KEY,
-        base_url="https://api.nexus.navigatelabsai.com"
-    )
-
 # Predefined roast templates for different scenarios
 ROAST_TEMPLATES = {
     "inactive": [
@@ -43,6 +43,39 @@ ROAST_TEMPLATES = {
 }
 
 
+def template_roast(repo_name: str, owner: str, stars: int, issues: int, last_commit_days: int) -> str:
+    """Pick and fill a roast template that fits the repo stats"""
+    # Select template based on repo stats
+    template_key = "inactive" if last_commit_days > 90 else "active"
+    if issues > 100:
+        template_key = "many_issues"
+    elif stars < 10 and stars > 0:
+        template_key = "few_stars"
+
+    # Get a random template for the selected key
+    template = random.choice(ROAST_TEMPLATES[template_key])
+
+    # Format the template with repo data
+    return template.format(
+        repo_name=repo_name,
+        owner=owner,
+        stars_count=stars,
+        issues_count=issues,
+        days_since_commit=last_commit_days
+    )
+
+
+def roast_messages(roast: str, repo_name: str, owner: str, score: float) -> List[Dict[str, str]]:
+    """Chat messages asking the LLM to punch up a template roast"""
+    # Shorter, more focused prompt for faster responses
+    prompt = f"""Roast the GitHub repo {owner}/{repo_name} (Score: {score}/100) with this starter: "{roast}"
+    Be witty and brief (max 2 sentences). No meanness."""
+    return [
+        {"role": "system", "content": "You are a witty AI that roasts GitHub repos briefly and humorously."},
+        {"role": "user", "content": prompt}
+    ]
+
+
 @router.get("/generate")
 async def generate_roast(
     repo_name: str = Query(..., description="Repository name"),
@@ -57,34 +90,29 @@ async def generate_roast(
     Generate a roast or hype message for the repository
     """
     try:
-        # Select template based on repo stats
-        template_key = "inactive" if last_commit_days > 90 else "active"
-        if issues > 100:
-            template_key = "many_issues"
-        elif stars < 10 and stars > 0:
-            template_key = "few_stars"
-
-        # Get a random template for the selected key
-        import random
-        template = random.choice(ROAST_TEMPLATES[template_key])
-
-        # Format the template with repo data
-        roast = template.format(
-            repo_name=repo_name,
-            owner=owner,
-            stars_count=stars,
-            issues_count=issues,
-            days_since_commit=last_commit_days
-        )
+        roast = template_roast(repo_name, owner, stars, issues, last_commit_days)
 
         # If we have OpenAI API key, enhance the roast with AI
-        if settings.OPENAI_API_KEY:
+        if llm_client.enabled:
+            key = roast_key(owner, repo_name, vibe, score, stars, issues, last_commit_days)
+            pooled = roast_cache.get(key)
+            if pooled is not None:
+                schedule_pool_refill(key, repo_name, owner, score, stars, issues, last_commit_days)
+                return {
+                    "status": "success",
+                    "roast": pooled,
+                    "ai_enhanced": True,
+                    "cached": True
+                }
             try:
-                enhanced_roast = await enhance_roast_with_ai(roast, repo_name, owner, vibe, score)
+                enhanced_roast = await enhance_roast_with_ai(roast, repo_name, owner, vibe, score, cache_key=key)
+                if roast_cache.size(key):
+                    schedule_pool_refill(key, repo_name, owner, score, stars, issues, last_commit_days)
                 return {
                     "status": "success",
                     "roast": enhanced_roast,
-                    "ai_enhanced": True
+                    "ai_enhanced": True,
+                    "cached": False
                 }
             except Exception as e:
                 logger.warning(f"Failed to enhance roast with AI: {str(e)}")
@@ -93,7 +121,8 @@ async def generate_roast(
         return {
             "status": "success",
             "roast": roast,
-            "ai_enhanced": False
+            "ai_enhanced": False,
+            "cached": False
         }
 
     except Exception as e:
@@ -101,33 +130,175 @@ async def generate_roast(
         raise HTTPException(status_code=500, detail="Failed to generate roast")
 
 
-async def enhance_roast_with_ai(roast: str, repo_name: str, owner: str, vibe: str, score: float) -> str:
-    """Enhance the roast using OpenAI's API with timeout handling"""
-    import asyncio
-    from concurrent.futures import TimeoutError
+# Routes bound by their own LLM timeouts get a second more, to answer once those expire
+@router.post("/batch", dependencies=[Depends(request_deadline("ROAST_BATCH_TIMEOUT_SECONDS", extra=1))])
+async def batch_roast(request: BatchRoastRequest) -> Dict[str, Any]:
+    """
+    Roast many repositories at once, packing them into a few LLM prompts
+    """
+    repos = request.repos
+    if not repos or len(repos) > settings.ROAST_BATCH_MAX_REPOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Please provide between 1 and {settings.ROAST_BATCH_MAX_REPOS} repositories to roast"
+        )
 
-    # Shorter, more focused prompt for faster responses
-    prompt = f"""Roast the GitHub repo {owner}/{repo_name} (Score: {score}/100) with this starter: "{roast}"
-    Be witty and brief (max 2 sentences). No meanness."""
+    templates = [template_roast(r.repo_name, r.owner, r.stars, r.issues, r.last_commit_days) for r in repos]
+    results: List[Dict[str, Any]] = [{"roast": roast, "ai_enhanced": False, "cached": False} for roast in templates]
+    llm_calls = 0
 
-    try:
-        # Set a timeout for the API call (5 seconds)
-        async def call_api_with_timeout():
-            return client.chat.completions.create(
-                model="llama-4-scout-17b-16e-instruct",  # Using a smaller, faster model
-                messages=[
-                    {"role": "system", "content": "You are a witty AI that roasts GitHub repos briefly and humorously."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=60,  # Reducing token count for faster response
-                temperature=0.4,  # Lower temperature for more predictable responses
+    if llm_client.enabled:
+        # Serve what the roast pools already have; prompt once per distinct key for the rest
+        misses: Dict[str, List[int]] = {}
+        for i, r in enumerate(repos):
+            key = roast_key(r.owner, r.repo_name, r.vibe, r.score, r.stars, r.issues, r.last_commit_days)
+            pooled = roast_cache.get(key)
+            if pooled is not None:
+                results[i] = {"roast": pooled, "ai_enhanced": True, "cached": True}
+            else:
+                misses.setdefault(key, []).append(i)
+
+        keys = list(misses)
+        size = max(1, settings.ROAST_BATCH_CHUNK_SIZE)
+        chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+
+        async def roast_chunk(chunk: List[str]) -> Dict[int, str]:
+            items: List[BatchItem] = []
+            for key in chunk:
+                i = misses[key][0]
+                items.append((repos[i].owner, repos[i].repo_name, repos[i].score, templates[i]))
+            text = await llm_client.complete(
+                batch_messages(items),
+                max_tokens=60 * len(items) + 20,
+                temperature=0.4,
+                timeout=settings.ROAST_BATCH_TIMEOUT_SECONDS
             )
+            return parse_batch_roasts(text, len(items))
+
+        outputs = await asyncio.gather(*(roast_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        llm_calls = len(chunks)
+        for chunk, output in zip(chunks, outputs):
+            if isinstance(output, BaseException):
+                logger.warning(f"Batch roast prompt failed, using templates for {len(chunk)} repos: {str(output)}")
+                continue
+            if len(output) < len(chunk):
+                logger.warning(f"Batch roast dropped {len(chunk) - len(output)} of {len(chunk)} repos, using templates")
+            for j, key in enumerate(chunk):
+                if j in output:
+                    roast_cache.add(key, output[j])
+                    for i in misses[key]:
+                        results[i] = {"roast": output[j], "ai_enhanced": True, "cached": False}
+
+    return {
+        "status": "success",
+        "count": len(results),
+        "llm_calls": llm_calls,
+        "roasts": [
+            {"owner": r.owner, "repo_name": r.repo_name, **result}
+            for r, result in zip(repos, results)
+        ]
+    }
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/stream", dependencies=[Depends(request_deadline("LLM_STREAM_TIMEOUT_SECONDS", extra=1))])
+async def stream_roast(
+    repo_name: str = Query(..., description="Repository name"),
+    owner: str = Query(..., description="Repository owner"),
+    vibe: str = Query(..., description="The vibe of the repository"),
+    score: float = Query(..., description="The vibe score"),
+    stars: int = Query(0, description="Number of stars"),
+    issues: int = Query(0, description="Number of open issues"),
+    last_commit_days: int = Query(0, description="Days since last commit")
+) -> StreamingResponse:
+    """
+    Stream a roast over Server-Sent Events: the template roast first, then AI tokens as they arrive
+    """
+    roast = template_roast(repo_name, owner, stars, issues, last_commit_days)
+
+    async def events() -> AsyncIterator[str]:
+        yield sse_event("template", {"roast": roast})
+        if not llm_client.enabled:
+            yield sse_event("done", {"roast": roast, "ai_enhanced": False, "cached": False})
+            return
+
+        key = roast_key(owner, repo_name, vibe, score, stars, issues, last_commit_days)
+        pooled = roast_cache.get(key)
+        if pooled is not None:
+            schedule_pool_refill(key, repo_name, owner, score, stars, issues, last_commit_days)
+            yield sse_event("done", {"roast": pooled, "ai_enhanced": True, "cached": True})
+            return
+
+        # Starlette cancels this generator when the client disconnects; the LLM
+        # stream then closes its upstream connection and the generation stops
+        tokens: List[str] = []
+        try:
+            async for token in llm_client.stream(roast_messages(roast, repo_name, owner, score), max_tokens=60):
+                tokens.append(token)
+                yield sse_event("token", {"text": token})
+        except Exception as e:
+            logger.warning(f"Roast stream failed for {owner}/{repo_name}: {str(e)}")
+            yield sse_event("error", {"message": "AI roast unavailable"})
+            yield sse_event("done", {"roast": roast, "ai_enhanced": False, "cached": False})
+            return
+
+        enhanced = "".join(tokens).strip()
+        if not enhanced:
+            yield sse_event("done", {"roast": roast, "ai_enhanced": False, "cached": False})
+            return
+        roast_cache.add(key, enhanced)
+        schedule_pool_refill(key, repo_name, owner, score, stars, issues, last_commit_days)
+        yield sse_event("done", {"roast": enhanced, "ai_enhanced": True, "cached": False})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def schedule_pool_refill(
+    key: str, repo_name: str, owner: str, score: float, stars: int, issues: int, last_commit_days: int
+) -> None:
+    """Top up the key's roast pool in the background, each from a fresh template.
+
+    The precomputer also keeps the pool renewed while the repository is watched.
+    """
+    async def generate() -> str:
+        roast = template_roast(repo_name, owner, stars, issues, last_commit_days)
+        # A higher temperature than the foreground call, for variety across the pool
+        return await llm_client.complete(roast_messages(roast, repo_name, owner, score), max_tokens=60, temperature=0.9)
+
+    roast_cache.schedule_refill(key, generate)
+    precomputer.record_roast(owner, repo_name, key, generate)
+
+
+async def enhance_roast_with_ai(
+    roast: str, repo_name: str, owner: str, vibe: str, score: float, cache_key: Optional[str] = None
+) -> str:
+    """Enhance the roast using the shared async LLM client with timeout handling.
+
+    Successful roasts are added to the roast pool under cache_key, if given.
+    """
+    try:
+        # The call is awaited (never blocking the event loop) and cancelled after LLM_TIMEOUT_SECONDS
+        enhanced = await llm_client.complete(
+            roast_messages(roast, repo_name, owner, score),
+            max_tokens=60,  # Reducing token count for faster response
+            temperature=0.4,  # Lower temperature for more predictable responses
+        )
+        if cache_key is not None:
+            roast_cache.add(cache_key, enhanced)
+        return enhanced
 
-        # Execute with timeout
-        response = await asyncio.wait_for(call_api_with_timeout(), timeout=5.0)
-        return response.choices[0].message.content.strip()
+    except (CircuitOpen, DeadlineExceeded):
+        raise  # The LLM is down or we are out of time: let the caller serve the plain template roast
 
-    except (TimeoutError, asyncio.TimeoutError):
+    except LLMTimeout:
         logger.warning(f"OpenAI API call timed out for {owner}/{repo_name}")
         return f"{roast} (But our AI writer got distracted by a squirrel...)"
 
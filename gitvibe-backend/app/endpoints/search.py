@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Dict, Any, List
 from ..services.github_service import GitHubService
-from ..core.config import settings
+from ..services.search_service import repo_search
+from ..api.deps import get_github_service, get_background_github_service
+from ..api.errors import service_unavailable, gateway_timeout
+from ..services.circuit_breaker import CircuitOpen
+from ..services.deadline import DeadlineExceeded
+from ..services.prefetch import prefetcher
 import logging
 
 router = APIRouter()
@@ -10,23 +15,32 @@ logger = logging.getLogger(__name__)
 @router.get("/repositories")
 async def search_repositories(
     query: str = Query(..., description="Search query for repositories"),
-    limit: int = Query(5, description="Maximum number of results to return")
+    limit: int = Query(5, description="Maximum number of results to return"),
+    github_service: GitHubService = Depends(get_github_service)
 ) -> Dict[str, Any]:
     """
     Search for GitHub repositories based on a query string
     """
     try:
         logger.info(f"Searching repositories with query: {query}")
-        github_service = GitHubService(settings.GITHUB_ACCESS_TOKEN)
         
-        # Use the GitHub service to search for repositories
-        search_results = await github_service.search_repositories(query, limit)
+        # Served from cached results, the local repo index or GitHub, cheapest first
+        results = await repo_search.search(github_service, query, limit)
+        
+        # Warm the cache for the hits the user is likely to open next (not while they are still typing)
+        if results["source"] != "debounced":
+            prefetcher.schedule(results["items"], get_background_github_service)
         
         return {
             "status": "success",
-            "count": len(search_results),
-            "items": search_results
+            "count": len(results["items"]),
+            "items": results["items"],
+            "source": results["source"]
         }
+    except CircuitOpen as e:
+        raise service_unavailable(e)
+    except DeadlineExceeded as e:
+        raise gateway_timeout(e)
     except Exception as e:
         logger.error(f"Error searching repositories: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
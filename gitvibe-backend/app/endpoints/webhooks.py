@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from typing import Dict, Any, Optional
+from ..services.github_service import GitHubService
+from ..services.webhooks import webhooks, verify_signature
+from ..api.deps import get_github_service
+from ..core.config import settings
+import json
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.post("/github")
+async def github_webhook(
+    request: Request,
+    x_github_event: str = Header(..., description="Event name, e.g. push or star"),
+    x_hub_signature_256: Optional[str] = Header(None, description="sha256=<HMAC of the body with the webhook secret>"),
+    github_service: GitHubService = Depends(get_github_service)
+) -> Dict[str, Any]:
+    """
+    Receive a GitHub webhook and refresh the cached data of the repository it concerns
+    """
+    if not settings.GITHUB_WEBHOOK_SECRET:
+        raise HTTPException(status_code=404, detail="Webhooks are disabled")
+    body = await request.body()
+    if not verify_signature(settings.GITHUB_WEBHOOK_SECRET, body, x_hub_signature_256):
+        webhooks.counters["rejected"] += 1
+        logger.warning(f"Rejected {x_github_event} webhook with a missing or invalid signature")
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    if x_github_event == "ping":
+        return {"status": "success", "data": {"event": "ping"}}
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Webhook body is not JSON")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Webhook body is not a JSON object")
+
+    try:
+        result = await webhooks.handle(github_service, x_github_event, payload)
+        return {"status": "success", "data": result}
+    except Exception as e:
+        logger.error(f"Error handling {x_github_event} webhook: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
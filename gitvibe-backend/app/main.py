@@ -1,7 +1,20 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
+from app.services.http_client import http_client
+from app.services.cache import response_cache
+from app.services.stats import stats_warmer
+from app.services.llm_service import llm_client
+from app.services.roast_cache import roast_cache
+from app.services.prefetch import prefetcher
+from app.services.precompute import precomputer
+from app.services.leaderboard import leaderboards
+from app.services.history import history_store
+from app.services.revalidator import revalidator
+from app.services.metrics import registry, CONTENT_TYPE
+from app.api.deps import get_background_github_service
+from app.api.middleware import freshness_middleware, DeadlineMiddleware, MetricsMiddleware
 import logging
 import sys
 import os
@@ -17,9 +30,22 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting GitVibe API...")
+    await http_client.start()
+    if settings.PRECOMPUTE_ENABLED:
+        precomputer.start(get_background_github_service)
     yield
     # Shutdown
     logger.info("Shutting down GitVibe API...")
+    await precomputer.close()
+    await leaderboards.close()
+    await prefetcher.close()
+    await revalidator.close()
+    await stats_warmer.close()
+    await roast_cache.close()
+    await http_client.close()
+    await llm_client.close()
+    await response_cache.close()
+    await history_store.close()
 
 app = FastAPI(
     title="GitVibe API",
@@ -38,11 +64,25 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Report data freshness (fresh / stale / degraded) on every response
+app.middleware("http")(freshness_middleware)
+
+# Request-scoped deadline for every outbound GitHub and LLM call
+app.add_middleware(DeadlineMiddleware)
+
+# Request counts and latency per route, for /metrics (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware)
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "message": "GitVibe API is up and running!"}
 
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
 # Import and include routers
 from .api.v1.api import api_router
 app.include_router(api_router, prefix="/api/v1")
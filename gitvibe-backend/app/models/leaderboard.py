@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class LeaderboardRequest(BaseModel):
+    repos: List[str] = Field(..., description="Repositories to rank: GitHub URLs or owner/repo names")
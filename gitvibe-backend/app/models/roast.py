@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class RoastRequest(BaseModel):
+    """The repo stats a roast is written from (same fields as /roast/generate)"""
+    repo_name: str = Field(..., description="Repository name")
+    owner: str = Field(..., description="Repository owner")
+    vibe: str = Field(..., description="The vibe of the repository")
+    score: float = Field(..., description="The vibe score")
+    stars: int = Field(0, description="Number of stars")
+    issues: int = Field(0, description="Number of open issues")
+    last_commit_days: int = Field(0, description="Days since last commit")
+
+
+class BatchRoastRequest(BaseModel):
+    repos: List[RoastRequest] = Field(..., description="Repositories to roast")
@@ -0,0 +1,313 @@
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import logging
+from ..core.config import settings
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redis is an optional runtime dependency
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a GitHub API URL so equivalent requests share one key.
+
+    GitHub owner/repo names and search queries are case-insensitive, so the
+    whole URL is lower-cased and the query parameters are sorted.
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip("/"), query, "")).lower()
+
+
+def cache_key(url: str) -> str:
+    """Cache key for a GitHub API URL"""
+    return f"gh:{normalize_url(url)}"
+
+
+def ttl_for_url(url: str) -> int:
+    """TTL (seconds) for a GitHub API URL, chosen by endpoint class"""
+    path = urlsplit(url).path
+    if path.startswith("/search/repositories"):
+        return settings.CACHE_TTL_SEARCH
+    if "/stats/" in path or path.startswith("/search/issues"):
+        return settings.CACHE_TTL_STATS
+    return settings.CACHE_TTL_REPO
+
+
+@dataclass
+class CacheEntry:
+    """A cached value, the wall-clock time it expires at and its HTTP validators"""
+    value: Any
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    headers: Optional[Dict[str, str]] = None  # response headers worth keeping, e.g. Link
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers that revalidate this entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def dumps(self) -> str:
+        return json.dumps({
+            "value": self.value,
+            "expires_at": self.expires_at,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "headers": self.headers,
+        })
+
+    @classmethod
+    def loads(cls, raw: str) -> "CacheEntry":
+        data = json.loads(raw)
+        return cls(
+            value=data["value"],
+            expires_at=data["expires_at"],
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            headers=data.get("headers"),
+        )
+
+
+class LRUCache:
+    """Bounded in-process cache that evicts the least recently used entry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key, fresh or not; callers check freshness"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TieredCache:
+    """In-process LRU (L1) backed by Redis (L2).
+
+    Redis failures never fail a request: the cache logs the error, serves
+    from L1 only and retries Redis after REDIS_RETRY_INTERVAL seconds.
+
+    Expired entries are retained (for CACHE_STALE_RETENTION seconds in Redis,
+    until evicted in L1) so their ETag/Last-Modified validators can be used
+    to revalidate them with a conditional request.
+    """
+
+    def __init__(self, max_entries: int, redis_client: Any = None):
+        self.l1 = LRUCache(max_entries)
+        self.redis = redis_client
+        self._redis_down_until = 0.0
+        self.counters: Dict[str, int] = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "sets": 0,
+            "revalidated": 0,
+            "invalidated": 0,
+            "redis_errors": 0,
+        }
+
+    @property
+    def redis_available(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, operation: str, error: Exception) -> None:
+        self.counters["redis_errors"] += 1
+        self._redis_down_until = time.monotonic() + settings.REDIS_RETRY_INTERVAL
+        logger.warning(f"Redis {operation} failed, serving from L1 only: {str(error)}")
+
+    async def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Look a key up in L1, then L2 (promoting L2 entries into L1).
+
+        May return an expired entry; check ``is_fresh()`` before serving it.
+        """
+        entry = self.l1.get(key)
+        if entry is not None and entry.is_fresh():
+            self.counters["l1_hits"] += 1
+            return entry
+
+        if self.redis_available:
+            try:
+                raw = await self.redis.get(key)
+            except Exception as e:
+                self._redis_failed("get", e)
+                raw = None
+            if raw is not None:
+                remote = CacheEntry.loads(raw)
+                if entry is None or remote.expires_at > entry.expires_at:
+                    entry = remote
+                    self.l1.set(key, entry)
+                if entry.is_fresh():
+                    self.counters["l2_hits"] += 1
+                    return entry
+
+        self.counters["misses"] += 1
+        if entry is not None:
+            self.counters["stale"] += 1
+        return entry
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key if it is still fresh"""
+        entry = await self.get_entry(key)
+        return entry.value if entry is not None and entry.is_fresh() else None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> CacheEntry:
+        entry = CacheEntry(
+            value=value,
+            expires_at=time.time() + ttl,
+            etag=etag,
+            last_modified=last_modified,
+            headers=headers,
+        )
+        await self._store(key, entry, ttl)
+        self.counters["sets"] += 1
+        return entry
+
+    async def refresh(self, key: str, entry: CacheEntry, ttl: int) -> CacheEntry:
+        """Extend an entry the upstream confirmed unchanged (HTTP 304)"""
+        refreshed = CacheEntry(
+            value=entry.value,
+            expires_at=time.time() + ttl,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            headers=entry.headers,
+        )
+        await self._store(key, refreshed, ttl)
+        self.counters["revalidated"] += 1
+        return refreshed
+
+    async def _store(self, key: str, entry: CacheEntry, ttl: int) -> None:
+        self.l1.set(key, entry)
+        if self.redis_available:
+            try:
+                await self.redis.set(key, entry.dumps(), ex=ttl + settings.CACHE_STALE_RETENTION)
+            except Exception as e:
+                self._redis_failed("set", e)
+
+    async def delete(self, key: str) -> None:
+        self.l1.delete(key)
+        if self.redis_available:
+            try:
+                await self.redis.delete(key)
+            except Exception as e:
+                self._redis_failed("delete", e)
+
+    async def peek(self, key: str) -> Optional[CacheEntry]:
+        """The newest entry for key in L1 or L2, without counting a lookup"""
+        entry = self.l1.get(key)
+        if self.redis_available:
+            try:
+                raw = await self.redis.get(key)
+            except Exception as e:
+                self._redis_failed("get", e)
+                raw = None
+            if raw is not None:
+                remote = CacheEntry.loads(raw)
+                if entry is None or remote.expires_at > entry.expires_at:
+                    entry = remote
+        return entry
+
+    async def invalidate(self, key: str) -> bool:
+        """Expire an entry so the next lookup revalidates it with the upstream.
+
+        The validators are kept, so that request is conditional: a 304 costs
+        no rate limit. It is expired past CACHE_STALE_WHILE_REVALIDATE so it
+        is never served while a background refresh runs.
+        """
+        entry = await self.peek(key)
+        if entry is None:
+            return False
+        expired_at = time.time() - settings.CACHE_STALE_WHILE_REVALIDATE - 1
+        await self._store(key, replace(entry, expires_at=expired_at), 0)
+        self.counters["invalidated"] += 1
+        return True
+
+    async def update(self, key: str, change: Callable[[Any], Any]) -> bool:
+        """Replace a cached value with change(value), keeping its expiry and validators"""
+        entry = await self.peek(key)
+        if entry is None:
+            return False
+        ttl = max(1, int(entry.expires_at - time.time()))
+        await self._store(key, replace(entry, value=change(entry.value)), ttl)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current L1 size and Redis state"""
+        lookups = self.counters["l1_hits"] + self.counters["l2_hits"] + self.counters["misses"]
+        hits = self.counters["l1_hits"] + self.counters["l2_hits"]
+        return {
+            **self.counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "l1_size": len(self.l1),
+            "l1_max_entries": self.l1.max_entries,
+            "redis_enabled": self.redis is not None,
+            "redis_available": self.redis_available,
+        }
+
+    async def close(self) -> None:
+        if self.redis is not None:
+            try:
+                await self.redis.close()
+            except Exception as e:
+                logger.warning(f"Error closing Redis client: {str(e)}")
+
+
+def build_redis_client() -> Any:
+    """Create the Redis client for L2, or None if Redis is disabled/unavailable"""
+    if not settings.CACHE_REDIS_ENABLED or redis_asyncio is None:
+        return None
+    return redis_asyncio.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        decode_responses=True,
+    )
+
+
+response_cache = TieredCache(settings.CACHE_L1_MAX_ENTRIES, build_redis_client())
@@ -0,0 +1,94 @@
+import time
+from typing import Any, Dict, Optional
+import logging
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """A call was refused because its upstream's circuit breaker is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fails calls to an unhealthy upstream fast instead of waiting on it.
+
+    Closed, calls go through. CIRCUIT_FAILURE_THRESHOLD consecutive failures
+    (timeouts, connection errors, 5xx) open the circuit: every call raises
+    CircuitOpen for CIRCUIT_RESET_TIMEOUT seconds. Then the circuit is half
+    open and lets a single probe call through; its success closes the
+    circuit, its failure opens it again.
+
+    Callers report each call with record_success or record_failure, or with
+    release when the call ended without telling anything about the upstream
+    (e.g. it was cancelled).
+    """
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout if reset_timeout is not None else settings.CIRCUIT_RESET_TIMEOUT
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self.counters: Dict[str, int] = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    def before_call(self) -> None:
+        """Raise CircuitOpen unless a call may go through now"""
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.counters["rejected"] += 1
+        retry_after = max(0.0, self._opened_at + self.reset_timeout - time.monotonic()) if state == OPEN else 1.0
+        raise CircuitOpen(self.name, retry_after)
+
+    def record_success(self) -> None:
+        self.counters["successes"] += 1
+        if self._opened_at is not None:
+            logger.info(f"Circuit for {self.name} closed")
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.counters["failures"] += 1
+        self._failures += 1
+        if self._probing or (self._opened_at is None and self._failures >= self.failure_threshold):
+            self.counters["opened"] += 1
+            logger.warning(f"Circuit for {self.name} opened after {self._failures} consecutive failure(s)")
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "state": self.state, "consecutive_failures": self._failures}
+
+
+github_breaker = CircuitBreaker("github")
+github_search_breaker = CircuitBreaker("github_search")
+llm_breaker = CircuitBreaker("llm")
+
+# By GitHub rate-limit bucket (see rate_limiter.bucket_for_url)
+github_breakers = {"core": github_breaker, "search": github_search_breaker}
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(Exception):
+    """The request's time budget ran out before an upstream call finished"""
+
+
+# When the request being served started, and the time.monotonic() by which
+# it must be done (None: no deadline). Tasks copy the context when they are
+# created, so work fanned out by a request shares its deadline; background
+# work that outlives the request calls clear() first.
+_started: ContextVar[Optional[float]] = ContextVar("request_started", default=None)
+_expires_at: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def start(seconds: Optional[float]) -> None:
+    """Give the current request `seconds` to finish (None or 0: no deadline)"""
+    now = time.monotonic()
+    _started.set(now)
+    _expires_at.set(now + seconds if seconds else None)
+
+
+def override(seconds: Optional[float]) -> None:
+    """Replace the current request's budget, still counted from its start"""
+    started = _started.get()
+    if started is None:
+        start(seconds)
+        return
+    _expires_at.set(started + seconds if seconds else None)
+
+
+def clear() -> None:
+    """Drop the deadline, e.g. in background work started by a request"""
+    _expires_at.set(None)
+
+
+async def detached(fn: Callable[[], Awaitable[T]]) -> T:
+    """Run fn without a deadline; for the body of a task that outlives the request"""
+    clear()
+    return await fn()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the deadline (None: no deadline)"""
+    expires_at = _expires_at.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def budget(timeout: Optional[float]) -> Tuple[Optional[float], bool]:
+    """The tighter of a call's own timeout and the time left, and whether the deadline is the tighter one"""
+    left = remaining()
+    if left is None or (timeout is not None and timeout <= left):
+        return timeout, False
+    return max(left, 0.0), True
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check() -> None:
+    """Raise DeadlineExceeded if the deadline has passed"""
+    if expired():
+        raise DeadlineExceeded("Request deadline exceeded")
+
+
+async def bounded(call: Awaitable[T]) -> T:
+    """Await call, cancelling it and raising DeadlineExceeded when the deadline passes"""
+    left = remaining()
+    if left is None:
+        return await call
+    if left <= 0:
+        if asyncio.iscoroutine(call):
+            call.close()
+        raise DeadlineExceeded("Request deadline exceeded")
+    task = asyncio.ensure_future(call)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=left)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    if not done:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        raise DeadlineExceeded("Request deadline exceeded")
+    return task.result()
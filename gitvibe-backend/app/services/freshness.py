@@ -0,0 +1,92 @@
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Freshness:
+    """How fresh the data behind one response is.
+
+    - fresh: everything came from the upstream or unexpired cache entries;
+    - stale: some cache entries were served past their TTL (the oldest by
+      stale_seconds) while being refreshed, or because the upstream failed;
+    - degraded: an upstream was unavailable, so part of the response is a
+      stand-in (stale data, a template roast, a skipped repository).
+    """
+
+    def __init__(self):
+        self.stale_seconds = 0.0
+        self.degraded: Set[str] = set()
+
+    @property
+    def state(self) -> str:
+        if self.degraded:
+            return "degraded"
+        return "stale" if self.stale_seconds > 0 else "fresh"
+
+    def mark_stale(self, seconds: float) -> None:
+        self.stale_seconds = max(self.stale_seconds, seconds)
+
+    def mark_degraded(self, upstream: str) -> None:
+        self.degraded.add(upstream)
+
+    def merge(self, other: "Freshness") -> None:
+        self.mark_stale(other.stale_seconds)
+        self.degraded |= other.degraded
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"X-Data-Freshness": self.state}
+        if self.stale_seconds > 0:
+            headers["X-Data-Stale-Seconds"] = str(int(self.stale_seconds))
+        if self.degraded:
+            headers["X-Degraded-Upstreams"] = ",".join(sorted(self.degraded))
+        return headers
+
+
+# The Freshness of the request being served. Tasks copy the context when they
+# are created, so work fanned out by a request reports into the same object.
+_current: ContextVar[Optional[Freshness]] = ContextVar("freshness", default=None)
+
+
+def track() -> Freshness:
+    """Start tracking freshness for the current request"""
+    freshness = Freshness()
+    _current.set(freshness)
+    return freshness
+
+
+def current() -> Optional[Freshness]:
+    return _current.get()
+
+
+def note_stale(seconds: float) -> None:
+    freshness = _current.get()
+    if freshness is not None:
+        freshness.mark_stale(seconds)
+
+
+def note_degraded(upstream: str) -> None:
+    freshness = _current.get()
+    if freshness is not None:
+        freshness.mark_degraded(upstream)
+
+
+def note(other: Freshness) -> None:
+    freshness = _current.get()
+    if freshness is not None:
+        freshness.merge(other)
+
+
+async def tracked(fn: Callable[[], Awaitable[T]]) -> Tuple[T, Freshness]:
+    """Run fn with its own Freshness and return both.
+
+    For work shared between requests (e.g. single-flighted calls), so every
+    caller can note the freshness of the result, not only the one whose
+    context ran it.
+    """
+    freshness = Freshness()
+    token = _current.set(freshness)
+    try:
+        return await fn(), freshness
+    finally:
+        _current.reset(token)
@@ -1,192 +1,630 @@
 import re
+import time
 import aiohttp
 import asyncio
-import ssl
-import certifi
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, NamedTuple, Mapping
+from multidict import CIMultiDict
 from datetime import datetime, timedelta
+from urllib.parse import quote_plus
 import logging
 from ..core.config import settings
+from .http_client import ssl_context, build_timeout
+from .cache import TieredCache, CacheEntry, cache_key, ttl_for_url
+from .singleflight import SingleFlight
+from .pipeline import run_stages
+from .stats import StatsPending, StatsWarmer
+from .graphql_service import RepoBatchLoader
+from .rate_limiter import (
+    RateLimitScheduler, Priority, GitHubRateLimited, RateLimitExceeded, RequestShed,
+    bucket_for_url, upstream_for_url, observe_rate_limit
+)
+from .metrics import (
+    upstream_requests, upstream_request_duration, upstream_response_bytes, upstream_in_flight, github_cache_lookups
+)
+from .pagination import parse_link_header, count_items, with_params
+from .scoring import score_repo, score_records, repo_record
+from .history import HistoryStore
+from .leaderboard import LeaderboardStore
+from .circuit_breaker import CircuitBreaker, CircuitOpen
+from .revalidator import Revalidator
+from . import freshness, deadline
+from .deadline import DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
-# Create SSL context that uses the system's CA certificates
-ssl_context = ssl.create_default_context(cafile=certifi.where())
+# Response headers kept alongside cached bodies
+CACHED_HEADERS = ("Link",)
+
+class GitHubAPIError(Exception):
+    """GitHub answered with an error status"""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+class GitHubUnavailable(Exception):
+    """GitHub could not be reached or did not answer in time"""
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Whether an error means GitHub is unhealthy or out of budget (its rate
+    limit or our request deadline), as opposed to the request itself being
+    wrong (e.g. a 404 for a missing repository)"""
+    if isinstance(error, GitHubAPIError):
+        return error.status >= 500
+    return isinstance(error, (GitHubUnavailable, GitHubRateLimited, RateLimitExceeded, CircuitOpen, DeadlineExceeded))
+
+class GitHubResponse(NamedTuple):
+    """Status, decoded body and headers of a GitHub API response.
+
+    stale_seconds is how long past its TTL a cached body served in place of
+    the upstream is (0 for fresh data).
+    """
+    status: int
+    data: Any
+    headers: Mapping[str, str]
+    stale_seconds: float = 0.0
+    
+    @property
+    def links(self) -> Dict[str, str]:
+        """Pagination links (rel -> URL) from the Link header"""
+        return parse_link_header(self.headers.get("Link"))
 
 class GitHubService:
-    def __init__(self, access_token: str = ""):
+    def __init__(
+        self,
+        access_token: str = "",
+        session: Optional[aiohttp.ClientSession] = None,
+        cache: Optional[TieredCache] = None,
+        flights: Optional[SingleFlight] = None,
+        warmer: Optional[StatsWarmer] = None,
+        scheduler: Optional[RateLimitScheduler] = None,
+        priority: Priority = Priority.HIGH,
+        history: Optional[HistoryStore] = None,
+        breakers: Optional[Dict[str, CircuitBreaker]] = None,
+        revalidator: Optional[Revalidator] = None,
+        leaderboards: Optional[LeaderboardStore] = None
+    ):
         self.base_url = settings.GITHUB_API_URL
+        self.session = session
+        self.cache = cache
+        self.flights = flights
+        self.warmer = warmer
+        self.scheduler = scheduler
+        self.priority = priority
+        self.history = history
+        self.breakers = breakers or {}
+        self.revalidator = revalidator
+        self.leaderboards = leaderboards
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "GitVibe/1.0"
         }
-        if access_token:
+        if scheduler is not None:
+            # Tokens come from the scheduler's pool, one per request
+            if access_token:
+                scheduler.add_token(access_token)
+        elif access_token:
             self.headers["Authorization"] = f"token {access_token}"
     
-    async def _make_request(self, url: str) -> Dict[str, Any]:
-        """Make an HTTP request to the GitHub API with proper SSL verification"""
+    @property
+    def graphql_available(self) -> bool:
+        """GraphQL batching needs it enabled and an authenticated client"""
+        if self.scheduler is not None:
+            return settings.GRAPHQL_ENABLED and self.scheduler.has_tokens()
+        return settings.GRAPHQL_ENABLED and "Authorization" in self.headers
+    
+    def batch_loader(self, days: int = 30) -> Optional[RepoBatchLoader]:
+        """A loader that batches multi-repo lookups over GraphQL, or None to use REST"""
+        return RepoBatchLoader(self, days) if self.graphql_available else None
+    
+    async def request(self, url: str) -> GitHubResponse:
+        """GET a GitHub API URL (cached, coalescing identical in-flight requests)
+        and return its status, body and headers"""
+        if self.flights is None:
+            response = await deadline.bounded(self._load(url))
+        else:
+            try:
+                response = await deadline.bounded(self.flights.do(cache_key(url), lambda: self._load(url)))
+            except RequestShed:
+                if self.priority == Priority.LOW:
+                    raise
+                # We joined a low-priority (prefetch) call that was shed: make our own
+                response = await deadline.bounded(self._load(url))
+        if response.stale_seconds:
+            freshness.note_stale(response.stale_seconds)
+        return response
+    
+    async def _make_request(self, url: str) -> Any:
+        """Make a GitHub API request and return the decoded body"""
+        return (await self.request(url)).data
+    
+    async def _load(self, url: str) -> GitHubResponse:
+        """Load a GitHub API URL, served from the response cache when possible.
+
+        Entries expired for at most CACHE_STALE_WHILE_REVALIDATE seconds are
+        served as they are while a background refresh runs. Older ones are
+        revalidated in line, and if GitHub is failing (errors, timeouts, rate
+        limits, an open circuit) they are served stale rather than failing.
+        """
+        if self.cache is None:
+            response = await self._send(url)
+            if response.status == 202:
+                raise StatsPending(url)
+            return response
+        
+        key = cache_key(url)
+        lookups = github_cache_lookups.labels
+        entry = await self.cache.get_entry(key)
+        if entry is not None and entry.is_fresh():
+            lookups(upstream_for_url(url), "hit").inc()
+            return GitHubResponse(200, entry.value, CIMultiDict(entry.headers or {}))
+        
+        if entry is None:
+            lookups(upstream_for_url(url), "miss").inc()
+            return await self._refresh(url, key, entry)
+        stale_seconds = time.time() - entry.expires_at
+        if self.revalidator is not None and stale_seconds <= settings.CACHE_STALE_WHILE_REVALIDATE:
+            lookups(upstream_for_url(url), "stale").inc()
+            self.revalidator.schedule(key, lambda: self._refresh(url, key, entry))
+            return GitHubResponse(200, entry.value, CIMultiDict(entry.headers or {}), stale_seconds)
+        lookups(upstream_for_url(url), "expired").inc()
         try:
-            # Create a connector with our SSL context
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(url, headers=self.headers, ssl=ssl_context) as response:
-                    if response.status == 403:
-                        error_data = await response.json()
-                        rate_limit = response.headers.get('X-RateLimit-Remaining', 'unknown')
-                        logger.error(f"GitHub API rate limit exceeded. Remaining: {rate_limit}")
-                        raise Exception(f"GitHub API rate limit exceeded. Remaining: {rate_limit}")
-                        
-                    if response.status != 200:
-                        try:
-                            error = await response.json()
-                            error_msg = error.get("message", "Failed to fetch data from GitHub")
-                            logger.error(f"GitHub API error ({response.status}): {error_msg}")
-                        except:
-                            error_msg = await response.text()
-                            logger.error(f"GitHub API error ({response.status}): {error_msg}")
-                        
-                        raise Exception(f"GitHub API error: {error_msg} (Status: {response.status})")
-                        
-                    return await response.json()
+            return await self._refresh(url, key, entry)
+        except Exception as e:
+            if not is_upstream_failure(e):
+                raise
+            logger.warning(f"GitHub unavailable, serving stale cache ({stale_seconds:.0f}s past TTL): {url}: {str(e)}")
+            return GitHubResponse(200, entry.value, CIMultiDict(entry.headers or {}), stale_seconds)
+    
+    async def _refresh(self, url: str, key: str, entry: Optional[CacheEntry]) -> GitHubResponse:
+        """Fetch a URL, revalidating the cached entry if there is one.
+
+        Expired cache entries are revalidated with If-None-Match/If-Modified-Since;
+        a 304 refreshes the entry without counting against the rate limit.
+        A 202 (statistics still being computed) raises StatsPending with the
+        last cached value and schedules a background warm-up of the entry.
+        """
+        ttl = ttl_for_url(url)
+        response = await self._send(url, entry.validators() if entry is not None else None)
+        if response.status == 304 and entry is not None:
+            logger.debug(f"GitHub API 304 Not Modified, cache refreshed: {url}")
+            github_cache_lookups.labels(upstream_for_url(url), "revalidated").inc()
+            await self.cache.refresh(key, entry, ttl)
+            return GitHubResponse(200, entry.value, CIMultiDict(entry.headers or {}))
+        
+        if response.status == 202:
+            logger.info(f"GitHub is computing statistics, warming up in background: {url}")
+            if self.warmer is not None:
+                self.warmer.schedule(key, lambda: self._warm(url))
+            raise StatsPending(url, stale=entry.value if entry is not None else None)
+        
+        await self._store(key, url, response)
+        return response
+    
+    async def _store(self, key: str, url: str, response: "GitHubResponse") -> None:
+        """Cache a 200 response together with its validators"""
+        await self.cache.set(
+            key,
+            response.data,
+            ttl_for_url(url),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            headers={name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        )
+    
+    async def _warm(self, url: str) -> bool:
+        """Poll a stats URL that answered 202; cache it once GitHub has the data"""
+        response = await self._send(url)
+        if response.status == 202:
+            return False
+        await self._store(cache_key(url), url, response)
+        return True
+    
+    async def _auth_headers(
+        self,
+        url: str,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[Optional[str], Dict[str, str]]:
+        """Pick the token for a request (via the scheduler, if any) and build its headers"""
+        headers = {**self.headers, **extra_headers} if extra_headers else dict(self.headers)
+        if self.scheduler is None:
+            return None, headers
+        token = await self.scheduler.acquire(bucket_for_url(url), self.priority)
+        if token:
+            headers["Authorization"] = f"token {token}"
+        return token, headers
+    
+    def _record(self, token: Optional[str], url: str, status: int, headers: Mapping[str, str]) -> None:
+        """Feed a response's rate-limit headers back to the scheduler"""
+        if self.scheduler is not None and token is not None:
+            self.scheduler.record(token, bucket_for_url(url), status, headers)
+    
+    async def _send(self, url: str, extra_headers: Optional[Dict[str, str]] = None) -> "GitHubResponse":
+        """Make an HTTP request to the GitHub API with proper SSL verification.
+
+        Requests rejected by a rate limit are retried (up to RATE_LIMIT_MAX_RETRIES
+        times) with whichever token the scheduler picks next. While the circuit
+        breaker for the URL's upstream (REST or search) is open, this fails fast
+        with CircuitOpen.
+        """
+        breaker = self.breakers.get(bucket_for_url(url))
+        if breaker is None:
+            return await self._send_with_retries(url, extra_headers)
+        breaker.before_call()
+        try:
+            response = await self._send_with_retries(url, extra_headers)
+        except (GitHubAPIError, GitHubUnavailable) as e:
+            if is_upstream_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except GitHubRateLimited:
+            breaker.record_success()  # GitHub answered; the rate limiter handles budgets
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
+        return response
+    
+    async def _send_with_retries(self, url: str, extra_headers: Optional[Dict[str, str]] = None) -> "GitHubResponse":
+        try:
+            for attempt in range(settings.RATE_LIMIT_MAX_RETRIES + 1):
+                token, headers = await self._auth_headers(url, extra_headers)
+                try:
+                    if self.session is not None:
+                        return await self._fetch(self.session, url, headers, token, bool(extra_headers))
+                    
+                    # No shared session (e.g. outside the app lifespan): use a one-off session
+                    connector = aiohttp.TCPConnector(ssl=ssl_context)
+                    async with aiohttp.ClientSession(connector=connector, timeout=build_timeout()) as session:
+                        return await self._fetch(session, url, headers, token, bool(extra_headers))
+                except GitHubRateLimited:
+                    if self.scheduler is None or attempt == settings.RATE_LIMIT_MAX_RETRIES:
+                        raise
+                    logger.warning(f"Retrying rate-limited GitHub request with the next token: {url}")
                     
         except aiohttp.ClientSSLError as e:
             logger.error(f"SSL Certificate error: {str(e)}")
             raise Exception(f"SSL Certificate verification failed: {str(e)}")
         except aiohttp.ClientError as e:
             logger.error(f"HTTP Client error: {str(e)}")
-            raise Exception(f"Failed to connect to GitHub API: {str(e)}")
+            raise GitHubUnavailable(f"Failed to connect to GitHub API: {str(e)}")
+        except asyncio.TimeoutError:
+            logger.error(f"GitHub API request timed out: {url}")
+            raise GitHubUnavailable("GitHub API request timed out")
     
-    async def get_repo_info(self, repo_url: str) -> Dict[str, Any]:
-        """Extract owner and repo from URL and fetch repository info"""
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Dict[str, str],
+        token: Optional[str] = None,
+        conditional: bool = False
+    ) -> "GitHubResponse":
+        """Perform the GET on the given session and decode the response,
+        recording its latency and outcome per upstream"""
+        upstream = upstream_for_url(url)
+        status = "error"
+        start = time.perf_counter()
         try:
-            # Extract owner and repo from URL
-            match = re.search(r'github\.com/([^/]+)/([^/]+)', repo_url)
-            if not match:
-                raise ValueError("Invalid GitHub repository URL")
+            with upstream_in_flight.track_in_progress(upstream):
+                response = await self._get(session, url, headers, token, conditional)
+            status = str(response.status)
+            return response
+        except GitHubAPIError as e:
+            status = str(e.status)
+            raise
+        except GitHubRateLimited:
+            status = "rate_limited"
+            raise
+        except asyncio.TimeoutError:
+            status = "timeout"
+            raise
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            upstream_requests.labels(upstream, status).inc()
+            upstream_request_duration.labels(upstream).observe(time.perf_counter() - start)
+    
+    async def _get(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Dict[str, str],
+        token: Optional[str],
+        conditional: bool
+    ) -> "GitHubResponse":
+        async with session.get(url, headers=headers, ssl=ssl_context) as response:
+            self._record(token, url, response.status, response.headers)
+            observe_rate_limit(url, response.headers)
             
-            owner, repo = match.groups()
-            repo = repo.replace('.git', '')  # Remove .git if present
+            if response.status == 304 and conditional:
+                return GitHubResponse(304, None, CIMultiDict(response.headers))
             
-            # Fetch repository data
-            url = f"{self.base_url}/repos/{owner}/{repo}"
-            repo_data = await self._make_request(url)
+            if response.status == 202:
+                # Statistics endpoints answer 202 with an empty body while computing
+                return GitHubResponse(202, None, CIMultiDict(response.headers))
             
-            # Fetch contributors count
-            contributors_url = f"{self.base_url}/repos/{owner}/{repo}/contributors?per_page=1"
-            contributors_data = await self._make_request(contributors_url)
+            if response.status == 204:
+                # e.g. /contributors of an empty repository
+                return GitHubResponse(204, None, CIMultiDict(response.headers))
             
-            # Basic repository info
-            return {
-                "name": repo_data["name"],
-                "full_name": repo_data["full_name"],
-                "description": repo_data["description"],
-                "html_url": repo_data["html_url"],
-                "language": repo_data["language"],
-                "stargazers_count": repo_data["stargazers_count"],
-                "forks_count": repo_data["forks_count"],
-                "open_issues_count": repo_data["open_issues_count"],
-                "subscribers_count": repo_data["subscribers_count"],
-                "created_at": repo_data["created_at"],
-                "updated_at": repo_data["updated_at"],
-                "pushed_at": repo_data["pushed_at"],
-                "license": repo_data.get("license", {}).get("name") if repo_data.get("license") else None,
-                "contributors_count": len(contributors_data) if isinstance(contributors_data, list) else 0
-            }
+            rate_limit = response.headers.get('X-RateLimit-Remaining', 'unknown')
+            if response.status == 429 or (
+                response.status == 403 and (rate_limit == "0" or "Retry-After" in response.headers)
+            ):
+                logger.error(f"GitHub API rate limit exceeded. Remaining: {rate_limit}")
+                raise GitHubRateLimited(f"GitHub API rate limit exceeded. Remaining: {rate_limit}")
+                
+            if response.status != 200:
+                try:
+                    error = await response.json()
+                    error_msg = error.get("message", "Failed to fetch data from GitHub")
+                    logger.error(f"GitHub API error ({response.status}): {error_msg}")
+                except:
+                    error_msg = await response.text()
+                    logger.error(f"GitHub API error ({response.status}): {error_msg}")
+                
+                raise GitHubAPIError(f"GitHub API error: {error_msg} (Status: {response.status})", response.status)
+                
+            body = await response.read()
+            upstream_response_bytes.labels(upstream_for_url(url)).inc(len(body))
+            return GitHubResponse(response.status, await response.json(), CIMultiDict(response.headers))
+    
+    @staticmethod
+    def parse_repo_url(repo_url: str) -> Tuple[str, str]:
+        """Extract (owner, repo) from a GitHub repository URL"""
+        match = re.search(r'github\.com/([^/]+)/([^/]+)', repo_url)
+        if not match:
+            raise ValueError("Invalid GitHub repository URL")
+        
+        owner, repo = match.groups()
+        repo = repo.replace('.git', '')  # Remove .git if present
+        return owner, repo
+    
+    def _repo_url(self, owner: str, repo: str) -> str:
+        return f"{self.base_url}/repos/{owner}/{repo}"
+    
+    def _contributors_url(self, owner: str, repo: str) -> str:
+        return f"{self.base_url}/repos/{owner}/{repo}/contributors"
+    
+    def _commit_activity_url(self, owner: str, repo: str) -> str:
+        return f"{self.base_url}/repos/{owner}/{repo}/stats/commit_activity"
+    
+    def _open_count_url(self, owner: str, repo: str, kind: str) -> str:
+        return f"{self.base_url}/search/issues?q=repo:{owner}/{repo}+type:{kind}+state:open"
+    
+    def repo_urls(self, owner: str, repo: str) -> Dict[str, str]:
+        """URLs of everything fetched to score one repository, by part"""
+        return {
+            "info": self._repo_url(owner, repo),
+            "contributors": with_params(self._contributors_url(owner, repo), per_page=1),
+            "commit_activity": self._commit_activity_url(owner, repo),
+            "open_issues": self._open_count_url(owner, repo, "issue"),
+            "open_prs": self._open_count_url(owner, repo, "pr"),
+        }
+    
+    def repo_cache_keys(self, owner: str, repo: str) -> Dict[str, str]:
+        """Response cache keys of everything fetched for one repository, by part"""
+        return {part: cache_key(url) for part, url in self.repo_urls(owner, repo).items()}
+    
+    async def due_parts(self, owner: str, repo: str, within: float) -> Dict[str, str]:
+        """Parts of a repository (part -> URL) that are not cached or expire within `within` seconds"""
+        urls = self.repo_urls(owner, repo)
+        if self.cache is None:
+            return urls
+        due = {}
+        for part, url in urls.items():
+            entry = await self.cache.peek(cache_key(url))
+            if entry is None or entry.expires_at - time.time() <= within:
+                due[part] = url
+        return due
+    
+    async def refresh_parts(self, urls: Dict[str, str]) -> List[str]:
+        """Fetch parts of a repository ahead of their expiry, conditionally if
+        cached, so requests keep hitting the cache; returns the parts GitHub is
+        still computing (202), which are warmed up in the background"""
+        if self.cache is None:
+            return []
+        
+        async def refresh(url: str) -> None:
+            key = cache_key(url)
+            entry = await self.cache.peek(key)
+            load = lambda: self._refresh(url, key, entry)
+            # Coalesces with a user request for the same URL
+            await (self.flights.do(key, load) if self.flights is not None else load())
+        
+        results = await asyncio.gather(*(refresh(url) for url in urls.values()), return_exceptions=True)
+        pending = []
+        for part, result in zip(urls, results):
+            if isinstance(result, StatsPending):
+                pending.append(part)
+            elif isinstance(result, BaseException):
+                raise result
+        return pending
+    
+    async def invalidate_repo(self, owner: str, repo: str, parts: List[str]) -> List[str]:
+        """Make the next lookup of these parts of a repository revalidate with
+        GitHub; returns the parts that were cached"""
+        if self.cache is None:
+            return []
+        keys = self.repo_cache_keys(owner, repo)
+        return [part for part in parts if await self.cache.invalidate(keys[part])]
+    
+    async def update_repo_info(self, owner: str, repo: str, fields: Dict[str, Any]) -> bool:
+        """Patch fields (e.g. stargazers_count) into the cached /repos response"""
+        if self.cache is None:
+            return False
+        return await self.cache.update(self.repo_cache_keys(owner, repo)["info"], lambda info: {**info, **fields})
+    
+    async def _get_commit_activity(self, owner: str, repo: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Weekly commit activity and whether GitHub is still computing it.
+
+        While GitHub answers 202 this serves the last cached weeks (or none)
+        flagged as pending, instead of failing the request.
+        """
+        try:
+            # An empty repository answers 204 with no body: no activity
+            return await self._make_request(self._commit_activity_url(owner, repo)) or [], False
+        except StatsPending as e:
+            return (e.stale or []), True
+    
+    async def count_contributors(self, owner: str, repo: str) -> int:
+        """Number of contributors, read from the Link header of a one-item page"""
+        return await count_items(self, self._contributors_url(owner, repo))
+    
+    async def get_repo_info(self, repo_url: str) -> Dict[str, Any]:
+        """Extract owner and repo from URL and fetch repository info"""
+        try:
+            owner, repo = self.parse_repo_url(repo_url)
+            
+            # Fetch repository data and contributors count in parallel
+            repo_data, contributors_count = await asyncio.gather(
+                self._make_request(self._repo_url(owner, repo)),
+                self.count_contributors(owner, repo)
+            )
+            return self._build_repo_info(repo_data, contributors_count)
             
         except Exception as e:
             logger.error(f"Error in get_repo_info: {str(e)}")
             raise
     
+    @staticmethod
+    def _build_repo_info(repo_data: Dict[str, Any], contributors_count: int) -> Dict[str, Any]:
+        """Basic repository info from the /repos response and the contributors count"""
+        return {
+            "name": repo_data["name"],
+            "full_name": repo_data["full_name"],
+            "description": repo_data["description"],
+            "html_url": repo_data["html_url"],
+            "language": repo_data["language"],
+            "stargazers_count": repo_data["stargazers_count"],
+            "forks_count": repo_data["forks_count"],
+            "open_issues_count": repo_data["open_issues_count"],
+            "subscribers_count": repo_data["subscribers_count"],
+            "created_at": repo_data["created_at"],
+            "updated_at": repo_data["updated_at"],
+            "pushed_at": repo_data["pushed_at"],
+            "license": repo_data.get("license", {}).get("name") if repo_data.get("license") else None,
+            "contributors_count": contributors_count
+        }
+    
     async def get_repo_stats(self, owner: str, repo: str, days: int = 30) -> Dict[str, Any]:
         """Get repository statistics"""
+        stats, _ = await self._get_repo_stats(owner, repo, days)
+        return stats
+    
+    async def get_repo_data(self, owner: str, repo: str, days: int = 30) -> Dict[str, Any]:
+        """Repository info and stats over REST, as {"info", "stats", "commit_weeks"}.
+
+        The shape of RepoBatchLoader.load, plus the unfiltered commit activity
+        for the history.
+        """
+        info, (stats, commit_weeks) = await asyncio.gather(
+            self.get_repo_info(f"https://github.com/{owner}/{repo}"),
+            self._get_repo_stats(owner, repo, days)
+        )
+        return {"info": info, "stats": stats, "commit_weeks": commit_weeks}
+    
+    async def _get_repo_stats(self, owner: str, repo: str, days: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Repository statistics and the full year of commit activity they were built from"""
         try:
-            # Get commit activity
-            commits_url = f"{self.base_url}/repos/{owner}/{repo}/stats/commit_activity"
-            commit_activity = await self._make_request(commits_url)
-            
-            # Get issue and PR counts
-            issues_url = f"{self.base_url}/search/issues?q=repo:{owner}/{repo}+type:issue+state:open"
-            prs_url = f"{self.base_url}/search/issues?q=repo:{owner}/{repo}+type:pr+state:open"
-            
-            # Make requests in parallel
-            issues_data, prs_data = await asyncio.gather(
-                self._make_request(issues_url),
-                self._make_request(prs_url)
+            # Get commit activity and issue/PR counts in parallel
+            (commit_activity, pending), issues_data, prs_data = await asyncio.gather(
+                self._get_commit_activity(owner, repo),
+                self._make_request(self._open_count_url(owner, repo, "issue")),
+                self._make_request(self._open_count_url(owner, repo, "pr"))
             )
-            
-            # Calculate activity metrics
-            now = datetime.utcnow()
-            start_date = now - timedelta(days=days)
-            
-            # Process commit activity
-            recent_commits = [
-                week for week in commit_activity 
-                if datetime.utcfromtimestamp(week["week"]) >= start_date
-            ]
-            
-            total_commits = sum(week["total"] for week in recent_commits)
-            daily_commits = [week["days"] for week in recent_commits]
-            
-            return {
-                "commit_activity": {
-                    "total_commits": total_commits,
-                    "daily_commits": daily_commits,
-                    "weeks": [{
-                        "week": week["week"],
-                        "days": week["days"],
-                        "total": week["total"]
-                    } for week in recent_commits]
-                },
-                "issues": {
-                    "open": issues_data.get("total_count", 0),
-                },
-                "pull_requests": {
-                    "open": prs_data.get("total_count", 0),
-                },
-                "analysis_period": {
-                    "start_date": start_date.isoformat(),
-                    "end_date": now.isoformat(),
-                    "days": days
-                }
-            }
+            return self._build_repo_stats(commit_activity, issues_data, prs_data, days, pending), commit_activity
             
         except Exception as e:
             logger.error(f"Error in get_repo_stats: {str(e)}")
             raise
     
+    @staticmethod
+    def _build_repo_stats(
+        commit_activity: List[Dict[str, Any]],
+        issues_data: Dict[str, Any],
+        prs_data: Dict[str, Any],
+        days: int,
+        pending: bool = False
+    ) -> Dict[str, Any]:
+        """Repository statistics from the commit activity and issue/PR search responses"""
+        # Calculate activity metrics
+        now = datetime.utcnow()
+        start_date = now - timedelta(days=days)
+        
+        # Process commit activity
+        recent_commits = [
+            week for week in commit_activity 
+            if datetime.utcfromtimestamp(week["week"]) >= start_date
+        ]
+        
+        total_commits = sum(week["total"] for week in recent_commits)
+        daily_commits = [week["days"] for week in recent_commits]
+        
+        return {
+            "commit_activity": {
+                "total_commits": total_commits,
+                "daily_commits": daily_commits,
+                "weeks": [{
+                    "week": week["week"],
+                    "days": week["days"],
+                    "total": week["total"]
+                } for week in recent_commits]
+            },
+            "issues": {
+                "open": issues_data.get("total_count", 0),
+            },
+            "pull_requests": {
+                "open": prs_data.get("total_count", 0),
+            },
+            "analysis_period": {
+                "start_date": start_date.isoformat(),
+                "end_date": now.isoformat(),
+                "days": days
+            },
+            # True while GitHub is still computing commit activity (HTTP 202)
+            "pending": pending
+        }
+    
+    def _search_url(self, query: str, per_page: int) -> str:
+        return f"{self.base_url}/search/repositories?q={quote_plus(query)}&sort=stars&order=desc&per_page={per_page}"
+    
+    @staticmethod
+    def _search_item(item: Dict[str, Any]) -> Dict[str, Any]:
+        """The fields of a search hit we return"""
+        return {
+            "id": item["id"],
+            "name": item["name"],
+            "full_name": item["full_name"],
+            "description": item["description"],
+            "html_url": item["html_url"],
+            "stargazers_count": item["stargazers_count"],
+            "forks_count": item["forks_count"],
+            "language": item["language"],
+            "owner": {
+                "login": item["owner"]["login"],
+                "avatar_url": item["owner"]["avatar_url"],
+            }
+        }
+    
+    async def search_repositories_page(self, query: str, per_page: int) -> Tuple[List[Dict[str, Any]], int]:
+        """One page of search hits (most stars first) and GitHub's total match count"""
+        url = self._search_url(query, per_page)
+        logger.info(f"Searching GitHub repositories with URL: {url}")
+        response = await self._make_request(url)
+        items = [self._search_item(item) for item in response.get("items", [])]
+        return items, response.get("total_count", len(items))
+    
     async def search_repositories(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Search for GitHub repositories based on a query string"""
         try:
-            # URL encode the query and create the search URL
-            url = f"{self.base_url}/search/repositories?q={query}&sort=stars&order=desc&per_page={limit}"
-            logger.info(f"Searching GitHub repositories with URL: {url}")
-            
-            # Make the API request
-            response = await self._make_request(url)
-            
-            # Process the results
-            items = response.get("items", [])
-            
-            # Extract just the fields we need to return
-            search_results = []
-            for item in items:
-                search_results.append({
-                    "id": item["id"],
-                    "name": item["name"],
-                    "full_name": item["full_name"],
-                    "description": item["description"],
-                    "html_url": item["html_url"],
-                    "stargazers_count": item["stargazers_count"],
-                    "forks_count": item["forks_count"],
-                    "language": item["language"],
-                    "owner": {
-                        "login": item["owner"]["login"],
-                        "avatar_url": item["owner"]["avatar_url"],
-                    }
-                })
-            
-            return search_results
+            items, _ = await self.search_repositories_page(query, limit)
+            return items
             
         except Exception as e:
             logger.error(f"Error in search_repositories: {str(e)}")
@@ -194,63 +632,126 @@ class GitHubService:
 
     async def calculate_vibe_score(self, owner: str, repo: str, days: int = 30) -> Dict[str, Any]:
         """Calculate a 'vibe score' for the repository"""
+        if self.flights is None:
+            return await self._calculate_vibe_score(owner, repo, days)
+        key = f"vibe:{owner}/{repo}:{days}"
         try:
-            # Get repository data and stats
-            repo_info = await self.get_repo_info(f"https://github.com/{owner}/{repo}")
-            stats = await self.get_repo_stats(owner, repo, days)
-            
-            # Calculate activity score (0-100)
-            commit_activity = stats["commit_activity"]["total_commits"]
-            days_since_last_update = (datetime.utcnow() - datetime.strptime(
-                repo_info["pushed_at"], "%Y-%m-%dT%H:%M:%SZ"
-            )).days
-            
-            # Calculate scores for different metrics
-            activity_score = min(100, commit_activity * 2)  # Cap at 100
-            recency_score = max(0, 100 - (days_since_last_update * 5))  # -5 points per day
-            popularity_score = min(100, repo_info["stargazers_count"] / 10)  # 1000 stars = 100 points
-            
-            # Calculate overall score (weighted average)
-            total_score = (
-                activity_score * 0.4 +
-                recency_score * 0.3 +
-                popularity_score * 0.3
-            )
-            
-            # Determine vibe
-            if total_score >= 80:
-                vibe = "🔥 Active AF"
-            elif total_score >= 60:
-                vibe = "🧘‍♂️ Peacefully Maintained"
-            elif total_score >= 40:
-                vibe = "😴 Mid"
-            elif total_score >= 20:
-                vibe = "⚠️ High Drama Zone"
-            else:
-                vibe = "💀 Dead on Arrival"
-            
-            # Easter eggs
-            if owner == "torvalds" and repo == "linux":
-                vibe = "👑 King of Kernels"
-            elif repo_info["stargazers_count"] < 10 and repo_info["open_issues_count"] > 200:
-                vibe = "😿 Crying Cat Memorial"
-            
-            return {
-                "vibe": vibe,
-                "score": round(total_score, 1),
-                "metrics": {
-                    "activity_score": round(activity_score, 1),
-                    "recency_score": round(recency_score, 1),
-                    "popularity_score": round(popularity_score, 1),
-                },
-                "stats": {
-                    "days_since_last_update": days_since_last_update,
-                    "total_commits": commit_activity,
-                    "stargazers": repo_info["stargazers_count"],
-                    "open_issues": repo_info["open_issues_count"],
-                }
+            # Every caller notes how fresh the shared result is, not only the one running it
+            score, shared = await deadline.bounded(self.flights.do(
+                key, lambda: freshness.tracked(lambda: self._calculate_vibe_score(owner, repo, days))
+            ))
+        except RequestShed:
+            if self.priority == Priority.LOW:
+                raise
+            # We joined a low-priority (prefetch) computation that was shed: run our own
+            return await self._calculate_vibe_score(owner, repo, days)
+        freshness.note(shared)
+        return score
+    
+    async def _calculate_vibe_score(self, owner: str, repo: str, days: int) -> Dict[str, Any]:
+        try:
+            # Every GitHub fetch is independent, so they all start at once;
+            # only assembling the info/stats and scoring wait on them.
+            stages = {
+                "repo": (lambda: self._make_request(self._repo_url(owner, repo)), ()),
+                "contributors": (lambda: self.count_contributors(owner, repo), ()),
+                "commit_activity": (lambda: self._get_commit_activity(owner, repo), ()),
+                "open_issues": (lambda: self._make_request(self._open_count_url(owner, repo, "issue")), ()),
+                "open_prs": (lambda: self._make_request(self._open_count_url(owner, repo, "pr")), ()),
+                "info": (self._build_repo_info, ("repo", "contributors")),
+                "stats": (
+                    lambda activity, issues, prs: self._build_repo_stats(activity[0], issues, prs, days, activity[1]),
+                    ("commit_activity", "open_issues", "open_prs")
+                ),
+                "score": (
+                    lambda info, stats: self.score_vibe(owner, repo, info, stats),
+                    ("info", "stats")
+                ),
             }
+            results, timings = await run_stages(stages)
+            logger.info(
+                f"Vibe score pipeline for {owner}/{repo}: "
+                + ", ".join(f"{name}={ms}ms" for name, ms in timings.items())
+            )
+            await self._record_score(
+                owner, repo, results["info"], results["stats"], results["score"], results["commit_activity"][0]
+            )
+            return results["score"]
             
         except Exception as e:
             logger.error(f"Error in calculate_vibe_score: {str(e)}")
             raise
+    
+    async def calculate_vibe_score_from_info(
+        self,
+        repo_info: Dict[str, Any],
+        days: int = 30,
+        owner: Optional[str] = None,
+        repo: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Calculate a 'vibe score' from an already-fetched get_repo_info result.
+
+        Only the repository stats are fetched, so callers that already hold the
+        repo info (e.g. /analyze/compare) don't fetch it twice. owner/repo
+        default to the repository's full_name.
+        """
+        try:
+            if owner is None or repo is None:
+                owner, repo = repo_info["full_name"].split("/")
+            stats, commit_weeks = await self._get_repo_stats(owner, repo, days)
+            return await self.score_and_record(owner, repo, repo_info, stats, commit_weeks)
+            
+        except Exception as e:
+            logger.error(f"Error in calculate_vibe_score_from_info: {str(e)}")
+            raise
+    
+    async def score_and_record(
+        self,
+        owner: str,
+        repo: str,
+        info: Dict[str, Any],
+        stats: Dict[str, Any],
+        commit_weeks: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Score a repository from already-fetched info and stats, recording the score.
+
+        commit_weeks is the unfiltered commit activity, when it was fetched.
+        """
+        score = self.score_vibe(owner, repo, info, stats)
+        await self._record_score(owner, repo, info, stats, score, commit_weeks)
+        return score
+
+    async def score_and_record_many(self, repos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score loaded repositories ({"info", "stats"} as from get_repo_data) in one vectorized pass.
+
+        Every score is recorded, as by score_and_record.
+        """
+        names = [tuple(data["info"]["full_name"].split("/")) for data in repos]
+        scores = score_records([
+            repo_record(owner, repo, data["info"], data["stats"]) for (owner, repo), data in zip(names, repos)
+        ]).to_dicts()
+        await asyncio.gather(*(
+            self._record_score(owner, repo, data["info"], data["stats"], score, data.get("commit_weeks"))
+            for (owner, repo), data, score in zip(names, repos, scores)
+        ))
+        return scores
+
+    async def _record_score(
+        self,
+        owner: str,
+        repo: str,
+        info: Dict[str, Any],
+        stats: Dict[str, Any],
+        score: Dict[str, Any],
+        commit_weeks: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """Add a fresh score to the metric history and move it on the leaderboards"""
+        if self.leaderboards is not None:
+            self.leaderboards.record_score(info, score)
+        if self.history is not None:
+            await self.history.record(owner, repo, info, stats, score, commit_weeks)
+
+    @staticmethod
+    def score_vibe(owner: str, repo: str, repo_info: Dict[str, Any], stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Score a repository from its info and stats"""
+        return score_repo(owner, repo, repo_info, stats)
@@ -0,0 +1,231 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+import aiohttp
+import logging
+from ..core.config import settings
+from .http_client import ssl_context, build_timeout
+from .rate_limiter import upstream_for_url, observe_rate_limit
+from .metrics import upstream_requests, upstream_request_duration, upstream_response_bytes, upstream_in_flight
+from . import deadline
+
+if TYPE_CHECKING:
+    from .github_service import GitHubService
+
+logger = logging.getLogger(__name__)
+
+REPO_FRAGMENT = """
+fragment RepoFields on Repository {
+  name
+  nameWithOwner
+  description
+  url
+  primaryLanguage { name }
+  stargazerCount
+  forkCount
+  issues(states: OPEN) { totalCount }
+  pullRequests(states: OPEN) { totalCount }
+  watchers { totalCount }
+  createdAt
+  updatedAt
+  pushedAt
+  licenseInfo { name }
+  defaultBranchRef {
+    target {
+      ... on Commit { history(since: $since) { totalCount } }
+    }
+  }
+}
+"""
+
+
+def build_batch_query(count: int) -> str:
+    """Aliased query fetching `count` repositories (variables $o{i}/$n{i}) at once"""
+    params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    fields = "\n".join(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoFields }}" for i in range(count))
+    return f"query($since: GitTimestamp!, {params}) {{\n{fields}\n  rateLimit {{ cost remaining }}\n}}\n{REPO_FRAGMENT}"
+
+
+def map_repo_info(node: Dict[str, Any], contributors_count: int) -> Dict[str, Any]:
+    """Map a GraphQL repository node onto the get_repo_info dict shape"""
+    open_issues = node["issues"]["totalCount"]
+    open_prs = node["pullRequests"]["totalCount"]
+    return {
+        "name": node["name"],
+        "full_name": node["nameWithOwner"],
+        "description": node["description"],
+        "html_url": node["url"],
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "stargazers_count": node["stargazerCount"],
+        "forks_count": node["forkCount"],
+        # REST counts open pull requests as issues too
+        "open_issues_count": open_issues + open_prs,
+        "subscribers_count": node["watchers"]["totalCount"],
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "pushed_at": node["pushedAt"],
+        "license": (node.get("licenseInfo") or {}).get("name"),
+        "contributors_count": contributors_count
+    }
+
+
+def first_week_start(start_date: datetime) -> datetime:
+    """Start of the first commit-activity week (Sunday 00:00 UTC) at or after start_date.
+
+    REST sums the whole weeks that start at or after start_date, so counting
+    GraphQL history from here counts the same commits.
+    """
+    day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    if day < start_date:
+        day += timedelta(days=1)
+    return day + timedelta(days=(6 - day.weekday()) % 7)
+
+
+def map_repo_stats(node: Dict[str, Any], start_date: datetime, now: datetime, days: int) -> Dict[str, Any]:
+    """Map a GraphQL repository node onto the get_repo_stats dict shape.
+
+    GraphQL has no weekly breakdown, so total_commits is the commit count on
+    the default branch since first_week_start(start_date), the same commits
+    REST sums, and the per-week lists are empty.
+    """
+    target = (node.get("defaultBranchRef") or {}).get("target") or {}
+    total_commits = (target.get("history") or {}).get("totalCount", 0)
+    return {
+        "commit_activity": {
+            "total_commits": total_commits,
+            "daily_commits": [],
+            "weeks": []
+        },
+        "issues": {
+            "open": node["issues"]["totalCount"],
+        },
+        "pull_requests": {
+            "open": node["pullRequests"]["totalCount"],
+        },
+        "analysis_period": {
+            "start_date": start_date.isoformat(),
+            "end_date": now.isoformat(),
+            "days": days
+        },
+        "pending": False
+    }
+
+
+class RepoBatchLoader:
+    """Batches per-repo lookups into chunked GraphQL queries.
+
+    Every ``load()`` made in the same event-loop tick is queued and resolved
+    by one aliased GraphQL query per GRAPHQL_BATCH_SIZE repositories, so N
+    repositories cost ceil(N / batch size) GraphQL calls plus one (cached)
+    REST contributors call each, instead of five REST calls each. Repos the
+    query cannot resolve, or whole chunks that fail, fall back to REST.
+    """
+
+    def __init__(self, service: "GitHubService", days: int = 30):
+        self.service = service
+        self.days = days
+        self.url = settings.GITHUB_GRAPHQL_URL
+        self._queue: List[Tuple[str, str, "asyncio.Future[Dict[str, Any]]"]] = []
+        self.counters: Dict[str, int] = {"queries": 0, "repos": 0, "rest_fallbacks": 0}
+
+    async def load(self, owner: str, repo: str) -> Dict[str, Any]:
+        """Return {"info": ..., "stats": ...} for one repository"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._queue:
+            loop.call_soon(self._dispatch)
+        self._queue.append((owner, repo, future))
+        return await future
+
+    def _dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+        size = max(1, settings.GRAPHQL_BATCH_SIZE)
+        for i in range(0, len(queue), size):
+            asyncio.ensure_future(self._run_chunk(queue[i:i + size]))
+
+    async def _run_chunk(self, chunk: List[Tuple[str, str, "asyncio.Future[Dict[str, Any]]"]]) -> None:
+        now = datetime.utcnow()
+        start_date = now - timedelta(days=self.days)
+        variables: Dict[str, Any] = {"since": first_week_start(start_date).strftime("%Y-%m-%dT%H:%M:%SZ")}
+        for i, (owner, repo, _) in enumerate(chunk):
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = repo
+
+        try:
+            payload = await self._post(build_batch_query(len(chunk)), variables)
+            data = payload.get("data") or {}
+            self.counters["queries"] += 1
+            if payload.get("errors"):
+                logger.warning(f"GraphQL batch returned errors: {payload['errors'][:3]}")
+        except Exception as e:
+            logger.warning(f"GraphQL batch failed, falling back to REST: {str(e)}")
+            data = {}
+
+        await asyncio.gather(*(
+            self._resolve(owner, repo, future, data.get(f"r{i}"), start_date, now)
+            for i, (owner, repo, future) in enumerate(chunk)
+        ))
+
+    async def _resolve(
+        self,
+        owner: str,
+        repo: str,
+        future: "asyncio.Future[Dict[str, Any]]",
+        node: Optional[Dict[str, Any]],
+        start_date: datetime,
+        now: datetime
+    ) -> None:
+        if future.done():  # caller went away
+            return
+        try:
+            if node is None:
+                self.counters["rest_fallbacks"] += 1
+                result = await self._load_rest(owner, repo)
+            else:
+                contributors_count = await self.service.count_contributors(owner, repo)
+                result = {
+                    "info": map_repo_info(node, contributors_count),
+                    "stats": map_repo_stats(node, start_date, now, self.days)
+                }
+            self.counters["repos"] += 1
+            if not future.done():
+                future.set_result(result)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+    async def _load_rest(self, owner: str, repo: str) -> Dict[str, Any]:
+        return await self.service.get_repo_data(owner, repo, self.days)
+
+    async def _post(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        body = {"query": query, "variables": variables}
+        session = self.service.session
+        if session is not None:
+            return await deadline.bounded(self._post_on(session, body))
+
+        connector = aiohttp.TCPConnector(ssl=ssl_context)
+        async with aiohttp.ClientSession(connector=connector, timeout=build_timeout()) as session:
+            return await deadline.bounded(self._post_on(session, body))
+
+    async def _post_on(self, session: aiohttp.ClientSession, body: Dict[str, Any]) -> Dict[str, Any]:
+        token, headers = await self.service._auth_headers(self.url)
+        upstream = upstream_for_url(self.url)
+        status = "error"
+        start = time.perf_counter()
+        try:
+            with upstream_in_flight.track_in_progress(upstream):
+                async with session.post(self.url, json=body, headers=headers, ssl=ssl_context) as response:
+                    status = str(response.status)
+                    self.service._record(token, self.url, response.status, response.headers)
+                    observe_rate_limit(self.url, response.headers)
+                    if response.status != 200:
+                        raise Exception(f"GitHub GraphQL error: {await response.text()} (Status: {response.status})")
+                    upstream_response_bytes.labels(upstream).inc(len(await response.read()))
+                    return await response.json()
+        except asyncio.TimeoutError:
+            status = "timeout"
+            raise
+        finally:
+            upstream_requests.labels(upstream, status).inc()
+            upstream_request_duration.labels(upstream).observe(time.perf_counter() - start)
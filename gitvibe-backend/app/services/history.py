@@ -0,0 +1,186 @@
+import asyncio
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+import logging
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DAY = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    id INTEGER PRIMARY KEY,
+    full_name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    repo_id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    stars INTEGER NOT NULL,
+    forks INTEGER NOT NULL,
+    open_issues INTEGER NOT NULL,
+    open_prs INTEGER NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (repo_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS weeks (
+    repo_id INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (repo_id, week)
+) WITHOUT ROWID;
+"""
+
+
+class HistoryStore:
+    """Persistent per-repository metric history in SQLite.
+
+    Two narrow tables of integers, clustered on (repo, time) and WITHOUT
+    ROWID, so a row costs a few bytes and reading one repository's history
+    is a single range scan; nothing is held in memory between calls.
+
+    - snapshots: stars, forks, open issues, open PRs and vibe score, one row
+      per repository per UTC day (the day's latest scoring wins).
+    - weeks: weekly commit totals keyed by GitHub's week timestamp. Only
+      weeks at or after the latest stored week are written: older weeks
+      never change, and the latest one may still have been in progress.
+
+    SQLite calls are blocking, so they run on one worker thread that owns
+    the connection.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.HISTORY_DB_PATH
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self.counters: Dict[str, int] = {
+            "snapshots": 0, "weeks_appended": 0, "weeks_skipped": 0, "errors": 0
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: fn(self._connect()))
+
+    @staticmethod
+    def _key(owner: str, repo: str) -> str:
+        return f"{owner}/{repo}".lower()
+
+    async def record(
+        self,
+        owner: str,
+        repo: str,
+        info: Dict[str, Any],
+        stats: Dict[str, Any],
+        score: Dict[str, Any],
+        commit_weeks: Optional[List[Dict[str, Any]]] = None,
+        now: Optional[float] = None
+    ) -> None:
+        """Store today's snapshot and append new commit weeks for a scored repository.
+
+        commit_weeks is the unfiltered commit-activity payload (a year of
+        weeks): stats only holds the analysis window, so without it the first
+        snapshot, or one after a long gap, would leave earlier weeks missing.
+        Failures are logged, never raised: history must not break scoring.
+        """
+        if not settings.HISTORY_ENABLED:
+            return
+        snapshot = (
+            info["stargazers_count"], info["forks_count"], stats["issues"]["open"],
+            stats["pull_requests"]["open"], score["score"]
+        )
+        # A pending (202) result carries the last known activity, not new weeks
+        if commit_weeks is None:
+            commit_weeks = stats["commit_activity"]["weeks"]
+        weeks = [] if stats.get("pending") else [(week["week"], week["total"]) for week in commit_weeks]
+        day = int((now if now is not None else time.time()) // DAY)
+        try:
+            await self._run(lambda conn: self._record(conn, self._key(owner, repo), day, snapshot, weeks))
+        except Exception as e:
+            self.counters["errors"] += 1
+            logger.warning(f"Failed to record history for {owner}/{repo}: {str(e)}")
+
+    def _record(self, conn: sqlite3.Connection, full_name: str, day: int, snapshot: tuple, weeks: List[tuple]) -> None:
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO repos (full_name) VALUES (?)", (full_name,))
+            (repo_id,) = conn.execute("SELECT id FROM repos WHERE full_name = ?", (full_name,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (repo_id, day, *snapshot)
+            )
+            (latest,) = conn.execute("SELECT MAX(week) FROM weeks WHERE repo_id = ?", (repo_id,)).fetchone()
+            new = [(repo_id, week, total) for week, total in weeks if latest is None or week >= latest]
+            conn.executemany("INSERT OR REPLACE INTO weeks VALUES (?, ?, ?)", new)
+        self.counters["snapshots"] += 1
+        self.counters["weeks_appended"] += len(new)
+        self.counters["weeks_skipped"] += len(weeks) - len(new)
+
+    async def history(self, owner: str, repo: str, days: int = 90, now: Optional[float] = None) -> Dict[str, Any]:
+        """Snapshots and weekly commit totals of the last `days` days, oldest first"""
+        since = (now if now is not None else time.time()) - days * DAY
+        return await self._run(lambda conn: self._history(conn, self._key(owner, repo), since))
+
+    @staticmethod
+    def _history(conn: sqlite3.Connection, full_name: str, since: float) -> Dict[str, Any]:
+        row = conn.execute("SELECT id FROM repos WHERE full_name = ?", (full_name,)).fetchone()
+        if row is None:
+            return {"repo": full_name, "snapshots": [], "weekly_commits": []}
+        snapshots = conn.execute(
+            "SELECT day, stars, forks, open_issues, open_prs, score FROM snapshots"
+            " WHERE repo_id = ? AND day >= ? ORDER BY day",
+            (row[0], int(since // DAY))
+        ).fetchall()
+        weeks = conn.execute(
+            "SELECT week, total FROM weeks WHERE repo_id = ? AND week >= ? ORDER BY week",
+            (row[0], int(since))
+        ).fetchall()
+        return {
+            "repo": full_name,
+            "snapshots": [
+                {
+                    "date": datetime.utcfromtimestamp(day * DAY).date().isoformat(),
+                    "stars": stars, "forks": forks, "open_issues": open_issues,
+                    "open_prs": open_prs, "score": score
+                }
+                for day, stars, forks, open_issues, open_prs, score in snapshots
+            ],
+            "weekly_commits": [{"week": week, "total": total} for week, total in weeks],
+        }
+
+    async def stats(self) -> Dict[str, Any]:
+        def count(conn: sqlite3.Connection) -> Dict[str, int]:
+            return {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("repos", "snapshots", "weeks")
+            }
+        sizes = await self._run(count) if settings.HISTORY_ENABLED else {}
+        return {**self.counters, **sizes, "enabled": settings.HISTORY_ENABLED}
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await asyncio.get_running_loop().run_in_executor(self._executor, conn.close)
+        self._executor.shutdown(wait=False)
+        self._executor = None
+
+
+history_store = HistoryStore()
@@ -0,0 +1,73 @@
+import aiohttp
+import ssl
+import certifi
+from typing import Optional
+import logging
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Create SSL context that uses the system's CA certificates
+ssl_context = ssl.create_default_context(cafile=certifi.where())
+
+
+def build_timeout() -> aiohttp.ClientTimeout:
+    """Build the outbound timeout policy from settings"""
+    return aiohttp.ClientTimeout(
+        total=settings.HTTP_TOTAL_TIMEOUT,
+        connect=settings.HTTP_CONNECT_TIMEOUT,
+        sock_read=settings.HTTP_READ_TIMEOUT,
+    )
+
+
+def build_connector() -> aiohttp.TCPConnector:
+    """Build a keep-alive connector with per-host limits and DNS caching"""
+    return aiohttp.TCPConnector(
+        ssl=ssl_context,
+        limit=settings.HTTP_POOL_SIZE,
+        limit_per_host=settings.HTTP_POOL_SIZE_PER_HOST,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+        use_dns_cache=True,
+    )
+
+
+class HTTPClient:
+    """App-scoped aiohttp session shared by every GitHubService.
+
+    The FastAPI lifespan opens it on startup and closes it on shutdown, so
+    connections (and their TLS sessions) are reused across requests.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        """The shared session, or None if the client has not been started"""
+        if self._session is None or self._session.closed:
+            return None
+        return self._session
+
+    async def start(self) -> aiohttp.ClientSession:
+        """Open the shared session if it is not already open"""
+        if self.session is None:
+            self._session = aiohttp.ClientSession(
+                connector=build_connector(),
+                timeout=build_timeout(),
+            )
+            logger.info(
+                f"Opened shared HTTP session (pool={settings.HTTP_POOL_SIZE}, "
+                f"per_host={settings.HTTP_POOL_SIZE_PER_HOST})"
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared session and release its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Closed shared HTTP session")
+        self._session = None
+
+
+http_client = HTTPClient()
@@ -0,0 +1,281 @@
+import asyncio
+import hashlib
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+import logging
+from ..core.config import settings
+from .pagination import iter_items
+from .rate_limiter import RequestShed
+from . import deadline
+
+if TYPE_CHECKING:
+    from .github_service import GitHubService
+
+logger = logging.getLogger(__name__)
+
+
+def org_board_id(org: str) -> str:
+    return f"org-{org.lower()}"
+
+
+def repos_board_id(names: List[str]) -> str:
+    """The same set of repositories, in any order or case, gets the same board"""
+    digest = hashlib.sha1(",".join(sorted(name.lower() for name in names)).encode()).hexdigest()
+    return f"repos-{digest[:12]}"
+
+
+def leaderboard_entry(info: Dict[str, Any], score: Dict[str, Any]) -> Dict[str, Any]:
+    """What a leaderboard row shows of a scored repository"""
+    return {
+        "full_name": info["full_name"],
+        "html_url": info["html_url"],
+        "description": info["description"],
+        "language": info["language"],
+        "stargazers_count": info["stargazers_count"],
+        "score": score["score"],
+        "vibe": score["vibe"],
+    }
+
+
+class RankedIndex:
+    """Repositories ordered by score, best first, updated one at a time.
+
+    A sorted list of (-score, name) keys next to a dict of rows: rescoring a
+    repository is a binary search to drop its old key and an insort of the
+    new one, and a page is a slice, so reads cost O(log n + page) however
+    large the board. Ties are broken by name, so pages are stable.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[float, str]] = []
+        self._rows: Dict[str, Tuple[Tuple[float, str], Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._rows
+
+    def update(self, name: str, score: float, row: Dict[str, Any]) -> None:
+        self.remove(name)
+        key = (-score, name.lower())
+        insort(self._keys, key)
+        self._rows[name.lower()] = (key, row)
+
+    def remove(self, name: str) -> None:
+        old = self._rows.pop(name.lower(), None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, old[0])]
+
+    def rank(self, name: str) -> Optional[int]:
+        """1-based position of a repository"""
+        row = self._rows.get(name.lower())
+        return bisect_left(self._keys, row[0]) + 1 if row is not None else None
+
+    def page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Rows offset+1 to offset+limit, with their rank"""
+        return [
+            {"rank": offset + i + 1, **self._rows[name][1]}
+            for i, (_, name) in enumerate(self._keys[offset:offset + limit])
+        ]
+
+
+class Leaderboard:
+    """One ranked set of repositories: an organization's or an explicit list"""
+
+    def __init__(self, board_id: str, org: Optional[str] = None, repos: Optional[List[Tuple[str, str]]] = None):
+        self.id = board_id
+        self.org = org
+        self.repos = repos
+        self.index = RankedIndex()
+        self.members: Set[str] = {f"{owner}/{repo}".lower() for owner, repo in repos or []}
+        self.state = "pending"  # ingesting, ready, incomplete (some repos not scored) or failed
+        self.error: Optional[str] = None
+        self.failed: Dict[str, str] = {}
+        self.ingested_at = 0.0
+        self.task: Optional["asyncio.Task[None]"] = None
+
+    def update(self, info: Dict[str, Any], score: Dict[str, Any]) -> None:
+        self.index.update(info["full_name"], score["score"], leaderboard_entry(info, score))
+
+    def is_stale(self, now: float) -> bool:
+        return self.state != "ingesting" and now - self.ingested_at >= settings.LEADERBOARD_REFRESH_INTERVAL
+
+    def page(self, page: int, per_page: int) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "org": self.org,
+            "state": self.state,
+            "error": self.error,
+            "repos": len(self.members),
+            "scored": len(self.index),
+            "failed": len(self.failed),
+            "ingested_at": self.ingested_at or None,
+            "page": page,
+            "per_page": per_page,
+            "entries": self.index.page((page - 1) * per_page, per_page),
+        }
+
+
+class LeaderboardStore:
+    """Leaderboards over organizations or lists of repositories.
+
+    A board is created by its first read and filled in the background: the
+    organization's repositories are listed page by page (up to
+    LEADERBOARD_MAX_REPOS), then scored in waves of
+    LEADERBOARD_MAX_CONCURRENCY, each wave batched into GraphQL queries when
+    a token is configured and scored in one vectorized pass. Rows appear as
+    soon as they are scored, and a repository rescored anywhere else (a
+    vibe-score request, the precompute worker) moves on every board it is
+    on. Boards older than LEADERBOARD_REFRESH_INTERVAL are rescored in the
+    background on their next read while the current ranking is served; the
+    least recently read boards are dropped past LEADERBOARD_MAX_BOARDS.
+    """
+
+    def __init__(self):
+        self._boards: "OrderedDict[str, Leaderboard]" = OrderedDict()
+        self._by_repo: Dict[str, Set[str]] = {}
+        self.counters: Dict[str, int] = {"ingests": 0, "scored": 0, "failed": 0, "rescored": 0, "evicted": 0}
+
+    def get(self, board_id: str) -> Optional[Leaderboard]:
+        board = self._boards.get(board_id)
+        if board is not None:
+            self._boards.move_to_end(board_id)
+        return board
+
+    def ensure(self, board: Leaderboard, service_factory: Callable[[], "GitHubService"]) -> Leaderboard:
+        """The stored board with board's id (storing board if there is none), ingesting it if stale"""
+        existing = self.get(board.id)
+        if existing is None:
+            self._boards[board.id] = existing = board
+            self._join(board, board.members)
+            while len(self._boards) > settings.LEADERBOARD_MAX_BOARDS:
+                self._evict(next(iter(self._boards)))
+        if existing.is_stale(time.time()):
+            existing.state = "ingesting"
+            existing.task = asyncio.ensure_future(self._ingest(existing, service_factory))
+        return existing
+
+    def _join(self, board: Leaderboard, names: Set[str]) -> None:
+        for name in names:
+            self._by_repo.setdefault(name, set()).add(board.id)
+
+    def _leave(self, board: Leaderboard, names: Set[str]) -> None:
+        for name in names:
+            boards = self._by_repo.get(name)
+            if boards is not None:
+                boards.discard(board.id)
+                if not boards:
+                    del self._by_repo[name]
+
+    def _evict(self, board_id: str) -> None:
+        board = self._boards.pop(board_id)
+        self._leave(board, board.members)
+        if board.task is not None:
+            board.task.cancel()
+        self.counters["evicted"] += 1
+
+    def record_score(self, info: Dict[str, Any], score: Dict[str, Any]) -> None:
+        """A repository was scored: move it on the boards it belongs to"""
+        for board_id in self._by_repo.get(info["full_name"].lower(), ()):
+            self._boards[board_id].update(info, score)
+            self.counters["rescored"] += 1
+
+    async def _list_org(self, service: "GitHubService", org: str) -> List[Tuple[str, str]]:
+        repos = []
+        async for item in iter_items(service, f"{service.base_url}/orgs/{org}/repos"):
+            repos.append(tuple(item["full_name"].split("/", 1)))
+            if len(repos) >= settings.LEADERBOARD_MAX_REPOS:
+                break
+        return repos
+
+    async def _ingest(self, board: Leaderboard, service_factory: Callable[[], "GitHubService"]) -> None:
+        deadline.clear()  # Outlives the request that created the board
+        self.counters["ingests"] += 1
+        service = service_factory()
+        try:
+            repos = board.repos if board.repos is not None else await self._list_org(service, board.org)
+            members = {f"{owner}/{repo}".lower() for owner, repo in repos}
+            # Repositories that left the organization leave the board
+            for name in board.members - members:
+                board.index.remove(name)
+            self._leave(board, board.members - members)
+            self._join(board, members)
+            board.members = members
+            board.failed = {}
+
+            loader = service.batch_loader()
+            wave = max(1, settings.LEADERBOARD_MAX_CONCURRENCY)
+            for i in range(0, len(repos), wave):
+                chunk = repos[i:i + wave]
+                results = await asyncio.gather(*(
+                    loader.load(owner, repo) if loader is not None else service.get_repo_data(owner, repo)
+                    for owner, repo in chunk
+                ), return_exceptions=True)
+                loaded = []
+                for (owner, repo), result in zip(chunk, results):
+                    if isinstance(result, RequestShed):
+                        raise result
+                    if isinstance(result, BaseException):
+                        board.failed[f"{owner}/{repo}"] = str(result)
+                        self.counters["failed"] += 1
+                        continue
+                    loaded.append(result)
+                for data, score in zip(loaded, await self._score_wave(service, loaded)):
+                    if isinstance(score, BaseException):
+                        board.failed[data["info"]["full_name"]] = str(score)
+                        self.counters["failed"] += 1
+                        continue
+                    board.update(data["info"], score)
+                    self.counters["scored"] += 1
+            board.state = "incomplete" if board.failed else "ready"
+            board.error = None
+            board.ingested_at = time.time()
+        except RequestShed as e:
+            # Low-priority work is being shed: keep what was scored and leave
+            # ingested_at alone, so the board stays stale and the next read resumes it
+            board.state = "incomplete"
+            board.error = str(e)
+        except Exception as e:
+            logger.warning(f"Leaderboard {board.id} failed: {str(e)}")
+            board.state = "failed"
+            board.error = str(e)
+            board.ingested_at = time.time()
+        logger.info(f"Leaderboard {board.id}: {len(board.index)} scored, {len(board.failed)} failed ({board.state})")
+
+    @staticmethod
+    async def _score_wave(service: "GitHubService", loaded: List[Dict[str, Any]]) -> List[Any]:
+        """Scores of a loaded wave in input order; a repository that cannot be scored gets its error"""
+        if not loaded:
+            return []
+        try:
+            return await service.score_and_record_many(loaded)
+        except Exception as e:
+            # One bad record (e.g. a null pushed_at) fails the whole batch: score one by one
+            logger.warning(f"Batch scoring failed, scoring repositories one by one: {str(e)}")
+            return await asyncio.gather(*(
+                service.score_and_record(
+                    *data["info"]["full_name"].split("/"), data["info"], data["stats"], data.get("commit_weeks")
+                )
+                for data in loaded
+            ), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "boards": {
+                board.id: {"state": board.state, "repos": len(board.members), "scored": len(board.index)}
+                for board in self._boards.values()
+            },
+        }
+
+    async def close(self) -> None:
+        tasks = [board.task for board in self._boards.values() if board.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+leaderboards = LeaderboardStore()
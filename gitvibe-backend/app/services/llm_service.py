@@ -0,0 +1,279 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+import httpx
+import openai
+import logging
+from ..core.config import settings
+from .circuit_breaker import CircuitBreaker, CircuitOpen, llm_breaker
+from . import freshness, deadline
+from .deadline import DeadlineExceeded
+from .metrics import upstream_requests, upstream_request_duration, upstream_response_bytes, upstream_in_flight
+
+logger = logging.getLogger(__name__)
+
+
+class LLMTimeout(Exception):
+    """An LLM call (including time spent queued for a slot) ran past its timeout"""
+
+
+def is_llm_failure(error: BaseException) -> bool:
+    """Whether an error means the LLM API is unhealthy (rather than the request being bad)"""
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code >= 500 or error.status_code == 429
+    return isinstance(error, (LLMTimeout, openai.APIConnectionError, openai.APITimeoutError))
+
+
+def _status(error: Optional[BaseException]) -> str:
+    """Metric label for a call's outcome"""
+    if error is None:
+        return "ok"
+    if isinstance(error, LLMTimeout):
+        return "timeout"
+    if isinstance(error, DeadlineExceeded):
+        return "deadline"
+    if isinstance(error, openai.APIStatusError):
+        return str(error.status_code)
+    if isinstance(error, Exception):
+        return "error"
+    return "cancelled"
+
+
+class LLMClient:
+    """App-scoped async OpenAI client shared by every LLM call.
+
+    Requests go through one pooled ``openai.AsyncOpenAI`` client, so they
+    never block the event loop and reuse keep-alive connections. At most
+    LLM_MAX_CONCURRENCY calls run at once; the rest queue for a slot. The
+    timeout covers queueing and the call itself, and cancels the request
+    when it expires rather than leaving it running in the background.
+    Calls made while serving a request also stop at the request's deadline,
+    raising DeadlineExceeded.
+
+    Timeouts, connection errors, 429s and 5xx trip the circuit breaker; while
+    it is open calls raise CircuitOpen at once, so callers fall back to
+    template roasts without waiting out the timeout.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, breaker: Optional[CircuitBreaker] = None):
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self.breaker = breaker
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._in_flight = 0
+        self.counters: Dict[str, int] = {
+            "calls": 0, "streams": 0, "timeouts": 0, "deadlines": 0, "errors": 0, "cancelled": 0, "rejected": 0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.OPENAI_API_KEY)
+
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """The shared client, created on first use"""
+        if self._client is None:
+            self._client = openai.AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL,
+                max_retries=0,  # The timeout budget is too small for retries
+                http_client=openai.DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=settings.LLM_POOL_SIZE,
+                        max_keepalive_connections=settings.LLM_POOL_SIZE,
+                    ),
+                    timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT),
+                ),
+            )
+            logger.info(
+                f"Opened LLM client (pool={settings.LLM_POOL_SIZE}, "
+                f"max_concurrency={self.max_concurrency})"
+            )
+        return self._client
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 60,
+        temperature: float = 0.4,
+        timeout: Optional[float] = None
+    ) -> str:
+        """Run one chat completion and return the message text"""
+        timeout, bounded = deadline.budget(timeout if timeout is not None else settings.LLM_TIMEOUT_SECONDS)
+        deadline.check()
+        self._before_call()
+        self.counters["calls"] += 1
+        start = time.perf_counter()
+        try:
+            text = await asyncio.wait_for(self._complete(messages, max_tokens, temperature), timeout)
+        except asyncio.TimeoutError:
+            if bounded:
+                self.counters["deadlines"] += 1
+                self._after_call(DeadlineExceeded(), start)
+                raise DeadlineExceeded("Request deadline reached during the LLM call")
+            self.counters["timeouts"] += 1
+            self._after_call(LLMTimeout(), start)
+            raise LLMTimeout(f"LLM call timed out after {timeout}s")
+        except BaseException as e:
+            if isinstance(e, Exception):
+                self.counters["errors"] += 1
+            self._after_call(e, start)
+            raise
+        self._after_call(None, start, len(text.encode()))
+        return text
+
+    def _before_call(self) -> None:
+        if self.breaker is None:
+            return
+        try:
+            self.breaker.before_call()
+        except CircuitOpen:
+            self.counters["rejected"] += 1
+            upstream_requests.labels("llm", "rejected").inc()
+            freshness.note_degraded("llm")
+            raise
+
+    def _after_call(self, error: Optional[BaseException], start: float, received: int = 0) -> None:
+        """Record a call's outcome in the metrics and report it to the circuit breaker"""
+        upstream_requests.labels("llm", _status(error)).inc()
+        upstream_request_duration.labels("llm").observe(time.perf_counter() - start)
+        if received:
+            upstream_response_bytes.labels("llm").inc(received)
+        if isinstance(error, Exception):
+            freshness.note_degraded("llm")
+        if self.breaker is None:
+            return
+        if error is None:
+            self.breaker.record_success()
+        elif is_llm_failure(error):
+            self.breaker.record_failure()
+        elif isinstance(error, Exception) and not isinstance(error, DeadlineExceeded):
+            self.breaker.record_success()  # The API answered; the request was at fault
+        else:
+            self.breaker.release()  # Cancelled or out of time: no verdict on the upstream
+
+    async def _complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> str:
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                with upstream_in_flight.track_in_progress("llm"):
+                    response = await self.client.chat.completions.create(
+                        model=settings.LLM_MODEL,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                    )
+            finally:
+                self._in_flight -= 1
+        return response.choices[0].message.content.strip()
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 60,
+        temperature: float = 0.4,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """Run one chat completion and yield its text as tokens arrive.
+
+        The first token must arrive within LLM_TIMEOUT_SECONDS (queueing
+        included) and the whole completion within LLM_STREAM_TIMEOUT_SECONDS,
+        both capped by the request deadline. Closing the generator early, e.g. because the client disconnected,
+        closes the upstream response so the generation stops.
+        """
+        timeout, _ = deadline.budget(timeout if timeout is not None else settings.LLM_STREAM_TIMEOUT_SECONDS)
+        deadline.check()
+        finish_by = time.monotonic() + timeout
+        first_token_by = time.monotonic() + min(timeout, settings.LLM_TIMEOUT_SECONDS)
+        self._before_call()
+        self.counters["streams"] += 1
+        start = time.perf_counter()
+        finished = False
+        outcome: Optional[BaseException] = GeneratorExit()  # No verdict unless the stream ends
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), first_token_by - time.monotonic())
+        except asyncio.TimeoutError:
+            if deadline.expired():
+                self.counters["deadlines"] += 1
+                self._after_call(DeadlineExceeded(), start)
+                raise DeadlineExceeded("Request deadline reached waiting for an LLM slot")
+            self.counters["timeouts"] += 1
+            self._after_call(LLMTimeout(), start)
+            raise LLMTimeout(f"No LLM slot free within {settings.LLM_TIMEOUT_SECONDS}s")
+        except BaseException as e:
+            self._after_call(e, start)
+            raise
+
+        self._in_flight += 1
+        upstream_in_flight.labels("llm").inc()
+        received = 0
+        response = None
+        try:
+            response = await asyncio.wait_for(
+                self.client.chat.completions.create(
+                    model=settings.LLM_MODEL,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                ),
+                first_token_by - time.monotonic()
+            )
+            chunks = response.__aiter__()
+            started = False
+            while True:
+                limit = (finish_by if started else first_token_by) - time.monotonic()
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), max(limit, 0))
+                except StopAsyncIteration:
+                    break
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    started = True
+                    received += len(text.encode())
+                    yield text
+            finished = True
+            outcome = None
+        except asyncio.TimeoutError:
+            if deadline.expired():
+                self.counters["deadlines"] += 1
+                outcome = DeadlineExceeded()
+                raise DeadlineExceeded("Request deadline reached during the LLM stream")
+            self.counters["timeouts"] += 1
+            outcome = LLMTimeout()
+            raise LLMTimeout(f"LLM stream timed out after {timeout}s")
+        except (asyncio.CancelledError, GeneratorExit):
+            self.counters["cancelled"] += 1
+            raise
+        except Exception as e:
+            self.counters["errors"] += 1
+            outcome = e
+            raise
+        finally:
+            if response is not None and not finished:
+                await response.close()  # Drop the upstream connection: stop paying for tokens
+            self._in_flight -= 1
+            upstream_in_flight.labels("llm").dec()
+            self._semaphore.release()
+            self._after_call(outcome, start, received)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "in_flight": self.in_flight(),
+            "max_concurrency": self.max_concurrency,
+            "circuit": self.breaker.stats() if self.breaker is not None else None,
+        }
+
+    async def close(self) -> None:
+        """Close the shared client and its pooled connections"""
+        if self._client is not None:
+            await self._client.close()
+            logger.info("Closed LLM client")
+        self._client = None
+
+
+llm_client = LLMClient(breaker=llm_breaker)
@@ -0,0 +1,60 @@
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, TYPE_CHECKING
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+if TYPE_CHECKING:
+    from .github_service import GitHubService
+
+LINK_PATTERN = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+
+def parse_link_header(value: Optional[str]) -> Dict[str, str]:
+    """Map rel -> URL from a GitHub Link header"""
+    if not value:
+        return {}
+    return {rel: url for url, rel in LINK_PATTERN.findall(value)}
+
+
+def page_number(url: str) -> Optional[int]:
+    """The ?page= number of a pagination URL"""
+    for key, value in parse_qsl(urlsplit(url).query):
+        if key == "page" and value.isdigit():
+            return int(value)
+    return None
+
+
+def with_params(url: str, **params: Any) -> str:
+    """Return url with the given query parameters set (replacing existing ones)"""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key not in params]
+    query.extend((key, str(value)) for key, value in params.items())
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+async def count_items(service: "GitHubService", url: str) -> int:
+    """Count the items of any GitHub list endpoint with a single request.
+
+    Fetches one item per page: the page number of the rel="last" link is
+    then the item count. Without a Link header everything fit on one page.
+    """
+    response = await service.request(with_params(url, per_page=1))
+    last = response.links.get("last")
+    if last is not None:
+        return page_number(last) or 0
+    return len(response.data) if isinstance(response.data, list) else 0
+
+
+async def iter_pages(service: "GitHubService", url: str, per_page: int = 100) -> AsyncIterator[List[Any]]:
+    """Lazily yield each page of a GitHub list endpoint, following rel="next" links"""
+    next_url: Optional[str] = with_params(url, per_page=per_page)
+    while next_url:
+        response = await service.request(next_url)
+        yield response.data if isinstance(response.data, list) else []
+        next_url = response.links.get("next")
+
+
+async def iter_items(service: "GitHubService", url: str, per_page: int = 100) -> AsyncIterator[Any]:
+    """Lazily yield every item of a GitHub list endpoint, one page at a time"""
+    async for page in iter_pages(service, url, per_page):
+        for item in page:
+            yield item
@@ -0,0 +1,50 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A stage is a function (sync or async) plus the names of the stages whose results it takes
+Stage = Tuple[Callable[..., Any], Sequence[str]]
+
+
+async def run_stages(stages: Dict[str, Stage]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Run a dependency graph of stages as concurrently as it allows.
+
+    Every stage starts as soon as the stages it depends on have finished, so
+    independent fetches overlap. Returns each stage's result and how long it
+    ran (ms, excluding time spent waiting on its dependencies). If any stage
+    fails, the remaining stages are cancelled and the error is raised.
+    """
+    for name, (_, deps) in stages.items():
+        missing = [dep for dep in deps if dep not in stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {missing}")
+
+    tasks: Dict[str, "asyncio.Task[Any]"] = {}
+    timings: Dict[str, float] = {}
+
+    async def run(name: str) -> Any:
+        fn, deps = stages[name]
+        args = [await tasks[dep] for dep in deps]
+        start = time.perf_counter()
+        result = fn(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    # Tasks only start running at the next await, so every entry exists by then
+    for name in stages:
+        tasks[name] = asyncio.ensure_future(run(name))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    return {name: task.result() for name, task in tasks.items()}, timings
@@ -0,0 +1,278 @@
+import asyncio
+import heapq
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+import logging
+from ..core.config import settings
+from .cache import ttl_for_url
+from .rate_limiter import BUCKET_WINDOWS, RateLimitScheduler, RequestShed, bucket_for_url, rate_limiter
+from .roast_cache import RoastCache, roast_cache
+from . import deadline
+
+if TYPE_CHECKING:
+    from .github_service import GitHubService
+
+logger = logging.getLogger(__name__)
+
+# Roast pools renewed per repository (clients ask for a few vibe/score variants)
+MAX_ROAST_KEYS_PER_REPO = 4
+
+# Credits a bucket can hold however short the interval: one repository's worth of calls
+MIN_CREDITS = 5.0
+
+RoastGenerator = Callable[[], Awaitable[str]]
+
+
+def parse_tracked(value: str) -> List[Tuple[str, str]]:
+    """(owner, repo) pairs from a comma-separated list of owner/repo names"""
+    repos = []
+    for name in value.split(","):
+        owner, _, repo = name.strip().partition("/")
+        if owner and repo:
+            repos.append((owner, repo))
+    return repos
+
+
+class Precomputer:
+    """Keeps popular and tracked repositories warm in the background.
+
+    The watchlist is PRECOMPUTE_TRACKED_REPOS plus the PRECOMPUTE_TOP_N
+    repositories requested most often, by request counts that halve every
+    PRECOMPUTE_HALF_LIFE seconds. Every PRECOMPUTE_INTERVAL seconds a pass
+    refreshes the parts of each watched repository (repo info, contributors,
+    commit activity, open issue/PR counts) that expire within
+    PRECOMPUTE_REFRESH_AHEAD seconds, conditionally so unchanged data costs
+    no rate limit, recomputes its vibe score and renews the roast pools
+    clients asked for. Requests for these repositories then hit the cache.
+
+    Each pass may spend PRECOMPUTE_BUDGET_FRACTION of every rate-limit
+    bucket's capacity (earned per second, see BUCKET_WINDOWS), counting each
+    call as if it cost budget; repositories that do not fit wait for the
+    next pass, least requested first. Refreshes are LOW priority requests: a
+    pass is skipped while the core budget is below PRECOMPUTE_MIN_BUDGET and
+    stops as soon as the scheduler sheds one.
+    """
+
+    def __init__(self, scheduler: Optional[RateLimitScheduler] = None, roasts: Optional[RoastCache] = None):
+        self.scheduler = scheduler or rate_limiter
+        self.roasts = roasts if roasts is not None else roast_cache
+        self._semaphore = asyncio.Semaphore(settings.PRECOMPUTE_MAX_CONCURRENCY)
+        # owner/repo (lower-cased) -> (decayed request count, when it was updated, owner, repo)
+        self._requests: Dict[str, Tuple[float, float, str, str]] = {}
+        self._roast_generators: Dict[str, Dict[str, RoastGenerator]] = {}
+        self.credits: Dict[str, float] = {}
+        self._credited_at = 0.0
+        self._sustainable: Optional[int] = None
+        self._shed = False
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.counters: Dict[str, int] = {
+            "passes": 0, "refreshed": 0, "fresh": 0, "deferred": 0, "failed": 0, "shed": 0,
+            "skipped_budget": 0, "stats_pending": 0, "roasts_renewed": 0, "roast_errors": 0
+        }
+
+    @staticmethod
+    def _key(owner: str, repo: str) -> str:
+        return f"{owner}/{repo}".lower()
+
+    @staticmethod
+    def _decayed(entry: Tuple[float, float, str, str], now: float) -> float:
+        count, updated_at = entry[0], entry[1]
+        return count * 0.5 ** ((now - updated_at) / settings.PRECOMPUTE_HALF_LIFE)
+
+    def record_request(self, owner: str, repo: str) -> None:
+        """Count a request for a repository towards the watchlist"""
+        if not settings.PRECOMPUTE_ENABLED:
+            return
+        key = self._key(owner, repo)
+        now = time.time()
+        entry = self._requests.get(key)
+        count = self._decayed(entry, now) + 1 if entry is not None else 1.0
+        self._requests[key] = (count, now, owner, repo)
+        if len(self._requests) > settings.PRECOMPUTE_MAX_TRACKED:
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Forget the least requested repositories, down to 90% of PRECOMPUTE_MAX_TRACKED"""
+        keep = heapq.nlargest(
+            int(settings.PRECOMPUTE_MAX_TRACKED * 0.9), self._requests.items(),
+            key=lambda item: self._decayed(item[1], now)
+        )
+        self._requests = dict(keep)
+        for key in [key for key in self._roast_generators if key not in self._requests]:
+            del self._roast_generators[key]
+
+    def record_roast(self, owner: str, repo: str, key: str, generate: RoastGenerator) -> None:
+        """Remember how to renew a roast pool clients use, for when the repository is watched"""
+        repo_key = self._key(owner, repo)
+        if not settings.PRECOMPUTE_ENABLED or repo_key not in self._requests:
+            return
+        generators = self._roast_generators.setdefault(repo_key, {})
+        generators.pop(key, None)
+        generators[key] = generate
+        while len(generators) > MAX_ROAST_KEYS_PER_REPO:
+            generators.pop(next(iter(generators)))
+
+    def watchlist(self) -> List[Tuple[str, str]]:
+        """Tracked repositories, then the most requested ones"""
+        watched = parse_tracked(settings.PRECOMPUTE_TRACKED_REPOS)
+        seen = {self._key(owner, repo) for owner, repo in watched}
+        now = time.time()
+        popular = heapq.nlargest(
+            settings.PRECOMPUTE_TOP_N, self._requests.items(), key=lambda item: self._decayed(item[1], now)
+        )
+        for key, (_, _, owner, repo) in popular:
+            if key not in seen:
+                seen.add(key)
+                watched.append((owner, repo))
+        return watched
+
+    def _rate(self, bucket: str) -> float:
+        """Calls per second passes may make in a bucket"""
+        return self.scheduler.capacity(bucket) * settings.PRECOMPUTE_BUDGET_FRACTION / BUCKET_WINDOWS[bucket]
+
+    def _add_credits(self, now: float) -> None:
+        """Earn each bucket's share of calls since the last pass, up to one interval's worth"""
+        elapsed = now - self._credited_at if self._credited_at else None
+        for bucket in BUCKET_WINDOWS:
+            rate = self._rate(bucket)
+            cap = max(rate * settings.PRECOMPUTE_INTERVAL, MIN_CREDITS)
+            earned = cap if elapsed is None else self.credits.get(bucket, 0.0) + rate * elapsed
+            self.credits[bucket] = min(cap, earned)
+        self._credited_at = now
+
+    def _sustainable_repos(self, urls: Dict[str, str]) -> int:
+        """How many repositories the budget keeps warm, each part refreshed once per TTL"""
+        calls: Dict[str, float] = {}  # per second, per watched repository
+        for url in urls.values():
+            bucket = bucket_for_url(url)
+            calls[bucket] = calls.get(bucket, 0.0) + 1 / max(1.0, ttl_for_url(url) - settings.PRECOMPUTE_REFRESH_AHEAD)
+        return int(min(self._rate(bucket) / rate for bucket, rate in calls.items()))
+
+    def _roasts_due(self, owner: str, repo: str) -> List[Tuple[str, RoastGenerator]]:
+        generators = self._roast_generators.get(self._key(owner, repo), {})
+        due = []
+        for key, generate in generators.items():
+            left = self.roasts.expires_in(key)
+            if left is None or left <= settings.PRECOMPUTE_REFRESH_AHEAD or self.roasts.size(key) < self.roasts.pool_size:
+                due.append((key, generate))
+        return due
+
+    async def run_once(self, service_factory: Callable[[], "GitHubService"]) -> Dict[str, int]:
+        """One pass over the watchlist; returns how many repositories were refreshed, fresh or deferred"""
+        deadline.clear()  # Never bound by a request's deadline
+        self.counters["passes"] += 1
+        self._add_credits(time.time())
+        summary = {"watched": 0, "refreshed": 0, "fresh": 0, "deferred": 0}
+        if self.scheduler.budget_ratio("core") < settings.PRECOMPUTE_MIN_BUDGET:
+            self.counters["skipped_budget"] += 1
+            return summary
+
+        watched = self.watchlist()
+        summary["watched"] = len(watched)
+        jobs = []
+        for owner, repo in watched:
+            service = service_factory()
+            if self._sustainable is None:
+                self._sustainable = self._sustainable_repos(service.repo_urls(owner, repo))
+                if len(watched) > self._sustainable:
+                    logger.warning(
+                        f"Watchlist of {len(watched)} repositories exceeds the {self._sustainable} "
+                        f"the precompute budget keeps warm; some will expire between refreshes"
+                    )
+            due = await service.due_parts(owner, repo, settings.PRECOMPUTE_REFRESH_AHEAD)
+            roasts = self._roasts_due(owner, repo)
+            if not due and not roasts:
+                summary["fresh"] += 1
+                continue
+            cost = Counter(bucket_for_url(url) for url in due.values())
+            if any(self.credits[bucket] < calls for bucket, calls in cost.items()):
+                summary["deferred"] += 1
+                continue
+            for bucket, calls in cost.items():
+                self.credits[bucket] -= calls
+            jobs.append(self._refresh(service, owner, repo, due, roasts))
+
+        self._shed = False
+        results = await asyncio.gather(*jobs)
+        summary["refreshed"] = sum(results)
+        for name in ("fresh", "deferred", "refreshed"):
+            self.counters[name] += summary[name]
+        return summary
+
+    async def _refresh(
+        self,
+        service: "GitHubService",
+        owner: str,
+        repo: str,
+        due: Dict[str, str],
+        roasts: List[Tuple[str, RoastGenerator]]
+    ) -> bool:
+        async with self._semaphore:
+            if self._shed:
+                return False
+            try:
+                if due:
+                    pending = await service.refresh_parts(due)
+                    self.counters["stats_pending"] += len(pending)
+                    await service.calculate_vibe_score(owner, repo)
+            except RequestShed:
+                # The scheduler is shedding low-priority work: leave the rest for the next pass
+                self._shed = True
+                self.counters["shed"] += 1
+                return False
+            except Exception as e:
+                self.counters["failed"] += 1
+                logger.warning(f"Precompute failed for {owner}/{repo}: {str(e)}")
+                return False
+            for key, generate in roasts:
+                await self._renew_roasts(key, generate)
+            return True
+
+    async def _renew_roasts(self, key: str, generate: RoastGenerator) -> None:
+        """Start a new pool before the key's pool expires, and keep it topped up"""
+        left = self.roasts.expires_in(key)
+        if left is None or left <= settings.PRECOMPUTE_REFRESH_AHEAD:
+            try:
+                roast = await generate()
+            except Exception as e:
+                self.counters["roast_errors"] += 1
+                logger.warning(f"Precompute roast failed for {key}: {str(e)}")
+                return
+            self.roasts.delete(key)
+            self.roasts.add(key, roast)
+            self.counters["roasts_renewed"] += 1
+        self.roasts.schedule_refill(key, generate)
+
+    def start(self, service_factory: Callable[[], "GitHubService"]) -> None:
+        """Run a pass every PRECOMPUTE_INTERVAL seconds until close()"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run(service_factory))
+
+    async def _run(self, service_factory: Callable[[], "GitHubService"]) -> None:
+        while True:
+            try:
+                summary = await self.run_once(service_factory)
+                logger.info(f"Precompute pass: {summary}")
+            except Exception as e:
+                logger.error(f"Precompute pass failed: {str(e)}")
+            await asyncio.sleep(settings.PRECOMPUTE_INTERVAL)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "running": self._task is not None and not self._task.done(),
+            "watchlist": [f"{owner}/{repo}" for owner, repo in self.watchlist()],
+            "requested_repos": len(self._requests),
+            "sustainable_repos": self._sustainable,
+            "credits": {bucket: round(credits, 1) for bucket, credits in self.credits.items()},
+        }
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+precomputer = Precomputer()
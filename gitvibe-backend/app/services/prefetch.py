@@ -0,0 +1,122 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+import logging
+from ..core.config import settings
+from .cache import LRUCache, CacheEntry
+from .rate_limiter import RateLimitScheduler, RequestShed, rate_limiter
+from . import deadline
+
+if TYPE_CHECKING:
+    from .github_service import GitHubService
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """Speculatively warms the cache for the top hits of a search.
+
+    After a search, the top PREFETCH_TOP_K repositories get their vibe score
+    computed in the background by a LOW priority GitHubService, which fetches
+    (and caches) everything the repo page later asks for: repo info,
+    contributors, commit activity and open issue/PR counts. At most
+    PREFETCH_MAX_CONCURRENCY repositories are warmed at once. Nothing is
+    scheduled while the core rate-limit budget is below PREFETCH_MIN_BUDGET,
+    queued prefetches are dropped once it falls below it, and all of them
+    are cancelled as soon as the scheduler sheds one.
+
+    A visit to a repository's page counts as a hit if the repository was
+    prefetched within PREFETCH_TTL seconds.
+    """
+
+    def __init__(self, scheduler: Optional[RateLimitScheduler] = None):
+        self.scheduler = scheduler or rate_limiter
+        self._semaphore = asyncio.Semaphore(settings.PREFETCH_MAX_CONCURRENCY)
+        self._tasks: Dict[str, "asyncio.Task[None]"] = {}
+        self._warmed = LRUCache(settings.PREFETCH_MAX_TRACKED)
+        self.counters: Dict[str, int] = {
+            "scheduled": 0, "completed": 0, "failed": 0, "cancelled": 0,
+            "skipped_budget": 0, "hits": 0, "in_flight_hits": 0
+        }
+
+    def _budget_ok(self) -> bool:
+        return self.scheduler.budget_ratio("core") >= settings.PREFETCH_MIN_BUDGET
+
+    @staticmethod
+    def _key(owner: str, repo: str) -> str:
+        return f"{owner}/{repo}".lower()
+
+    def schedule(self, hits: List[Dict[str, Any]], service_factory: Callable[[], "GitHubService"]) -> int:
+        """Start warming the top hits of a search; returns how many were scheduled"""
+        if not settings.PREFETCH_ENABLED:
+            return 0
+        scheduled = 0
+        for hit in hits[:settings.PREFETCH_TOP_K]:
+            owner, repo = hit["full_name"].split("/", 1)
+            key = self._key(owner, repo)
+            entry = self._warmed.get(key)
+            if key in self._tasks or (entry is not None and entry.is_fresh()):
+                continue
+            if not self._budget_ok():
+                self.counters["skipped_budget"] += 1
+                continue
+            task = asyncio.ensure_future(self._warm(key, owner, repo, service_factory))
+            self._tasks[key] = task
+            task.add_done_callback(lambda _, key=key: self._tasks.pop(key, None))
+            self.counters["scheduled"] += 1
+            scheduled += 1
+        return scheduled
+
+    async def _warm(self, key: str, owner: str, repo: str, service_factory: Callable[[], "GitHubService"]) -> None:
+        deadline.clear()  # Outlives the search request that scheduled it
+        try:
+            async with self._semaphore:
+                if not self._budget_ok():
+                    self.counters["skipped_budget"] += 1
+                    return
+                await service_factory().calculate_vibe_score(owner, repo)
+            self._warmed.set(key, CacheEntry(False, expires_at=time.time() + settings.PREFETCH_TTL))
+            self.counters["completed"] += 1
+        except RequestShed:
+            # The scheduler is shedding low-priority work: stop speculating for now
+            self.counters["cancelled"] += 1
+            self.cancel_all()
+        except asyncio.CancelledError:
+            self.counters["cancelled"] += 1
+            raise
+        except Exception as e:
+            self.counters["failed"] += 1
+            logger.debug(f"Prefetch failed for {owner}/{repo}: {str(e)}")
+
+    def record_visit(self, owner: str, repo: str) -> None:
+        """Note that a repository page was loaded, counting prefetch hits once per prefetch"""
+        key = self._key(owner, repo)
+        if key in self._tasks:
+            self.counters["in_flight_hits"] += 1
+            return
+        entry = self._warmed.get(key)
+        if entry is not None and entry.is_fresh() and not entry.value:
+            entry.value = True  # count each prefetch at most once
+            self.counters["hits"] += 1
+
+    def cancel_all(self) -> None:
+        current = asyncio.current_task()
+        for task in list(self._tasks.values()):
+            if task is not current:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.counters["completed"]
+        return {
+            **self.counters,
+            "in_flight": len(self._tasks),
+            "hit_rate": round(self.counters["hits"] / completed, 3) if completed else None,
+        }
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        self.cancel_all()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+prefetcher = Prefetcher()
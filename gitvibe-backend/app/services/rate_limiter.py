@@ -0,0 +1,230 @@
+import asyncio
+import time
+from enum import IntEnum
+from typing import Any, Dict, List, Mapping, Optional
+from urllib.parse import urlsplit
+import logging
+from ..core.config import settings
+from .metrics import github_rate_limit_remaining
+
+logger = logging.getLogger(__name__)
+
+# Limits assumed for a budget until GitHub's headers tell us the real ones
+DEFAULT_LIMITS = {
+    True: {"core": 5000, "search": 30, "graphql": 5000},  # authenticated
+    False: {"core": 60, "search": 10, "graphql": 0},  # anonymous
+}
+
+# Seconds over which each bucket's limit applies (GitHub resets core and
+# GraphQL hourly, search every minute)
+BUCKET_WINDOWS = {"core": 3600, "search": 60, "graphql": 3600}
+
+
+class Priority(IntEnum):
+    """Outbound request priority; LOW work is shed first as budgets run out"""
+    HIGH = 0
+    LOW = 1
+
+
+class GitHubRateLimited(Exception):
+    """GitHub rejected a request because of a primary or secondary rate limit"""
+
+
+class RateLimitExceeded(Exception):
+    """No token has budget left for a request (or low-priority work was shed)"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def bucket_for_url(url: str) -> str:
+    """GitHub rate-limit bucket a URL is counted against"""
+    path = urlsplit(url).path
+    if path.startswith("/search/"):
+        return "search"
+    if path.endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+# Name of the GitHub API a bucket belongs to, in metrics and circuit breakers
+UPSTREAMS = {"core": "github", "search": "github_search", "graphql": "github_graphql"}
+
+
+def upstream_for_url(url: str) -> str:
+    return UPSTREAMS[bucket_for_url(url)]
+
+
+def observe_rate_limit(url: str, headers: Mapping[str, str]) -> None:
+    """Export a response's X-RateLimit-Remaining as a gauge"""
+    remaining = headers.get("X-RateLimit-Remaining")
+    if remaining is not None and remaining.isdigit():
+        github_rate_limit_remaining.labels(upstream_for_url(url)).set(int(remaining))
+
+
+def mask_token(token: str) -> str:
+    return f"…{token[-4:]}" if token else "anonymous"
+
+
+class RequestShed(RateLimitExceeded):
+    """Low-priority work refused because budgets are low (HIGH priority work would still run)"""
+
+
+class TokenBudget:
+    """What GitHub last told us about one token's budget in one bucket"""
+
+    def __init__(self, token: str, bucket: str):
+        self.token = token
+        self.bucket = bucket
+        self.limit = DEFAULT_LIMITS[bool(token)][bucket]
+        self.remaining = self.limit
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+
+    def estimate(self, now: float) -> int:
+        """Remaining requests, assuming a full budget once the reset time passed"""
+        if now >= self.blocked_until and self.reset_at and now >= self.reset_at:
+            return self.limit
+        return self.remaining if now >= self.blocked_until else 0
+
+    def recovers_at(self) -> float:
+        return max(self.blocked_until, self.reset_at if self.remaining <= 0 else 0.0)
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.estimate(now),
+            "reset_in": max(0, round(self.reset_at - now)) if self.reset_at else None,
+            "blocked_for": max(0, round(self.blocked_until - now)),
+        }
+
+
+class RateLimitScheduler:
+    """Spreads outbound GitHub calls across a pool of tokens by remaining budget.
+
+    Budgets are tracked per token and per bucket (core, search, graphql) from
+    the X-RateLimit-* headers of every response. Each request takes the token
+    with the most budget left in its bucket. LOW priority work is shed once
+    every token is below RATE_LIMIT_LOW_PRIORITY_RESERVE of its limit; HIGH
+    priority work waits (up to RATE_LIMIT_MAX_WAIT seconds) for a reset or a
+    secondary-limit Retry-After to pass.
+    """
+
+    def __init__(self, tokens: List[str]):
+        self._budgets: Dict[str, Dict[str, TokenBudget]] = {}
+        self.counters: Dict[str, int] = {"acquired": 0, "waited": 0, "shed": 0, "exhausted": 0, "secondary_limits": 0}
+        for token in tokens:
+            self.add_token(token)
+        if not self._budgets:
+            self.add_token("")
+
+    def add_token(self, token: str) -> None:
+        if token in self._budgets:
+            return
+        if token and "" in self._budgets:
+            del self._budgets[""]  # Once we have a token, never fall back to anonymous
+        self._budgets[token] = {bucket: TokenBudget(token, bucket) for bucket in ("core", "search", "graphql")}
+
+    def has_tokens(self) -> bool:
+        """Whether the pool holds at least one real (non-anonymous) token"""
+        return any(token for token in self._budgets)
+
+    def _best(self, bucket: str, now: float) -> Optional[TokenBudget]:
+        budgets = [tokens[bucket] for tokens in self._budgets.values()]
+        best = max(budgets, key=lambda budget: budget.estimate(now), default=None)
+        return best if best is not None and best.estimate(now) > 0 else None
+
+    def budget_ratio(self, bucket: str) -> float:
+        """Best remaining/limit ratio across the pool for a bucket (0.0 - 1.0)"""
+        now = time.time()
+        ratios = [
+            tokens[bucket].estimate(now) / tokens[bucket].limit
+            for tokens in self._budgets.values() if tokens[bucket].limit
+        ]
+        return max(ratios, default=0.0)
+
+    def capacity(self, bucket: str) -> int:
+        """Requests the whole pool may make in a bucket per window (see BUCKET_WINDOWS)"""
+        return sum(tokens[bucket].limit for tokens in self._budgets.values())
+
+    async def acquire(self, bucket: str, priority: Priority = Priority.HIGH) -> str:
+        """Pick the token for one request in bucket, waiting or shedding as needed"""
+        give_up_at = time.time() + settings.RATE_LIMIT_MAX_WAIT
+        while True:
+            now = time.time()
+            budget = self._best(bucket, now)
+            if budget is not None:
+                if priority == Priority.LOW and budget.estimate(now) < budget.limit * settings.RATE_LIMIT_LOW_PRIORITY_RESERVE:
+                    self.counters["shed"] += 1
+                    raise RequestShed(f"Shedding low-priority GitHub {bucket} request: budget below reserve")
+                if budget.reset_at and now >= budget.reset_at:
+                    budget.remaining, budget.reset_at = budget.limit, 0.0
+                budget.remaining -= 1  # Reserve optimistically; headers correct it
+                self.counters["acquired"] += 1
+                return budget.token
+
+            recovers_at = min(
+                (tokens[bucket].recovers_at() for tokens in self._budgets.values()),
+                default=now
+            )
+            wait = max(0.05, recovers_at - now)
+            if priority == Priority.LOW or now + wait > give_up_at:
+                self.counters["exhausted"] += 1
+                error = RequestShed if priority == Priority.LOW else RateLimitExceeded
+                raise error(
+                    f"GitHub API rate limit budget exhausted for {bucket} (retry in {round(wait)}s)",
+                    retry_after=wait
+                )
+            self.counters["waited"] += 1
+            logger.warning(f"All GitHub tokens exhausted for {bucket}, waiting {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+    def record(self, token: str, bucket: str, status: int, headers: Mapping[str, str]) -> None:
+        """Update a token's budget from a response's rate-limit headers"""
+        tokens = self._budgets.get(token)
+        if tokens is None:
+            return
+        resource = headers.get("X-RateLimit-Resource")
+        budget = tokens[resource] if resource in tokens else tokens[bucket]
+        if "X-RateLimit-Remaining" not in headers:
+            budget.remaining = min(budget.limit, budget.remaining + 1)  # Refund the reservation
+        try:
+            if "X-RateLimit-Limit" in headers:
+                budget.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Remaining" in headers:
+                budget.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Reset" in headers:
+                budget.reset_at = float(headers["X-RateLimit-Reset"])
+        except ValueError:
+            logger.warning(f"Unparseable GitHub rate-limit headers: {dict(headers)}")
+
+        if status in (403, 429) and "Retry-After" in headers:
+            # Secondary (abuse) limit: stop using this token until Retry-After passes
+            try:
+                retry_after = float(headers["Retry-After"])
+            except ValueError:
+                retry_after = 60.0
+            budget.blocked_until = time.time() + retry_after
+            self.counters["secondary_limits"] += 1
+            logger.warning(f"GitHub secondary rate limit on token {mask_token(token)}, backing off {retry_after}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current budgets per token (masked) and bucket, for diagnostics"""
+        now = time.time()
+        return {
+            "tokens": {
+                mask_token(token): {bucket: budget.snapshot(now) for bucket, budget in tokens.items()}
+                for token, tokens in self._budgets.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+
+def configured_tokens() -> List[str]:
+    """GITHUB_ACCESS_TOKEN plus the comma-separated GITHUB_ACCESS_TOKENS pool"""
+    tokens = [settings.GITHUB_ACCESS_TOKEN] + settings.GITHUB_ACCESS_TOKENS.split(",")
+    return list(dict.fromkeys(token.strip() for token in tokens if token.strip()))
+
+
+rate_limiter = RateLimitScheduler(configured_tokens())
@@ -0,0 +1,53 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+import logging
+from . import deadline
+
+logger = logging.getLogger(__name__)
+
+
+class Revalidator:
+    """Refreshes stale cache entries in the background (stale-while-revalidate).
+
+    Each key gets at most one refresh at a time, so a burst of requests
+    served the same stale entry triggers a single upstream call.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, "asyncio.Task[None]"] = {}
+        self.counters: Dict[str, int] = {"scheduled": 0, "refreshed": 0, "failed": 0}
+
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def schedule(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> bool:
+        """Start refreshing key unless a refresh is already running"""
+        if key in self._tasks:
+            return False
+        task = asyncio.ensure_future(self._run(key, refresh))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _, key=key: self._tasks.pop(key, None))
+        self.counters["scheduled"] += 1
+        return True
+
+    async def _run(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        deadline.clear()  # Outlives the request that scheduled it
+        try:
+            await refresh()
+            self.counters["refreshed"] += 1
+        except Exception as e:
+            self.counters["failed"] += 1
+            logger.warning(f"Background refresh failed, still serving stale: {key}: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "pending": self.pending()}
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+revalidator = Revalidator()
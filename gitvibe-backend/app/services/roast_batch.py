@@ -0,0 +1,78 @@
+import json
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+# (owner, repo_name, score, template roast) for one prompt item
+BatchItem = Tuple[str, str, float, str]
+
+# "3. text", "3) text", "[3] text", "#3: text", "Repo 3 - text"
+NUMBERED_LINE = re.compile(
+    r"^\s*(?:[-*]\s*)?(?:repo\s*)?(?:[\[#(]\s*)?(\d+)(?:\s*[\])]\s*[.:\-–]?|\s*[.):\-–])\s*(.+?)\s*$",
+    re.IGNORECASE
+)
+FENCE = re.compile(r"^```[a-z]*\s*|\s*```$", re.IGNORECASE)
+
+
+def batch_messages(items: Sequence[BatchItem]) -> List[Dict[str, str]]:
+    """Chat messages asking for one roast per numbered repo, as a JSON object"""
+    lines = "\n".join(
+        f'{i}. {owner}/{repo_name} (Score: {score}/100) starter: "{roast}"'
+        for i, (owner, repo_name, score, roast) in enumerate(items, start=1)
+    )
+    prompt = (
+        f"Roast each of these {len(items)} GitHub repos, using its starter.\n{lines}\n"
+        "Be witty and brief (max 2 sentences each). No meanness.\n"
+        'Reply with only a JSON object mapping each number to its roast, e.g. {"1": "...", "2": "..."}.'
+    )
+    return [
+        {"role": "system", "content": "You are a witty AI that roasts GitHub repos briefly and humorously."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _clean(text: Any) -> str:
+    return text.strip().strip('"').strip() if isinstance(text, str) else ""
+
+
+def _from_json(text: str) -> Dict[int, str]:
+    """Pull {number: roast} out of a JSON object or list somewhere in text"""
+    for opener, closer in (("{", "}"), ("[", "]")):
+        start, end = text.find(opener), text.rfind(closer)
+        if start == -1 or end <= start:
+            continue
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            pairs = data.items()
+        else:
+            pairs = [
+                (item.get("id", item.get("number")), item.get("roast", item.get("text")))
+                for item in data if isinstance(item, dict)
+            ]
+        return {int(key): _clean(value) for key, value in pairs if str(key).strip().isdigit()}
+    return {}
+
+
+def _from_lines(text: str) -> Dict[int, str]:
+    """Pull {number: roast} out of numbered lines"""
+    roasts = {}
+    for line in text.splitlines():
+        match = NUMBERED_LINE.match(line)
+        if match:
+            roasts.setdefault(int(match.group(1)), _clean(match.group(2)))
+    return roasts
+
+
+def parse_batch_roasts(text: str, count: int) -> Dict[int, str]:
+    """Map item index (0-based) to roast from a batch completion.
+
+    Accepts the requested JSON object, a JSON list of {"id", "roast"} items,
+    either of them wrapped in code fences or prose, or plain numbered lines.
+    Items that are missing, empty or out of range are left out, so the caller
+    can fall back to templates for exactly those.
+    """
+    text = FENCE.sub("", text.strip())
+    roasts = _from_json(text) or _from_lines(text)
+    return {number - 1: roast for number, roast in roasts.items() if 1 <= number <= count and roast}
@@ -0,0 +1,187 @@
+import asyncio
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import logging
+from ..core.config import settings
+from .cache import LRUCache, CacheEntry
+from .llm_service import llm_client
+from . import deadline
+
+logger = logging.getLogger(__name__)
+
+
+def _magnitude(value: float) -> int:
+    """Order-of-magnitude bucket: 0 for <= 0, then 1 for 1-9, 2 for 10-99, ..."""
+    return 0 if value < 1 else int(math.log10(value)) + 1
+
+
+def _days_bucket(days: int) -> str:
+    for limit in (7, 30, 90, 365):
+        if days <= limit:
+            return f"le{limit}"
+    return "old"
+
+
+def roast_key(
+    owner: str,
+    repo_name: str,
+    vibe: str,
+    score: float,
+    stars: int,
+    issues: int,
+    last_commit_days: int
+) -> str:
+    """Cache key for a repository's roasts.
+
+    The metrics are bucketed (score by 10 points, stars and issues by order of
+    magnitude, commit age by week/month/quarter/year) so small day-to-day
+    changes keep hitting the same pool.
+    """
+    return (
+        f"roast:{owner.lower()}/{repo_name.lower()}:{vibe.lower()}:s{int(score // 10)}"
+        f":st{_magnitude(stars)}:i{_magnitude(issues)}:d{_days_bucket(last_commit_days)}"
+    )
+
+
+class RoastPool:
+    """Several AI roasts for one key, served round-robin"""
+
+    def __init__(self):
+        self.roasts: List[str] = []
+        self.cursor = 0
+
+    def next(self) -> Optional[str]:
+        if not self.roasts:
+            return None
+        roast = self.roasts[self.cursor % len(self.roasts)]
+        self.cursor += 1
+        return roast
+
+
+class RoastCache:
+    """Bounded, TTL'd cache of AI roast pools keyed on repo state.
+
+    Each key holds up to ROAST_POOL_SIZE roasts that are rotated on every hit,
+    so repeat visitors see variety without a new LLM call. Pools that are
+    short of ROAST_POOL_SIZE are topped up by a background worker, one LLM
+    call at a time and only while ``is_idle()`` reports no foreground LLM
+    calls in flight. A pool expires ROAST_CACHE_TTL seconds after it was
+    created; the least recently used pools are evicted past
+    ROAST_CACHE_MAX_ENTRIES.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        pool_size: Optional[int] = None,
+        is_idle: Optional[Callable[[], bool]] = None
+    ):
+        self.ttl = ttl if ttl is not None else settings.ROAST_CACHE_TTL
+        self.pool_size = pool_size or settings.ROAST_POOL_SIZE
+        self.is_idle = is_idle or (lambda: True)
+        self._pools = LRUCache(max_entries or settings.ROAST_CACHE_MAX_ENTRIES)
+        self._refills: Dict[str, Callable[[], Awaitable[str]]] = {}
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0, "stored": 0, "refilled": 0, "refill_errors": 0}
+
+    def _pool(self, key: str) -> Optional[RoastPool]:
+        entry = self._pools.get(key)
+        if entry is None:
+            return None
+        if not entry.is_fresh():
+            self._pools.delete(key)
+            return None
+        return entry.value
+
+    def get(self, key: str) -> Optional[str]:
+        """Next roast from the key's pool, or None on a miss"""
+        pool = self._pool(key)
+        roast = pool.next() if pool is not None else None
+        self.counters["hits" if roast is not None else "misses"] += 1
+        return roast
+
+    def add(self, key: str, roast: str) -> None:
+        """Add a roast to the key's pool, creating the pool if needed"""
+        pool = self._pool(key)
+        if pool is None:
+            pool = RoastPool()
+            self._pools.set(key, CacheEntry(pool, expires_at=time.time() + self.ttl))
+        if len(pool.roasts) < self.pool_size and roast not in pool.roasts:
+            pool.roasts.append(roast)
+            self.counters["stored"] += 1
+
+    def size(self, key: str) -> int:
+        pool = self._pool(key)
+        return len(pool.roasts) if pool is not None else 0
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """Seconds until the key's pool expires, or None if there is no pool"""
+        entry = self._pools.get(key)
+        if entry is None or not entry.is_fresh():
+            return None
+        return entry.expires_at - time.time()
+
+    def delete(self, key: str) -> None:
+        self._pools.delete(key)
+        self._refills.pop(key, None)
+
+    def delete_repo(self, owner: str, repo_name: str) -> int:
+        """Drop every roast pool of a repository; returns how many there were"""
+        prefix = f"roast:{owner.lower()}/{repo_name.lower()}:"
+        keys = [key for key in self._pools.keys() if key.startswith(prefix)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def schedule_refill(self, key: str, generate: Callable[[], Awaitable[str]]) -> None:
+        """Top the key's pool up to ROAST_POOL_SIZE in the background when idle"""
+        if self.size(key) >= self.pool_size or key in self._refills:
+            return
+        self._refills[key] = generate
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not asyncio.get_running_loop():
+            self._worker = asyncio.ensure_future(self._refill_loop())
+
+    def pending_refills(self) -> int:
+        return len(self._refills)
+
+    async def _refill_loop(self) -> None:
+        deadline.clear()  # Outlives the request that started the worker
+        while self._refills:
+            if not self.is_idle():
+                await asyncio.sleep(settings.ROAST_REFILL_IDLE_DELAY)
+                continue
+            key, generate = next(iter(self._refills.items()))
+            if self._pool(key) is None or self.size(key) >= self.pool_size:
+                self._refills.pop(key, None)  # expired, evicted or already full
+                continue
+            before = self.size(key)
+            try:
+                self.add(key, await generate())
+            except Exception as e:
+                self.counters["refill_errors"] += 1
+                self._refills.pop(key, None)
+                logger.warning(f"Roast pool refill failed for {key}: {str(e)}")
+                continue
+            if self.size(key) > before:
+                self.counters["refilled"] += 1
+            # Move on to the next key; come back to this one if it is still short
+            self._refills.pop(key, None)
+            if before < self.size(key) < self.pool_size:  # a duplicate roast ends the refill
+                self._refills[key] = generate
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "pools": len(self._pools), "pending_refills": self.pending_refills()}
+
+    async def close(self) -> None:
+        """Stop the refill worker"""
+        self._refills.clear()
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+
+# Refill only while no foreground LLM call is in flight
+roast_cache = RoastCache(is_idle=lambda: llm_client.in_flight() == 0)
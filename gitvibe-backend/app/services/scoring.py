@@ -0,0 +1,246 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Weights of the component scores in the overall vibe score
+ACTIVITY_WEIGHT = 0.4
+RECENCY_WEIGHT = 0.3
+POPULARITY_WEIGHT = 0.3
+
+# Lowest overall score for each vibe, best first
+VIBE_THRESHOLDS = (
+    (80, "🔥 Active AF"),
+    (60, "🧘‍♂️ Peacefully Maintained"),
+    (40, "😴 Mid"),
+    (20, "⚠️ High Drama Zone"),
+)
+DEAD_VIBE = "💀 Dead on Arrival"
+KING_OF_KERNELS = "👑 King of Kernels"
+CRYING_CAT = "😿 Crying Cat Memorial"
+
+PUSHED_AT_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _vibe(total_score: float, owner: str, repo: str, stars: int, open_issues: int) -> str:
+    vibe = next((name for floor, name in VIBE_THRESHOLDS if total_score >= floor), DEAD_VIBE)
+    # Easter eggs
+    if owner == "torvalds" and repo == "linux":
+        vibe = KING_OF_KERNELS
+    elif stars < 10 and open_issues > 200:
+        vibe = CRYING_CAT
+    return vibe
+
+
+def score_repo(
+    owner: str,
+    repo: str,
+    repo_info: Dict[str, Any],
+    stats: Dict[str, Any],
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Score one repository from its info and stats"""
+    now = now or datetime.utcnow()
+    commit_activity = stats["commit_activity"]["total_commits"]
+    days_since_last_update = (now - datetime.strptime(repo_info["pushed_at"], PUSHED_AT_FORMAT)).days
+
+    activity_score = min(100, commit_activity * 2)  # Cap at 100
+    recency_score = max(0, 100 - (days_since_last_update * 5))  # -5 points per day
+    popularity_score = min(100, repo_info["stargazers_count"] / 10)  # 1000 stars = 100 points
+
+    total_score = (
+        activity_score * ACTIVITY_WEIGHT +
+        recency_score * RECENCY_WEIGHT +
+        popularity_score * POPULARITY_WEIGHT
+    )
+
+    return {
+        "vibe": _vibe(total_score, owner, repo, repo_info["stargazers_count"], repo_info["open_issues_count"]),
+        "score": round(total_score, 1),
+        "metrics": {
+            "activity_score": round(activity_score, 1),
+            "recency_score": round(recency_score, 1),
+            "popularity_score": round(popularity_score, 1),
+        },
+        "stats": {
+            "days_since_last_update": days_since_last_update,
+            "total_commits": commit_activity,
+            "stargazers": repo_info["stargazers_count"],
+            "open_issues": repo_info["open_issues_count"],
+        },
+        "pending": stats.get("pending", False)
+    }
+
+
+def round1(values: np.ndarray) -> np.ndarray:
+    """Round to one decimal exactly like Python's round(x, 1).
+
+    np.round scales by 10 before rounding, so a value whose scaled form lands
+    within float error of .5 can round the other way from round(), which
+    rounds the exact decimal value. Those few values are rounded by round().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 10
+    rounded = np.rint(scaled) / 10
+    near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_half):
+        rounded[i] = round(float(values[i]), 1)
+    return rounded
+
+
+@dataclass
+class BatchScores:
+    """Columnar vibe scores for N repositories, in input order.
+
+    rank is 1 for the best score; repositories with the same (rounded)
+    score share a rank, as in 1, 2, 2, 4.
+    """
+    owner: np.ndarray
+    repo: np.ndarray
+    score: np.ndarray
+    vibe: np.ndarray
+    rank: np.ndarray
+    activity_score: np.ndarray
+    recency_score: np.ndarray
+    popularity_score: np.ndarray
+    days_since_last_update: np.ndarray
+    total_commits: np.ndarray
+    stargazers: np.ndarray
+    open_issues: np.ndarray
+    pending: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    def order(self) -> np.ndarray:
+        """Indices from the best to the worst score (ties in input order)"""
+        return np.argsort(-self.score, kind="stable")
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Per-repository results in the shape of score_repo"""
+        columns = {name: getattr(self, name).tolist() for name in (
+            "score", "vibe", "activity_score", "recency_score", "popularity_score",
+            "days_since_last_update", "total_commits", "stargazers", "open_issues", "pending"
+        )}
+        # score_repo's min(100, stars / 10) returns the int 100 when capped
+        columns["popularity_score"] = [100 if value >= 100 else value for value in columns["popularity_score"]]
+        return [
+            {
+                "vibe": columns["vibe"][i],
+                "score": columns["score"][i],
+                "metrics": {
+                    "activity_score": columns["activity_score"][i],
+                    "recency_score": columns["recency_score"][i],
+                    "popularity_score": columns["popularity_score"][i],
+                },
+                "stats": {
+                    "days_since_last_update": columns["days_since_last_update"][i],
+                    "total_commits": columns["total_commits"][i],
+                    "stargazers": columns["stargazers"][i],
+                    "open_issues": columns["open_issues"][i],
+                },
+                "pending": columns["pending"][i]
+            }
+            for i in range(len(self))
+        ]
+
+
+def competition_rank(scores: np.ndarray) -> np.ndarray:
+    """1-based ranks, best score first; equal scores share the better rank"""
+    order = np.argsort(-scores, kind="stable")
+    ordered = -scores[order]
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[order] = np.searchsorted(ordered, ordered, side="left") + 1
+    return ranks
+
+
+def score_columns(
+    owner: Sequence[str],
+    repo: Sequence[str],
+    pushed_at: np.ndarray,
+    stargazers: Sequence[int],
+    open_issues: Sequence[int],
+    total_commits: Sequence[int],
+    pending: Optional[Sequence[bool]] = None,
+    now: Optional[datetime] = None
+) -> BatchScores:
+    """Score N repositories at once from columns.
+
+    pushed_at is a datetime64 array (UTC). Applies the same formula as
+    score_repo, and every value equals what score_repo returns for that
+    repository.
+    """
+    now = now or datetime.utcnow()
+    owner = np.asarray(owner, dtype=object)
+    repo = np.asarray(repo, dtype=object)
+    stars = np.asarray(stargazers, dtype=np.int64)
+    issues = np.asarray(open_issues, dtype=np.int64)
+    commits = np.asarray(total_commits, dtype=np.int64)
+    pending = np.zeros(len(stars), dtype=bool) if pending is None else np.asarray(pending, dtype=bool)
+
+    # timedelta.days floors, and so does floor division of timedelta64
+    elapsed = np.datetime64(now, "us") - np.asarray(pushed_at).astype("datetime64[us]")
+    days = elapsed // np.timedelta64(1, "D")
+
+    activity = np.minimum(100, commits * 2)
+    recency = np.maximum(0, 100 - days * 5)
+    popularity = np.minimum(100, stars / 10)
+    total = activity * ACTIVITY_WEIGHT + recency * RECENCY_WEIGHT + popularity * POPULARITY_WEIGHT
+
+    # Each threshold passed moves one vibe up, from DEAD_VIBE at 0
+    tiers = np.array([DEAD_VIBE] + [name for _, name in reversed(VIBE_THRESHOLDS)], dtype=object)
+    level = sum((total >= floor).astype(np.int64) for floor, _ in VIBE_THRESHOLDS)
+    vibe = tiers[level]
+    king = (owner == "torvalds") & (repo == "linux")
+    vibe[king] = KING_OF_KERNELS
+    vibe[~king & (stars < 10) & (issues > 200)] = CRYING_CAT
+
+    score = round1(total)
+    return BatchScores(
+        owner=owner,
+        repo=repo,
+        score=score,
+        vibe=vibe,
+        rank=competition_rank(score),
+        activity_score=activity,
+        recency_score=recency,
+        popularity_score=round1(popularity),
+        days_since_last_update=days.astype(np.int64),
+        total_commits=commits,
+        stargazers=stars,
+        open_issues=issues,
+        pending=pending,
+    )
+
+
+def score_records(records: Sequence[Dict[str, Any]], now: Optional[datetime] = None) -> BatchScores:
+    """Score N repositories at once from flat records.
+
+    Each record holds owner, repo, pushed_at (as in the GitHub API,
+    e.g. "2024-01-31T12:00:00Z"), stargazers_count, open_issues_count,
+    total_commits and optionally pending; see repo_record.
+    """
+    return score_columns(
+        owner=[r["owner"] for r in records],
+        repo=[r["repo"] for r in records],
+        pushed_at=np.array([r["pushed_at"].rstrip("Z") for r in records], dtype="datetime64[s]"),
+        stargazers=[r["stargazers_count"] for r in records],
+        open_issues=[r["open_issues_count"] for r in records],
+        total_commits=[r["total_commits"] for r in records],
+        pending=[r.get("pending", False) for r in records],
+        now=now,
+    )
+
+
+def repo_record(owner: str, repo: str, repo_info: Dict[str, Any], stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Flat scoring record from get_repo_info and get_repo_stats results"""
+    return {
+        "owner": owner,
+        "repo": repo,
+        "pushed_at": repo_info["pushed_at"],
+        "stargazers_count": repo_info["stargazers_count"],
+        "open_issues_count": repo_info["open_issues_count"],
+        "total_commits": stats["commit_activity"]["total_commits"],
+        "pending": stats.get("pending", False),
+    }
@@ -0,0 +1,213 @@
+import asyncio
+import heapq
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+import logging
+from ..core.config import settings
+from .cache import LRUCache, CacheEntry
+from .singleflight import SingleFlight
+from .github_service import is_upstream_failure
+from . import freshness, deadline
+
+if TYPE_CHECKING:
+    from .github_service import GitHubService
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case a search query and collapse its whitespace.
+
+    GitHub search is case-insensitive, so "React  Router" and "react router"
+    are the same search and share one cache entry.
+    """
+    return " ".join(query.lower().split())
+
+
+def is_plain(query: str) -> bool:
+    """Whether a query is plain keywords, without qualifiers like language:go"""
+    return ":" not in query and '"' not in query
+
+
+def matches(item: Dict[str, Any], query: str) -> bool:
+    """Whether a search hit contains every word of a (normalized) query"""
+    text = f"{item['full_name']} {item.get('description') or ''}".lower()
+    return all(word in text for word in query.split())
+
+
+class RepoIndex:
+    """In-memory index of repositories seen in search results.
+
+    Repositories are kept in a sorted array keyed on both the lower-cased
+    name and full name, so a prefix is a contiguous slice found by bisection;
+    the slice is ranked by stars. Past SEARCH_INDEX_MAX_REPOS the least
+    starred repositories are dropped.
+    """
+
+    def __init__(self, max_repos: Optional[int] = None):
+        self.max_repos = max_repos or settings.SEARCH_INDEX_MAX_REPOS
+        self._keys: List[Tuple[str, str]] = []  # (key, full_name), sorted
+        self._repos: Dict[str, Dict[str, Any]] = {}  # full_name -> search hit
+
+    def __len__(self) -> int:
+        return len(self._repos)
+
+    @staticmethod
+    def _keys_for(item: Dict[str, Any]) -> List[Tuple[str, str]]:
+        full_name = item["full_name"].lower()
+        return [(item["name"].lower(), full_name), (full_name, full_name)]
+
+    def add(self, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            full_name = item["full_name"].lower()
+            if full_name not in self._repos:
+                for key in self._keys_for(item):
+                    insort(self._keys, key)
+            self._repos[full_name] = item  # keep the latest star count
+        if len(self._repos) > self.max_repos:
+            keep = heapq.nlargest(self.max_repos, self._repos.values(), key=lambda r: r["stargazers_count"])
+            self._repos = {item["full_name"].lower(): item for item in keep}
+            self._keys = sorted(key for item in keep for key in self._keys_for(item))
+
+    def prefix(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        """The most starred repositories whose name or owner/name starts with prefix"""
+        found = {}
+        for i in range(bisect_left(self._keys, (prefix, "")), len(self._keys)):
+            key, full_name = self._keys[i]
+            if not key.startswith(prefix):
+                break
+            found[full_name] = self._repos[full_name]
+        return heapq.nlargest(limit, found.values(), key=lambda r: r["stargazers_count"])
+
+
+class SearchService:
+    """Autocomplete-friendly repository search in front of GitHub's search API.
+
+    A query is answered, cheapest first, from:
+
+    1. the results of the same normalized query (SEARCH_FETCH_SIZE hits per
+       query are kept, so any limit up to that is served from one fetch);
+    2. the results of a shorter prefix that were complete (GitHub reported
+       no more matches than we fetched), filtered to the longer query, when
+       at least `limit` of them match;
+    3. the local index of seen repositories, when it holds at least `limit`
+       repositories whose name starts with the query;
+    4. GitHub. Identical queries in flight share one call. With
+       SEARCH_DEBOUNCE_SECONDS set, upstream calls wait that long first: if
+       a longer query extending this one arrives meanwhile (the user kept
+       typing), this one is answered locally instead.
+
+    If GitHub is failing, the query's expired results are served ("stale"),
+    or failing that whatever the local index holds.
+    """
+
+    def __init__(self, index: Optional[RepoIndex] = None, flights: Optional[SingleFlight] = None):
+        self.index = index or RepoIndex()
+        self.flights = flights or SingleFlight()
+        self._results = LRUCache(settings.SEARCH_RESULTS_MAX_ENTRIES)
+        self._waiting: Counter = Counter()
+        self.counters: Dict[str, int] = {
+            "exact": 0, "prefix": 0, "index": 0, "upstream": 0, "debounced": 0, "stale": 0
+        }
+
+    def _cached(self, query: str, limit: int) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+        entry = self._results.get(query)
+        if entry is not None and entry.is_fresh():
+            return entry.value["items"][:limit], "exact"
+        if not is_plain(query):
+            return None, ""
+        for end in range(len(query) - 1, 0, -1):
+            entry = self._results.get(query[:end])
+            if entry is not None and entry.is_fresh() and entry.value["complete"]:
+                # GitHub matches terms, not prefixes: a longer query can find
+                # repos the shorter one did not, so only a full page is served
+                items = [item for item in entry.value["items"] if matches(item, query)][:limit]
+                return (items, "prefix") if len(items) >= limit else (None, "")
+        return None, ""
+
+    def _local(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        return self.index.prefix(query, limit) if is_plain(query) else []
+
+    async def search(self, github_service: "GitHubService", query: str, limit: int = 5) -> Dict[str, Any]:
+        """Return {"items": [...], "source": "exact" | "prefix" | "index" | "debounced" | "github" | "stale"}"""
+        query = normalize_query(query)
+        limit = max(1, min(limit, settings.SEARCH_FETCH_SIZE))
+        if not query:
+            return {"items": [], "source": "exact"}
+
+        items, source = self._cached(query, limit)
+        if items is not None:
+            self.counters[source] += 1
+            return {"items": items, "source": source}
+
+        local = self._local(query, limit)
+        if len(local) >= limit:
+            self.counters["index"] += 1
+            return {"items": local, "source": "index"}
+
+        if await self._superseded(query):
+            self.counters["debounced"] += 1
+            return {"items": local, "source": "debounced"}
+
+        # A burst of the same query may have been answered while we waited
+        items, source = self._cached(query, limit)
+        if items is not None:
+            self.counters[source] += 1
+            return {"items": items, "source": source}
+
+        try:
+            results = await deadline.bounded(self.flights.do(f"search:{query}", lambda: self._fetch(github_service, query)))
+        except Exception as e:
+            if not is_upstream_failure(e):
+                raise
+            return self._fallback(query, limit, local, e)
+        return {"items": results["items"][:limit], "source": "github"}
+
+    def _fallback(self, query: str, limit: int, local: List[Dict[str, Any]], error: Exception) -> Dict[str, Any]:
+        """Answer without GitHub: expired results for the query, else the local index"""
+        entry = self._results.get(query)
+        if entry is not None:
+            logger.warning(f"GitHub search unavailable, serving stale results for '{query}': {str(error)}")
+            self.counters["stale"] += 1
+            freshness.note_stale(time.time() - entry.expires_at)
+            return {"items": entry.value["items"][:limit], "source": "stale"}
+        if local:
+            logger.warning(f"GitHub search unavailable, serving the local index for '{query}': {str(error)}")
+            self.counters["index"] += 1
+            freshness.note_degraded("github_search")
+            return {"items": local, "source": "index"}
+        raise error
+
+    async def _superseded(self, query: str) -> bool:
+        """Wait out the debounce window; True if a longer query extending this one arrived"""
+        if settings.SEARCH_DEBOUNCE_SECONDS <= 0:
+            return False
+        self._waiting[query] += 1
+        try:
+            await asyncio.sleep(settings.SEARCH_DEBOUNCE_SECONDS)
+        finally:
+            self._waiting[query] -= 1
+            if not self._waiting[query]:
+                del self._waiting[query]
+        return any(other != query and other.startswith(query) for other in self._waiting)
+
+    async def _fetch(self, github_service: "GitHubService", query: str) -> Dict[str, Any]:
+        self.counters["upstream"] += 1
+        items, total_count = await github_service.search_repositories_page(query, settings.SEARCH_FETCH_SIZE)
+        results = {"items": items, "complete": total_count <= len(items)}
+        self._results.set(query, CacheEntry(results, expires_at=time.time() + settings.CACHE_TTL_SEARCH))
+        self.index.add(items)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "coalesced": self.flights.counters["shared"],
+            "indexed_repos": len(self.index),
+            "cached_queries": len(self._results),
+        }
+
+
+repo_search = SearchService()
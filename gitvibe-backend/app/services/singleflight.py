@@ -0,0 +1,63 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+import logging
+from . import deadline
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight call and the number of callers waiting on it"""
+
+    def __init__(self, task: "asyncio.Future[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one shared task.
+
+    The first caller for a key starts the work in its own task; callers that
+    arrive while it is running await the same result. Errors propagate to
+    every waiter. A waiter that is cancelled only stops waiting: the shared
+    task keeps running for the others and is cancelled only when the last
+    waiter goes away. The shared task ignores the leader's request deadline;
+    each caller bounds its own wait instead.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.counters: Dict[str, int] = {"leaders": 0, "shared": 0}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(deadline.detached(fn)))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+            self.counters["leaders"] += 1
+        else:
+            self.counters["shared"] += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller gave up: stop the work and let new callers start afresh
+                self._forget(key, call)
+                call.task.cancel()
+
+
+# Shared by every GitHubService so concurrent requests coalesce across endpoints
+github_flights = SingleFlight()
@@ -0,0 +1,77 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+import logging
+from ..core.config import settings
+from . import deadline
+
+logger = logging.getLogger(__name__)
+
+
+class StatsPending(Exception):
+    """GitHub answered 202: it is still computing statistics for the repository.
+
+    ``stale`` carries the last cached value for the URL, if there is one.
+    """
+
+    def __init__(self, url: str, stale: Any = None):
+        super().__init__(f"GitHub is still computing statistics: {url}")
+        self.url = url
+        self.stale = stale
+
+
+class StatsWarmer:
+    """Polls stats endpoints that answered 202 in the background until ready.
+
+    Each key gets at most one polling task. ``poll`` should fetch the URL,
+    store the result in the cache and return True once GitHub has the data,
+    or False while it still answers 202. Polls back off exponentially from
+    STATS_POLL_INITIAL_DELAY up to STATS_POLL_MAX_DELAY and give up after
+    STATS_POLL_MAX_ATTEMPTS.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, "asyncio.Task[None]"] = {}
+        self.counters: Dict[str, int] = {"scheduled": 0, "warmed": 0, "gave_up": 0}
+
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def is_pending(self, key: str) -> bool:
+        return key in self._tasks
+
+    def schedule(self, key: str, poll: Callable[[], Awaitable[bool]]) -> bool:
+        """Start polling for key unless it is already being polled"""
+        if key in self._tasks:
+            return False
+        task = asyncio.ensure_future(self._run(key, poll))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _, key=key: self._tasks.pop(key, None))
+        self.counters["scheduled"] += 1
+        return True
+
+    async def _run(self, key: str, poll: Callable[[], Awaitable[bool]]) -> None:
+        deadline.clear()  # Outlives the request that scheduled it
+        delay = settings.STATS_POLL_INITIAL_DELAY
+        for attempt in range(1, settings.STATS_POLL_MAX_ATTEMPTS + 1):
+            await asyncio.sleep(delay)
+            try:
+                if await poll():
+                    self.counters["warmed"] += 1
+                    logger.info(f"Stats ready after {attempt} poll(s): {key}")
+                    return
+            except Exception as e:
+                logger.warning(f"Stats poll failed for {key}: {str(e)}")
+            delay = min(delay * 2, settings.STATS_POLL_MAX_DELAY)
+
+        self.counters["gave_up"] += 1
+        logger.warning(f"Gave up waiting for GitHub stats: {key}")
+
+    async def close(self) -> None:
+        """Cancel every polling task"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+stats_warmer = StatsWarmer()
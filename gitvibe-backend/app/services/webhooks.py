@@ -0,0 +1,110 @@
+import hashlib
+import hmac
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+import logging
+from .roast_cache import RoastCache, roast_cache
+
+if TYPE_CHECKING:
+    from .github_service import GitHubService
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_PREFIX = "sha256="
+
+# Cached parts of a repository (see GitHubService.repo_cache_keys) each event makes out of date
+EVENT_PARTS: Dict[str, List[str]] = {
+    "push": ["info", "contributors", "commit_activity"],
+    "star": [],
+    "issues": ["open_issues"],
+    "pull_request": ["open_prs"],
+    "release": ["info"],
+}
+
+# Actions that change what we cache; other actions (e.g. an issue being labeled) are ignored
+EVENT_ACTIONS: Dict[str, Optional[set]] = {
+    "push": None,  # no action field: every push counts
+    "star": {"created", "deleted"},
+    "issues": {"opened", "closed", "reopened", "deleted", "transferred"},
+    "pull_request": {"opened", "closed", "reopened"},
+    "release": {"published", "released", "unpublished", "deleted"},
+}
+
+# These events carry the repository's counters as of the event: patch them
+# into the cached repo info instead of refetching it
+PATCHED_EVENTS = {"star", "issues", "pull_request"}
+REPO_COUNT_FIELDS = ("stargazers_count", "forks_count", "open_issues_count", "watchers_count")
+
+# A new state of the code deserves new roasts
+ROAST_EVENTS = {"push", "release"}
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check an X-Hub-Signature-256 header (HMAC-SHA256 of the raw body)"""
+    if not secret or not signature or not signature.startswith(SIGNATURE_PREFIX):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature[len(SIGNATURE_PREFIX):], expected)
+
+
+class WebhookProcessor:
+    """Applies GitHub webhook events to the cached data of the repository they concern.
+
+    Only that repository's entries are touched, and only those the event
+    changes: counters carried by star, issues and pull_request events are
+    patched into the cached repo info; the parts an event makes out of date
+    are invalidated (revalidated with GitHub on next use, conditionally, so
+    unchanged data costs no rate limit); pushes and releases drop the
+    repository's roast pools. Vibe scores are computed from these entries,
+    so they follow.
+    """
+
+    def __init__(self, roasts: Optional[RoastCache] = None):
+        self.roasts = roasts if roasts is not None else roast_cache
+        self.counters: Dict[str, int] = {"received": 0, "applied": 0, "ignored": 0, "rejected": 0}
+        self.events: Dict[str, int] = {}
+
+    async def handle(self, github_service: "GitHubService", event: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply one event; returns what was updated and invalidated"""
+        self.counters["received"] += 1
+        full_name = (payload.get("repository") or {}).get("full_name")
+        action = payload.get("action")
+        if event not in EVENT_PARTS or not full_name or "/" not in full_name:
+            return self._ignore(event, action, full_name)
+        allowed = EVENT_ACTIONS[event]
+        if allowed is not None and action not in allowed:
+            return self._ignore(event, action, full_name)
+
+        owner, repo = full_name.split("/", 1)
+        updated = []
+        if event in PATCHED_EVENTS:
+            repository = payload["repository"]
+            fields = {field: repository[field] for field in REPO_COUNT_FIELDS if field in repository}
+            if fields and await github_service.update_repo_info(owner, repo, fields):
+                updated.append("info")
+        invalidated = await github_service.invalidate_repo(owner, repo, EVENT_PARTS[event])
+        roasts = self.roasts.delete_repo(owner, repo) if event in ROAST_EVENTS else 0
+
+        self.counters["applied"] += 1
+        self.events[event] = self.events.get(event, 0) + 1
+        logger.info(
+            f"Webhook {event}{f'.{action}' if action else ''} for {full_name}: "
+            f"updated {updated or 'nothing'}, invalidated {invalidated or 'nothing'}, {roasts} roast pool(s) dropped"
+        )
+        return {
+            "event": event,
+            "action": action,
+            "repository": full_name,
+            "updated": updated,
+            "invalidated": invalidated,
+            "roast_pools_dropped": roasts,
+        }
+
+    def _ignore(self, event: str, action: Optional[str], full_name: Optional[str]) -> Dict[str, Any]:
+        self.counters["ignored"] += 1
+        return {"event": event, "action": action, "repository": full_name, "ignored": True}
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "events": dict(self.events)}
+
+
+webhooks = WebhookProcessor()
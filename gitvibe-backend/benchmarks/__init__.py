@@ -0,0 +1 @@
+# Initialize the benchmarks package
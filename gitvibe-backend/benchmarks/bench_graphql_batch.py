@@ -0,0 +1,74 @@
+"""Compare REST and batched GraphQL fetching for multi-repo lookups.
+
+Fetches and scores N repositories the way /analyze/compare does, once over
+REST (get_repo_info + stats per repo) and once through RepoBatchLoader, and
+reports outbound calls and wall time for each against a local mock.
+
+    python -m benchmarks.bench_graphql_batch --repos 50 --latency 50
+"""
+import argparse
+import asyncio
+import time
+
+from app.services.github_service import GitHubService
+from app.services.http_client import HTTPClient
+
+from .mock_github import MockGitHub, start_server
+
+
+async def run_rest(service: GitHubService, repos, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(owner: str, repo: str) -> None:
+        async with semaphore:
+            info = await service.get_repo_info(f"https://github.com/{owner}/{repo}")
+            await service.calculate_vibe_score_from_info(info)
+
+    await asyncio.gather(*(one(owner, repo) for owner, repo in repos))
+
+
+async def run_graphql(service: GitHubService, repos, base_url: str) -> None:
+    loader = service.batch_loader()
+    loader.url = f"{base_url}/graphql"
+
+    async def one(owner: str, repo: str) -> None:
+        data = await loader.load(owner, repo)
+        service.score_vibe(owner, repo, data["info"], data["stats"])
+
+    await asyncio.gather(*(one(owner, repo) for owner, repo in repos))
+
+
+async def main(args: argparse.Namespace) -> None:
+    mock = MockGitHub(latency=args.latency / 1000)
+    runner, base_url = await start_server(mock.app)
+    client = HTTPClient()
+    session = await client.start()
+    repos = [(f"org{i % 7}", f"repo{i}") for i in range(args.repos)]
+
+    try:
+        print(f"{args.repos} repos, mock latency {args.latency} ms")
+        print(f"{'backend':<10} {'calls':>6} {'wall ms':>9}  breakdown")
+        for label in ("rest", "graphql"):
+            mock.reset()
+            # Token so GraphQL is available; no cache so every call reaches the mock
+            service = GitHubService("bench-token", session=session)
+            service.base_url = base_url
+            start = time.perf_counter()
+            if label == "rest":
+                await run_rest(service, repos, args.concurrency)
+            else:
+                await run_graphql(service, repos, base_url)
+            wall = (time.perf_counter() - start) * 1000
+            breakdown = ", ".join(f"{route}={count}" for route, count in sorted(mock.calls.items()))
+            print(f"{label:<10} {sum(mock.calls.values()):>6} {wall:>9.1f}  {breakdown}")
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=50, help="repositories to fetch")
+    parser.add_argument("--concurrency", type=int, default=10, help="REST fan-out concurrency (as in /analyze/compare)")
+    parser.add_argument("--latency", type=float, default=50.0, help="mock server latency per request (ms)")
+    asyncio.run(main(parser.parse_args()))
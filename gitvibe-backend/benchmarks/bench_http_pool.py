@@ -0,0 +1,75 @@
+"""Compare per-call ClientSessions with the shared, pooled HTTP client.
+
+Runs GitHubService.get_repo_info against a local TLS mock of the GitHub API,
+once with a fresh session per call (the old behaviour) and once with the
+app-scoped session, and reports p50/p99 latency and TCP connections opened.
+
+    python -m benchmarks.bench_http_pool --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from app.services import http_client as http_client_module
+from app.services.github_service import GitHubService
+from app.services.http_client import HTTPClient
+
+from .mock_github import MockGitHub, self_signed_context, start_server
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(base_url: str, pooled: bool, requests: int, concurrency: int) -> List[float]:
+    client = HTTPClient()
+    session = await client.start() if pooled else None
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            service = GitHubService(session=session)
+            service.base_url = base_url
+            start = time.perf_counter()
+            await service.get_repo_info(f"https://github.com/owner{i % 25}/repo{i % 25}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    try:
+        await asyncio.gather(*(one(i) for i in range(requests)))
+    finally:
+        await client.close()
+    return latencies
+
+
+async def main(args: argparse.Namespace) -> None:
+    mock = MockGitHub(latency=args.latency / 1000)
+    server_ssl, cert_path = self_signed_context()
+    # Trust the mock's certificate in the context GitHubService verifies against
+    http_client_module.ssl_context.load_verify_locations(cert_path)
+    runner, base_url = await start_server(mock.app, ssl_context=server_ssl)
+
+    try:
+        print(f"Mock GitHub at {base_url} ({args.requests} calls, concurrency {args.concurrency})")
+        print(f"{'mode':<10} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8} {'conns':>6} {'calls':>6}")
+        for label, pooled in (("per-call", False), ("pooled", True)):
+            mock.reset()
+            latencies = await run_mode(base_url, pooled, args.requests, args.concurrency)
+            print(
+                f"{label:<10} {percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f} "
+                f"{statistics.mean(latencies):>8.2f} {mock.connections:>6} {sum(mock.calls.values()):>6}"
+            )
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="get_repo_info calls per mode")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent callers")
+    parser.add_argument("--latency", type=float, default=0.0, help="mock server latency per request (ms)")
+    asyncio.run(main(parser.parse_args()))
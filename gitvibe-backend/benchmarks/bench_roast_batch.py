@@ -0,0 +1,86 @@
+"""Compare per-repo roasts with /roast/batch.
+
+Roasts --repos repositories once with one /roast/generate call each (run
+--concurrency at a time) and once with a single /roast/batch request, against
+a mock LLM whose latency grows with the completion length. Reports wall time,
+LLM calls and prompt/completion tokens for each mode.
+
+    python -m benchmarks.bench_roast_batch --repos 50 --llm-latency 400
+"""
+import argparse
+import asyncio
+import os
+import time
+
+# Configure before the app (and its settings) are imported
+os.environ.setdefault("CACHE_REDIS_ENABLED", "False")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+import httpx
+
+from app.core.config import settings
+from app.endpoints import roast
+from app.main import app
+from app.services.llm_service import llm_client
+from app.services.roast_cache import RoastCache
+
+from .mock_github import MockLLM, start_server
+
+
+def descriptors(count: int, run: str):
+    return [
+        {"repo_name": f"{run}-repo{i}", "owner": "bench", "vibe": "chill", "score": i % 100, "stars": 50 + i}
+        for i in range(count)
+    ]
+
+
+async def run_single(client: httpx.AsyncClient, repos, concurrency: int) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+    enhanced = 0
+
+    async def one(params) -> None:
+        nonlocal enhanced
+        async with semaphore:
+            response = await client.get("/api/v1/roast/generate", params=params)
+            enhanced += response.json()["ai_enhanced"]
+
+    await asyncio.gather(*(one(params) for params in repos))
+    return enhanced
+
+
+async def run_batch(client: httpx.AsyncClient, repos, concurrency: int) -> int:
+    response = await client.post("/api/v1/roast/batch", json={"repos": repos})
+    return sum(item["ai_enhanced"] for item in response.json()["roasts"])
+
+
+async def main(args: argparse.Namespace) -> None:
+    mock = MockLLM(latency=args.llm_latency / 1000, token_latency=args.token_latency / 1000)
+    runner, settings.OPENAI_BASE_URL = await start_server(mock.app)
+    settings.LLM_TIMEOUT_SECONDS = 60
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://gitvibe", timeout=120) as client:
+            print(f"{args.repos} repos, LLM latency {args.llm_latency:.0f} ms + {args.token_latency:.1f} ms/token")
+            print(f"{'mode':<8} {'wall ms':>9} {'ms/roast':>9} {'llm calls':>10} {'prompt tok':>11} {'compl tok':>10} {'ai':>4}")
+            for label, run in (("single", run_single), ("batch", run_batch)):
+                mock.reset()
+                roast.roast_cache = RoastCache(pool_size=1)  # cold, and no background refills
+                start = time.perf_counter()
+                enhanced = await run(client, descriptors(args.repos, label), args.concurrency)
+                wall = (time.perf_counter() - start) * 1000
+                print(
+                    f"{label:<8} {wall:>9.0f} {wall / args.repos:>9.1f} {mock.calls:>10} "
+                    f"{mock.prompt_tokens:>11} {mock.completion_tokens:>10} {enhanced:>4}"
+                )
+    finally:
+        await llm_client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=50, help="repositories to roast")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent /roast/generate calls")
+    parser.add_argument("--llm-latency", type=float, default=400.0, help="mock LLM latency per call (ms)")
+    parser.add_argument("--token-latency", type=float, default=2.0, help="mock LLM latency per completion token (ms)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,125 @@
+"""Check that slow LLM roasts do not stall the rest of the API.
+
+Keeps --roasts concurrent /roast/generate callers busy against a mock LLM
+with --llm-latency, and meanwhile probes /health and /search/repositories.
+Runs three modes: no roasts (baseline), the old blocking OpenAI client
+called inside the async endpoint, and the shared async LLM client. Reports
+p50/p99 probe latency per mode; with the async client both should stay
+close to the baseline.
+
+    python -m benchmarks.bench_roast_load --roasts 20 --llm-latency 1000
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List
+
+# Configure before the app (and its settings) are imported
+os.environ.setdefault("CACHE_REDIS_ENABLED", "False")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+import httpx
+import openai
+
+from app.api.deps import get_github_service
+from app.core.config import settings
+from app.endpoints import roast
+from app.main import app
+from app.services.github_service import GitHubService
+from app.services.http_client import http_client
+from app.services.llm_service import llm_client
+
+from .bench_http_pool import percentile
+from .mock_github import MockGitHub, MockLLM, start_server, start_server_in_thread
+
+ROAST_PARAMS = {"repo_name": "react", "owner": "facebook", "vibe": "chill", "score": 80, "stars": 5}
+
+
+async def blocking_enhance(roast_text: str, repo_name: str, owner: str, vibe: str, score: float) -> str:
+    """The previous implementation: a synchronous client call inside an async def"""
+    client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+
+    async def call_api_with_timeout():
+        return client.chat.completions.create(
+            model=settings.LLM_MODEL,
+            messages=[{"role": "user", "content": f"Roast {owner}/{repo_name}: {roast_text}"}],
+            max_tokens=60,
+        )
+
+    response = await asyncio.wait_for(call_api_with_timeout(), timeout=5.0)
+    return response.choices[0].message.content.strip()
+
+
+async def probe(client: httpx.AsyncClient, count: int) -> Dict[str, List[float]]:
+    latencies: Dict[str, List[float]] = {"health": [], "search": []}
+    for i in range(count):
+        for name, path in (("health", "/health"), ("search", f"/api/v1/search/repositories?query=probe{i}&limit=5")):
+            start = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies[name].append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.02)
+    return latencies
+
+
+async def run_mode(client: httpx.AsyncClient, roasts: int, probes: int) -> Dict[str, List[float]]:
+    done = asyncio.Event()
+
+    async def roast_worker() -> None:
+        while not done.is_set():
+            await client.get("/api/v1/roast/generate", params=ROAST_PARAMS)
+
+    workers = [asyncio.ensure_future(roast_worker()) for _ in range(roasts)]
+    await asyncio.sleep(0.05)  # let the roasts reach the LLM
+    try:
+        return await probe(client, probes)
+    finally:
+        done.set()
+        await asyncio.gather(*workers)
+
+
+async def main(args: argparse.Namespace) -> None:
+    # The LLM mock runs on its own thread so a blocking client cannot starve it
+    settings.OPENAI_BASE_URL = start_server_in_thread(MockLLM(latency=args.llm_latency / 1000).app)
+    runner, github_url = await start_server(MockGitHub(latency=args.github_latency / 1000).app)
+    session = await http_client.start()
+
+    def mock_service() -> GitHubService:
+        service = GitHubService(session=session)
+        service.base_url = github_url
+        return service
+
+    app.dependency_overrides[get_github_service] = mock_service
+    transport = httpx.ASGITransport(app=app)
+    original_enhance = roast.enhance_roast_with_ai
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://gitvibe", timeout=60) as client:
+            print(f"{args.roasts} concurrent roasts, LLM latency {args.llm_latency:.0f} ms, {args.probes} probes")
+            print(f"{'mode':<10} {'health p50':>11} {'health p99':>11} {'search p50':>11} {'search p99':>11}")
+            for label, roasts, enhance in (
+                ("baseline", 0, original_enhance),
+                ("blocking", args.roasts, blocking_enhance),
+                ("async", args.roasts, original_enhance),
+            ):
+                roast.enhance_roast_with_ai = enhance
+                latencies = await run_mode(client, roasts, args.probes)
+                print(
+                    f"{label:<10} {percentile(latencies['health'], 50):>11.2f} {percentile(latencies['health'], 99):>11.2f} "
+                    f"{percentile(latencies['search'], 50):>11.2f} {percentile(latencies['search'], 99):>11.2f}"
+                )
+    finally:
+        roast.enhance_roast_with_ai = original_enhance
+        app.dependency_overrides.clear()
+        await llm_client.close()
+        await http_client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roasts", type=int, default=8, help="concurrent roast requests")
+    parser.add_argument("--probes", type=int, default=20, help="/health + /search probes per mode")
+    parser.add_argument("--llm-latency", type=float, default=500.0, help="mock LLM latency per call (ms)")
+    parser.add_argument("--github-latency", type=float, default=5.0, help="mock GitHub latency per call (ms)")
+    asyncio.run(main(parser.parse_args()))
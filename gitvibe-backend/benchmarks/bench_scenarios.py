@@ -0,0 +1,238 @@
+"""Repeatable end-to-end benchmark of the main request paths, fully offline.
+
+Starts the local GitHub and LLM mocks, then runs each scenario with fresh
+caches and rate-limit state:
+
+- single:  GitHubService.get_repo_info + calculate_vibe_score_from_info for
+           one repository, called directly (no HTTP layer);
+- compare: GET /analyze/compare with --compare-size repositories;
+- search:  bursts of as-you-type queries ("r", "re", "rea", ...) against
+           GET /search/repositories;
+- roast:   GET /roast/generate, enhanced by the mock LLM.
+
+Requests cycle over a pool of --repos repositories, so later requests show
+the effect of caching and coalescing. Reports throughput, p50/p95/p99
+latency, errors and outbound calls (GitHub calls with their 202s and 403s,
+and LLM calls) per scenario:
+
+    python -m benchmarks.bench_scenarios --requests 200 --concurrency 20
+    python -m benchmarks.bench_scenarios --scenarios compare --pending-stats 1 --rate-limit 300
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, List
+
+# Configure before the app (and its settings) are imported
+os.environ.setdefault("CACHE_REDIS_ENABLED", "False")
+os.environ.setdefault("HISTORY_ENABLED", "False")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+import httpx
+
+from app.api.deps import get_github_service, get_background_github_service
+from app.core.config import settings
+from app.endpoints import roast, search
+from app.main import app
+from app.services.cache import TieredCache
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.github_service import GitHubService
+from app.services.http_client import http_client
+from app.services.llm_service import llm_client
+from app.services.rate_limiter import Priority, RateLimitScheduler
+from app.services.revalidator import Revalidator
+from app.services.roast_cache import RoastCache
+from app.services.search_service import SearchService
+from app.services.singleflight import SingleFlight
+from app.services.stats import StatsWarmer
+
+from .bench_http_pool import percentile
+from .mock_github import MockGitHub, MockLLM, start_server
+
+TOKEN = "bench-token"
+SCENARIOS = ("single", "compare", "search", "roast")
+SEARCH_TERMS = ("react", "django", "kernel", "tensor", "rust", "vibes")
+
+
+class Fixture:
+    """Fresh GitHub-side state for one scenario, wired into the app like deps.py does"""
+
+    def __init__(self, github_url: str):
+        self.github_url = github_url
+        self.cache = TieredCache(settings.CACHE_L1_MAX_ENTRIES)
+        self.flights = SingleFlight()
+        self.warmer = StatsWarmer()
+        self.scheduler = RateLimitScheduler([TOKEN])
+        self.revalidator = Revalidator()
+        self.breakers = {"core": CircuitBreaker("github"), "search": CircuitBreaker("github_search")}
+        self.roast_cache = RoastCache(is_idle=lambda: llm_client.in_flight() == 0)
+
+    def service(self, priority: Priority = Priority.HIGH) -> GitHubService:
+        service = GitHubService(
+            TOKEN,
+            session=http_client.session,
+            cache=self.cache,
+            flights=self.flights,
+            warmer=self.warmer,
+            scheduler=self.scheduler,
+            priority=priority,
+            breakers=self.breakers,
+            revalidator=self.revalidator
+        )
+        service.base_url = self.github_url
+        return service
+
+    def install(self) -> None:
+        app.dependency_overrides[get_github_service] = lambda: self.service(Priority.HIGH)
+        app.dependency_overrides[get_background_github_service] = lambda: self.service(Priority.LOW)
+        search.repo_search = SearchService()
+        roast.roast_cache = self.roast_cache
+
+    async def close(self) -> None:
+        app.dependency_overrides.clear()
+        await self.warmer.close()
+        await self.revalidator.close()
+        await self.roast_cache.close()
+
+
+def repo_pool(size: int) -> List[str]:
+    return [f"org{i % 7}/repo{i}" for i in range(size)]
+
+
+def build_requests(
+    scenario: str, args: argparse.Namespace, fixture: Fixture, client: httpx.AsyncClient
+) -> List[Callable[[], Awaitable[None]]]:
+    """One zero-argument coroutine function per request of the scenario"""
+    repos = repo_pool(args.repos)
+
+    async def single(name: str) -> None:
+        service = fixture.service()
+        info = await service.get_repo_info(f"https://github.com/{name}")
+        await service.calculate_vibe_score_from_info(info)
+
+    async def get(path: str, params) -> None:
+        response = await client.get(path, params=params)
+        response.raise_for_status()
+
+    requests: List[Callable[[], Awaitable[None]]] = []
+    for i in range(args.requests):
+        name = repos[i % len(repos)]
+        owner, repo = name.split("/")
+        if scenario == "single":
+            requests.append(lambda name=name: single(name))
+        elif scenario == "compare":
+            picked = [f"https://github.com/{repos[(i + j) % len(repos)]}" for j in range(args.compare_size)]
+            requests.append(lambda picked=picked: get("/api/v1/analyze/compare", {"repos": picked}))
+        elif scenario == "search":
+            # Each request types one more letter of a term, like a search box would
+            term = SEARCH_TERMS[(i // 6) % len(SEARCH_TERMS)]
+            query = term[:i % 6 + 1]
+            requests.append(lambda query=query: get("/api/v1/search/repositories", {"query": query, "limit": 5}))
+        else:
+            params = {"repo_name": repo, "owner": owner, "vibe": "chill", "score": 80, "stars": i % 50}
+            requests.append(lambda params=params: get("/api/v1/roast/generate", params))
+    return requests
+
+
+async def run_scenario(
+    scenario: str, args: argparse.Namespace, github: MockGitHub, llm: MockLLM, fixture: Fixture, client: httpx.AsyncClient
+) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def timed(request: Callable[[], Awaitable[None]]) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await request()
+            except Exception:
+                errors += 1
+                return
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    requests = build_requests(scenario, args, fixture, client)
+    github.reset()
+    llm.reset()
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(request) for request in requests))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(requests),
+        "errors": errors,
+        "throughput": len(requests) / elapsed,
+        "p50": percentile(latencies, 50) if latencies else 0.0,
+        "p95": percentile(latencies, 95) if latencies else 0.0,
+        "p99": percentile(latencies, 99) if latencies else 0.0,
+        "github_calls": sum(github.calls.values()),
+        "github_202": github.statuses[202],
+        "github_403": github.statuses[403],
+        "llm_calls": llm.calls,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    rate_limits = None
+    if args.rate_limit or args.search_rate_limit:
+        rate_limits = {"core": args.rate_limit or 5000, "graphql": args.rate_limit or 5000, "search": args.search_rate_limit or 30}
+    github = MockGitHub(
+        latency=args.github_latency / 1000,
+        pending_stats=args.pending_stats,
+        rate_limits=rate_limits,
+        secondary_limit_every=args.secondary_limit_every,
+    )
+    llm = MockLLM(latency=args.llm_latency / 1000)
+    github_runner, github_url = await start_server(github.app)
+    llm_runner, llm_url = await start_server(llm.app)
+    settings.OPENAI_BASE_URL = llm_url
+    settings.GITHUB_GRAPHQL_URL = f"{github_url}/graphql"
+    settings.STATS_POLL_INITIAL_DELAY = args.stats_poll_delay / 1000
+    await http_client.start()
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://gitvibe", timeout=60) as client:
+            print(
+                f"{args.requests} requests per scenario, concurrency {args.concurrency}, {args.repos} repos, "
+                f"GitHub latency {args.github_latency:.0f} ms, LLM latency {args.llm_latency:.0f} ms"
+            )
+            print(
+                f"{'scenario':<9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} "
+                f"{'gh calls':>9} {'gh 202':>7} {'gh 403':>7} {'llm':>5}"
+            )
+            for scenario in args.scenarios:
+                fixture = Fixture(github_url)
+                fixture.install()
+                try:
+                    result = await run_scenario(scenario, args, github, llm, fixture, client)
+                finally:
+                    await fixture.close()
+                print(
+                    f"{scenario:<9} {result['throughput']:>8.1f} {result['p50']:>8.2f} {result['p95']:>8.2f} "
+                    f"{result['p99']:>8.2f} {result['errors']:>7} {result['github_calls']:>9} "
+                    f"{result['github_202']:>7} {result['github_403']:>7} {result['llm_calls']:>5}"
+                )
+    finally:
+        await llm_client.close()
+        await http_client.close()
+        await github_runner.cleanup()
+        await llm_runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent callers")
+    parser.add_argument("--repos", type=int, default=20, help="distinct repositories requests cycle over")
+    parser.add_argument("--compare-size", type=int, default=5, help="repositories per compare request")
+    parser.add_argument("--github-latency", type=float, default=20.0, help="mock GitHub latency per call (ms)")
+    parser.add_argument("--llm-latency", type=float, default=300.0, help="mock LLM latency per call (ms)")
+    parser.add_argument("--pending-stats", type=int, default=0, help="202s per repo before commit stats are ready")
+    parser.add_argument("--stats-poll-delay", type=float, default=50.0, help="first background stats poll (ms)")
+    parser.add_argument("--rate-limit", type=int, default=0, help="core/GraphQL budget per window (0: unlimited)")
+    parser.add_argument("--search-rate-limit", type=int, default=0, help="search budget per minute (0: unlimited)")
+    parser.add_argument("--secondary-limit-every", type=int, default=0, help="answer every Nth call with a secondary-limit 403")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,76 @@
+"""Compare per-repo and vectorized vibe scoring.
+
+Scores N synthetic repositories three ways: score_repo in a loop (what
+/vibe-score does per request), score_records (flat dicts in, columns built
+in one pass; what leaderboard ingest waves use) and score_columns (data already columnar), and reports the
+best wall time of a few runs for each.
+
+    python -m benchmarks.bench_vibe_scoring --sizes 1000 100000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.services.scoring import score_repo, score_records, score_columns
+
+
+def make_records(n: int, now: datetime):
+    rng = random.Random(n)
+    records = []
+    for i in range(n):
+        pushed = now - timedelta(seconds=rng.randint(0, 60 * 86400))
+        records.append({
+            "owner": f"org{i % 97}",
+            "repo": f"repo{i}",
+            "pushed_at": pushed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "stargazers_count": int(rng.paretovariate(1.2) * 5),
+            "open_issues_count": rng.randint(0, 300),
+            "total_commits": rng.randint(0, 80),
+        })
+    return records
+
+
+def best_of(runs: int, fn) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(args: argparse.Namespace) -> None:
+    now = datetime.utcnow()
+    print(f"{'repos':>8} {'method':<14} {'best ms':>9} {'repos/s':>12}")
+    for n in args.sizes:
+        records = make_records(n, now)
+        pairs = [
+            (r["owner"], r["repo"], r, {"commit_activity": {"total_commits": r["total_commits"]}})
+            for r in records
+        ]
+        columns = dict(
+            owner=[r["owner"] for r in records],
+            repo=[r["repo"] for r in records],
+            pushed_at=np.array([r["pushed_at"].rstrip("Z") for r in records], dtype="datetime64[s]"),
+            stargazers=np.array([r["stargazers_count"] for r in records]),
+            open_issues=np.array([r["open_issues_count"] for r in records]),
+            total_commits=np.array([r["total_commits"] for r in records]),
+        )
+        methods = {
+            "score_repo": lambda: [score_repo(*p, now=now) for p in pairs],
+            "score_records": lambda: score_records(records, now=now),
+            "score_columns": lambda: score_columns(**columns, now=now),
+        }
+        for label, fn in methods.items():
+            ms = best_of(args.runs, fn)
+            print(f"{n:>8} {label:<14} {ms:>9.1f} {n / ms * 1000:>12,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--runs", type=int, default=3)
+    main(parser.parse_args())
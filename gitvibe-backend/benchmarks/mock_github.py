@@ -0,0 +1,371 @@
+"""Local stand-ins for the GitHub REST API and the LLM API used by the benchmarks.
+
+Serves deterministic payloads for the endpoints GitHubService calls, with a
+configurable per-request latency, and counts requests, response statuses and
+TCP connections so benchmarks can report outbound traffic alongside latency.
+The GitHub mock can also answer stats with 202 while "computing", enforce
+rate-limit budgets (X-RateLimit-* headers, 403 once spent) and throw in
+secondary-limit 403s with Retry-After.
+"""
+import asyncio
+import datetime
+import ipaddress
+import json
+import os
+import re
+import ssl
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from aiohttp import web
+
+
+def _repo_payload(owner: str, repo: str) -> dict:
+    pushed = datetime.datetime.utcnow() - datetime.timedelta(days=len(repo) % 7)
+    return {
+        "name": repo,
+        "full_name": f"{owner}/{repo}",
+        "description": f"Mock repository {owner}/{repo}",
+        "html_url": f"https://github.com/{owner}/{repo}",
+        "language": "Python",
+        "stargazers_count": 1000 + 37 * len(owner + repo),
+        "forks_count": 100 + len(repo),
+        "open_issues_count": 10 + len(owner),
+        "subscribers_count": 50,
+        "created_at": "2015-01-01T00:00:00Z",
+        "updated_at": pushed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "pushed_at": pushed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "license": {"name": "MIT License"},
+        "owner": {"login": owner, "avatar_url": f"https://avatars.example/{owner}"},
+        "id": zlib.crc32(f"{owner}/{repo}".encode()),
+    }
+
+
+def _commit_activity() -> list:
+    now = int(time.time())
+    week = 7 * 24 * 3600
+    start = now - 52 * week
+    return [
+        {"week": start + i * week, "days": [1, 2, 3, 2, 1, 0, 0], "total": 9}
+        for i in range(52)
+    ]
+
+
+# GitHub's budgets per rate-limit resource: requests per window (seconds)
+DEFAULT_RATE_LIMITS = {"core": 5000, "search": 30, "graphql": 5000}
+RATE_LIMIT_WINDOWS = {"core": 3600, "search": 60, "graphql": 3600}
+
+
+def _resource(path: str) -> str:
+    if path.startswith("/search/"):
+        return "search"
+    return "graphql" if path == "/graphql" else "core"
+
+
+class MockGitHub:
+    """aiohttp application that imitates the GitHub REST endpoints we use.
+
+    - ``pending_stats``: commit_activity answers 202 this many times per repo
+      before returning data, as GitHub does while computing statistics.
+    - ``rate_limits``: requests allowed per resource (core, search, graphql)
+      and window; every response then carries X-RateLimit-* headers, and
+      requests past the budget get 403 with X-RateLimit-Remaining: 0. None
+      disables budgets and headers.
+    - ``secondary_limit_every``: every Nth request gets a secondary-limit 403
+      with ``Retry-After: secondary_retry_after``.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        pending_stats: int = 0,
+        rate_limits: Optional[Dict[str, int]] = None,
+        secondary_limit_every: int = 0,
+        secondary_retry_after: int = 1,
+    ):
+        self.latency = latency
+        self.pending_stats = pending_stats
+        self.rate_limits = rate_limits
+        self.secondary_limit_every = secondary_limit_every
+        self.secondary_retry_after = secondary_retry_after
+        self.calls: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.connections = 0
+        self._seen_peers = set()
+        self._stats_polls: Counter = Counter()
+        self._used: Counter = Counter()
+        self._windows: Dict[str, float] = {}
+        self.app = web.Application(middlewares=[self._track])
+        self.app.router.add_get("/repos/{owner}/{repo}", self.repo)
+        self.app.router.add_get("/repos/{owner}/{repo}/contributors", self.contributors)
+        self.app.router.add_get("/repos/{owner}/{repo}/stats/commit_activity", self.commit_activity)
+        self.app.router.add_get("/search/issues", self.search_issues)
+        self.app.router.add_get("/search/repositories", self.search_repositories)
+        self.app.router.add_post("/graphql", self.graphql)
+
+    @web.middleware
+    async def _track(self, request: web.Request, handler):
+        peer = request.transport.get_extra_info("peername") if request.transport else None
+        if peer is not None and peer not in self._seen_peers:
+            self._seen_peers.add(peer)
+            self.connections += 1
+        resource = request.match_info.route.resource
+        self.calls[resource.canonical if resource is not None else request.path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        response = await self._limited(request, handler)
+        self.statuses[response.status] += 1
+        return response
+
+    async def _limited(self, request: web.Request, handler) -> web.StreamResponse:
+        total = sum(self.calls.values())
+        if self.secondary_limit_every and total % self.secondary_limit_every == 0:
+            return web.json_response(
+                {"message": "You have exceeded a secondary rate limit."},
+                status=403,
+                headers={"Retry-After": str(self.secondary_retry_after)},
+            )
+        if self.rate_limits is None:
+            return await handler(request)
+
+        resource = _resource(request.path)
+        limit = self.rate_limits.get(resource, DEFAULT_RATE_LIMITS[resource])
+        now = time.time()
+        if now >= self._windows.get(resource, 0):
+            self._windows[resource] = now + RATE_LIMIT_WINDOWS[resource]
+            self._used[resource] = 0
+        headers = {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Reset": str(int(self._windows[resource])),
+            "X-RateLimit-Resource": resource,
+        }
+        if self._used[resource] >= limit:
+            headers.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Used": str(limit)})
+            return web.json_response({"message": "API rate limit exceeded"}, status=403, headers=headers)
+        self._used[resource] += 1
+        headers.update({
+            "X-RateLimit-Remaining": str(limit - self._used[resource]),
+            "X-RateLimit-Used": str(self._used[resource]),
+        })
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.statuses.clear()
+        self.connections = 0
+        self._seen_peers.clear()
+        self._stats_polls.clear()
+        self._used.clear()
+        self._windows.clear()
+
+    async def repo(self, request: web.Request) -> web.Response:
+        return web.json_response(_repo_payload(request.match_info["owner"], request.match_info["repo"]))
+
+    async def contributors(self, request: web.Request) -> web.Response:
+        return web.json_response([{"login": "octocat", "contributions": 42}])
+
+    async def commit_activity(self, request: web.Request) -> web.Response:
+        repo = (request.match_info["owner"], request.match_info["repo"])
+        if self._stats_polls[repo] < self.pending_stats:
+            self._stats_polls[repo] += 1
+            return web.json_response({}, status=202)
+        return web.json_response(_commit_activity())
+
+    async def search_issues(self, request: web.Request) -> web.Response:
+        return web.json_response({"total_count": len(request.query.get("q", "")), "items": []})
+
+    async def search_repositories(self, request: web.Request) -> web.Response:
+        query = request.query.get("q", "mock")
+        per_page = int(request.query.get("per_page", "5"))
+        items = [_repo_payload(f"owner{i}", f"{query}-{i}") for i in range(per_page)]
+        return web.json_response({"total_count": 1000, "items": items})
+
+
+    async def graphql(self, request: web.Request) -> web.Response:
+        """Answer the aliased batch query built by RepoBatchLoader"""
+        variables = (await request.json()).get("variables", {})
+        data = {}
+        i = 0
+        while f"o{i}" in variables:
+            repo = _repo_payload(variables[f"o{i}"], variables[f"n{i}"])
+            data[f"r{i}"] = {
+                "name": repo["name"],
+                "nameWithOwner": repo["full_name"],
+                "description": repo["description"],
+                "url": repo["html_url"],
+                "primaryLanguage": {"name": repo["language"]},
+                "stargazerCount": repo["stargazers_count"],
+                "forkCount": repo["forks_count"],
+                "issues": {"totalCount": repo["open_issues_count"] - 3},
+                "pullRequests": {"totalCount": 3},
+                "watchers": {"totalCount": repo["subscribers_count"]},
+                "createdAt": repo["created_at"],
+                "updatedAt": repo["updated_at"],
+                "pushedAt": repo["pushed_at"],
+                "licenseInfo": repo["license"],
+                "defaultBranchRef": {"target": {"history": {"totalCount": 36}}},
+            }
+            i += 1
+        return web.json_response({"data": data})
+
+
+BATCH_ITEM = re.compile(r"^(\d+)\. (\S+/\S+) ", re.MULTILINE)
+
+
+def _tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return max(1, len(text) // 4)
+
+
+class MockLLM:
+    """aiohttp application that imitates an OpenAI-compatible chat completions API.
+
+    Each call takes ``latency`` seconds plus ``token_latency`` per completion
+    token. Batch prompts (numbered "N. owner/repo" lines) are answered with a
+    JSON object holding one roast per number. Token usage is totalled so
+    benchmarks can compare cost.
+    """
+
+    def __init__(self, latency: float = 1.0, token_latency: float = 0.0):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.app = web.Application()
+        self.app.router.add_post("/chat/completions", self.chat_completions)
+
+    def reset(self) -> None:
+        self.calls = self.prompt_tokens = self.completion_tokens = 0
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self.calls += 1
+        prompt = "\n".join(message.get("content", "") for message in body.get("messages", []))
+        items = BATCH_ITEM.findall(prompt)
+        if items:
+            content = json.dumps({number: f"{repo} is a mock roast waiting to happen." for number, repo in items})
+        else:
+            content = "A mock roast, delivered fashionably late."
+        self.prompt_tokens += _tokens(prompt)
+        self.completion_tokens += _tokens(content)
+        if body.get("stream"):
+            return await self._stream(request, body, content.split(" "))
+        delay = self.latency + self.token_latency * _tokens(content)
+        if delay:
+            await asyncio.sleep(delay)
+        return web.json_response({
+            "id": f"chatcmpl-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": _tokens(prompt),
+                "completion_tokens": _tokens(content),
+                "total_tokens": _tokens(prompt) + _tokens(content),
+            },
+        })
+
+    async def _stream(self, request: web.Request, body: dict, words: list) -> web.StreamResponse:
+        """Stream the completion word by word, spreading the latency across the words"""
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for i, word in enumerate(words):
+            await asyncio.sleep(self.latency / len(words))
+            chunk = {
+                "id": f"chatcmpl-{self.calls}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else f" {word}"}, "finish_reason": None}],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+
+def self_signed_context() -> Tuple[ssl.SSLContext, str]:
+    """Create a server TLS context for 127.0.0.1 and return it with the cert path"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.utcnow()
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName([
+                x509.DNSName("localhost"),
+                x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+            ]),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+
+    directory = tempfile.mkdtemp(prefix="gitvibe-bench-")
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption(),
+        ))
+
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_path, key_path)
+    return context, cert_path
+
+
+async def start_server(app: web.Application, ssl_context: Optional[ssl.SSLContext] = None) -> Tuple[web.AppRunner, str]:
+    """Start the app on a free local port and return the runner and base URL"""
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=ssl_context)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    scheme = "https" if ssl_context else "http"
+    return runner, f"{scheme}://127.0.0.1:{port}"
+
+
+def start_server_in_thread(app: web.Application) -> str:
+    """Serve the app from its own event loop in a daemon thread and return the base URL.
+
+    Needed when the code under test may block the calling thread's event loop.
+    """
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    result = {}
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        result["runner"], result["url"] = loop.run_until_complete(start_server(app))
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return result["url"]
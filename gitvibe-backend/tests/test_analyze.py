@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.deps import get_github_service
+
+client = TestClient(app)
+
+class FakeGitHubService:
+    """Records calls instead of talking to GitHub"""
+    def __init__(self):
+        self.info_calls = []
+
+    def batch_loader(self, days=30):
+        return None
+
+    async def get_repo_info(self, repo_url):
+        self.info_calls.append(repo_url)
+        name = repo_url.rstrip("/").split("/")[-1]
+        if name == "broken":
+            raise Exception("GitHub API error: Not Found (Status: 404)")
+        return {"full_name": f"org/{name}", "stargazers_count": len(name) * 100, "open_issues_count": 1}
+
+    async def calculate_vibe_score_from_info(self, repo_info, days=30):
+        return {"score": repo_info["stargazers_count"] / 10, "stats": {"total_commits": 5}}
+
+class FakeLoader:
+    async def load(self, owner, repo):
+        info = {"full_name": f"{owner}/{repo}", "stargazers_count": len(repo) * 100, "open_issues_count": 1}
+        return {"info": info, "stats": {}}
+
+class FakeGraphQLService:
+    """Scores over a batch loader, recording each score"""
+    def __init__(self):
+        self.recorded = []
+
+    def batch_loader(self, days=30):
+        return FakeLoader()
+
+    @staticmethod
+    def parse_repo_url(repo_url):
+        return tuple(repo_url.rstrip("/").split("/")[-2:])
+
+    async def score_and_record(self, owner, repo, info, stats):
+        self.recorded.append(f"{owner}/{repo}")
+        return {"score": info["stargazers_count"] / 10, "stats": {"total_commits": 5}}
+
+def test_compare_fetches_each_repo_once_and_allows_more_than_five():
+    service = FakeGitHubService()
+    app.dependency_overrides[get_github_service] = lambda: service
+    try:
+        repos = [f"https://github.com/org/{'r' * i}" for i in range(1, 9)] + ["https://github.com/org/broken"]
+        response = client.get("/api/v1/analyze/compare", params={"repos": repos})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 8
+    assert body["repositories"][0]["full_name"] == "org/rrrrrrrr"
+    assert body["skipped"][0]["repo"] == "https://github.com/org/broken"
+    assert sorted(service.info_calls) == sorted(repos)
+
+def test_compare_over_graphql_records_every_score():
+    service = FakeGraphQLService()
+    app.dependency_overrides[get_github_service] = lambda: service
+    try:
+        response = client.get("/api/v1/analyze/compare", params={"repos": ["https://github.com/org/a", "https://github.com/org/bb"]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [repo["full_name"] for repo in response.json()["repositories"]] == ["org/bb", "org/a"]
+    assert sorted(service.recorded) == ["org/a", "org/bb"]
@@ -0,0 +1,95 @@
+import pytest
+from app.core.config import settings
+from app.services.cache import LRUCache, CacheEntry, TieredCache, cache_key, ttl_for_url
+from app.services.github_service import GitHubService, GitHubResponse
+
+class FakeRedis:
+    """Minimal async stand-in for redis.asyncio.Redis"""
+    def __init__(self, fail: bool = False):
+        self.data = {}
+        self.fail = fail
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis is down")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("redis is down")
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", CacheEntry(1, expires_at=float("inf")))
+    cache.set("b", CacheEntry(2, expires_at=float("inf")))
+    cache.get("a")
+    cache.set("c", CacheEntry(3, expires_at=float("inf")))
+    assert cache.get("b") is None
+    assert cache.get("a").value == 1
+
+def test_ttl_per_endpoint_class():
+    base = "https://api.github.com"
+    assert ttl_for_url(f"{base}/repos/a/b") == settings.CACHE_TTL_REPO
+    assert ttl_for_url(f"{base}/search/repositories?q=x") == settings.CACHE_TTL_SEARCH
+    assert ttl_for_url(f"{base}/repos/a/b/stats/commit_activity") == settings.CACHE_TTL_STATS
+    assert cache_key(f"{base}/repos/Facebook/React") == cache_key(f"{base}/repos/facebook/react")
+
+@pytest.mark.asyncio
+async def test_l2_hit_is_promoted_to_l1():
+    redis = FakeRedis()
+    await TieredCache(10, redis).set("k", {"stars": 1}, ttl=60)
+
+    cache = TieredCache(10, redis)
+    assert await cache.get("k") == {"stars": 1}
+    assert await cache.get("k") == {"stars": 1}
+    assert cache.counters["l2_hits"] == 1
+    assert cache.counters["l1_hits"] == 1
+
+@pytest.mark.asyncio
+async def test_falls_back_to_l1_when_redis_is_down():
+    cache = TieredCache(10, FakeRedis(fail=True))
+    await cache.set("k", "v", ttl=60)
+    assert await cache.get("k") == "v"
+    assert cache.counters["redis_errors"] == 1
+    assert not cache.stats()["redis_available"]
+
+@pytest.mark.asyncio
+async def test_github_service_serves_repeat_reads_from_cache(monkeypatch):
+    calls = []
+
+    async def fake_send(url, extra_headers=None):
+        calls.append(url)
+        return GitHubResponse(200, {"url": url}, {})
+
+    service = GitHubService(cache=TieredCache(10))
+    monkeypatch.setattr(service, "_send", fake_send)
+    url = f"{service.base_url}/repos/a/b"
+    assert await service._make_request(url) == await service._make_request(url)
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_revalidated_with_etag(monkeypatch):
+    sent = []
+
+    async def fake_send(url, extra_headers=None):
+        sent.append(extra_headers)
+        if extra_headers and extra_headers.get("If-None-Match") == '"v1"':
+            return GitHubResponse(304, None, {})
+        return GitHubResponse(200, {"stars": 1}, {"ETag": '"v1"'})
+
+    cache = TieredCache(10)
+    service = GitHubService(cache=cache)
+    monkeypatch.setattr(service, "_send", fake_send)
+    url = f"{service.base_url}/repos/a/b"
+
+    assert await service._make_request(url) == {"stars": 1}
+    cache.l1.get(cache_key(url)).expires_at = 0
+    assert await service._make_request(url) == {"stars": 1}
+
+    assert sent == [None, {"If-None-Match": '"v1"'}]
+    assert cache.counters["revalidated"] == 1
+    assert cache.l1.get(cache_key(url)).is_fresh()
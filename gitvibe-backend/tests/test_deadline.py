@@ -0,0 +1,87 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.deps import get_github_service
+from app.core.config import settings
+from app.services import deadline
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.deadline import DeadlineExceeded
+from app.services.github_service import GitHubService, GitHubResponse
+from app.services.llm_service import LLMClient
+from app.services.singleflight import SingleFlight
+
+URL = "https://api.github.com/repos/a/b"
+
+@pytest.mark.asyncio
+async def test_github_call_is_cancelled_at_the_deadline(monkeypatch):
+    flights = SingleFlight()
+    service = GitHubService(flights=flights)
+    cancelled = asyncio.Event()
+    budgets = []
+
+    async def slow_send(url, extra_headers=None):
+        budgets.append(deadline.remaining())
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return GitHubResponse(200, {}, {})
+
+    monkeypatch.setattr(service, "_send", slow_send)
+    deadline.start(0.05)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        await service._make_request(URL)
+    assert time.monotonic() - start < 1
+    await asyncio.wait_for(cancelled.wait(), 1)
+    # The shared flight runs without the leader's deadline; the caller bounded its own wait
+    assert budgets == [None] and flights.in_flight() == 0
+    with pytest.raises(DeadlineExceeded):
+        await service._make_request(URL)
+
+@pytest.mark.asyncio
+async def test_llm_call_stops_at_the_deadline_without_tripping_the_breaker():
+    async def hang(**kwargs):
+        await asyncio.sleep(5)
+
+    llm = LLMClient(breaker=CircuitBreaker("llm", failure_threshold=1, reset_timeout=30))
+    llm._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=hang)))
+    deadline.start(0.05)
+    with pytest.raises(DeadlineExceeded):
+        await llm.complete([], timeout=5)
+    assert llm.counters["deadlines"] == 1 and llm.counters["timeouts"] == 0
+    assert llm.breaker.state == "closed"
+
+def test_compare_returns_the_repos_that_finished_in_time(monkeypatch):
+    class FakeService:
+        def batch_loader(self, days=30):
+            return None
+
+        async def get_repo_info(self, repo_url):
+            name = repo_url.rstrip("/").split("/")[-1]
+            if name == "slow":
+                await asyncio.sleep(5)
+            return {"full_name": f"org/{name}", "stargazers_count": 100, "open_issues_count": 1}
+
+        async def calculate_vibe_score_from_info(self, repo_info, days=30):
+            return {"score": len(repo_info["full_name"]), "stats": {"total_commits": 5}}
+
+    monkeypatch.setattr(settings, "COMPARE_TIMEOUT_SECONDS", 0.2)
+    app.dependency_overrides[get_github_service] = lambda: FakeService()
+    repos = [f"https://github.com/org/{name}" for name in ("fast", "quick", "slow")]
+    try:
+        start = time.monotonic()
+        response = TestClient(app).get("/api/v1/analyze/compare", params={"repos": repos})
+        elapsed = time.monotonic() - start
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200 and elapsed < 2
+    body = response.json()
+    assert [r["full_name"] for r in body["repositories"]] == ["org/quick", "org/fast"]
+    assert body["skipped"] == [{"repo": "https://github.com/org/slow", "reason": "timeout"}]
+    assert response.headers["X-Data-Freshness"] == "degraded"
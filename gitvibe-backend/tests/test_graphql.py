@@ -0,0 +1,94 @@
+import asyncio
+import time
+from datetime import datetime
+import pytest
+from app.services.github_service import GitHubService
+from app.services.graphql_service import build_batch_query
+
+NODE = {
+    "name": "react",
+    "nameWithOwner": "facebook/react",
+    "description": "UI library",
+    "url": "https://github.com/facebook/react",
+    "primaryLanguage": {"name": "JavaScript"},
+    "stargazerCount": 200000,
+    "forkCount": 40000,
+    "issues": {"totalCount": 700},
+    "pullRequests": {"totalCount": 200},
+    "watchers": {"totalCount": 6000},
+    "createdAt": "2013-05-24T16:15:54Z",
+    "updatedAt": "2024-01-01T00:00:00Z",
+    "pushedAt": "2024-01-01T00:00:00Z",
+    "licenseInfo": {"name": "MIT License"},
+    "defaultBranchRef": {"target": {"history": {"totalCount": 120}}},
+}
+
+def test_batch_query_aliases_every_repo():
+    query = build_batch_query(3)
+    for i in range(3):
+        assert f"r{i}: repository(owner: $o{i}, name: $n{i})" in query
+    assert "fragment RepoFields on Repository" in query
+
+@pytest.mark.asyncio
+async def test_loader_batches_and_falls_back_to_rest(monkeypatch):
+    service = GitHubService("token")
+    loader = service.batch_loader()
+    posts = []
+
+    async def fake_post(query, variables):
+        posts.append(variables)
+        return {"data": {"r0": NODE, "r1": None}}
+
+    async def fake_count_contributors(owner, repo):
+        return 1
+
+    async def fake_rest(owner, repo):
+        return {"info": {"full_name": f"{owner}/{repo}"}, "stats": {}}
+
+    monkeypatch.setattr(loader, "_post", fake_post)
+    monkeypatch.setattr(service, "count_contributors", fake_count_contributors)
+    monkeypatch.setattr(loader, "_load_rest", fake_rest)
+
+    react, missing = await asyncio.gather(loader.load("facebook", "react"), loader.load("gone", "repo"))
+
+    assert len(posts) == 1
+    assert react["info"]["open_issues_count"] == 900
+    assert react["info"]["contributors_count"] == 1
+    assert react["stats"]["commit_activity"]["total_commits"] == 120
+    assert missing["info"]["full_name"] == "gone/repo"
+    assert loader.counters["rest_fallbacks"] == 1
+
+def test_graphql_needs_a_token():
+    assert GitHubService().batch_loader() is None
+
+@pytest.mark.asyncio
+async def test_graphql_and_rest_score_the_same_commits(monkeypatch):
+    # A commit every 3 hours for 60 days, as REST's Sunday-aligned weeks and as GraphQL history
+    now = int(time.time())
+    commits = list(range(now - 60 * 86400, now, 3 * 3600))
+    first_sunday = 3 * 86400  # 1970-01-04 00:00 UTC
+    weeks = {}
+    for ts in commits:
+        week = ts - (ts - first_sunday) % (7 * 86400)
+        weeks[week] = weeks.get(week, 0) + 1
+    commit_activity = [{"week": week, "days": [0] * 7, "total": total} for week, total in sorted(weeks.items())]
+
+    service = GitHubService("token")
+    loader = service.batch_loader()
+
+    async def fake_post(query, variables):
+        since = datetime.strptime(variables["since"], "%Y-%m-%dT%H:%M:%SZ")
+        count = sum(1 for ts in commits if datetime.utcfromtimestamp(ts) >= since)
+        return {"data": {"r0": {**NODE, "defaultBranchRef": {"target": {"history": {"totalCount": count}}}}}}
+
+    async def fake_count_contributors(owner, repo):
+        return 1
+
+    monkeypatch.setattr(loader, "_post", fake_post)
+    monkeypatch.setattr(service, "count_contributors", fake_count_contributors)
+
+    graphql = await loader.load("facebook", "react")
+    rest = GitHubService._build_repo_stats(commit_activity, {"total_count": 700}, {"total_count": 200}, 30)
+    info = graphql["info"]
+    assert graphql["stats"]["commit_activity"]["total_commits"] == rest["commit_activity"]["total_commits"]
+    assert service.score_vibe("facebook", "react", info, graphql["stats"]) == service.score_vibe("facebook", "react", info, rest)
@@ -0,0 +1,60 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.endpoints import github as github_endpoints
+from app.services.github_service import GitHubService
+from app.services.history import HistoryStore, DAY
+
+WEEK = 7 * DAY
+NOW = 1_717_243_200  # 2024-06-01
+
+INFO = {
+    "full_name": "octo/cat", "pushed_at": "2024-05-31T00:00:00Z",
+    "stargazers_count": 120, "forks_count": 7, "open_issues_count": 4,
+}
+
+def stats(*weeks, pending=False):
+    return {
+        "commit_activity": {"total_commits": sum(t for _, t in weeks), "weeks": [{"week": w, "total": t} for w, t in weeks]},
+        "issues": {"open": 3}, "pull_requests": {"open": 1}, "pending": pending,
+    }
+
+@pytest.mark.asyncio
+async def test_appends_only_new_weeks_and_one_snapshot_per_day(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    w1, w2, w3 = NOW - 3 * WEEK, NOW - 2 * WEEK, NOW - WEEK
+    await store.record("octo", "cat", INFO, stats((w1, 5), (w2, 2)), {"score": 40.0}, now=NOW - DAY)
+    # w1 is settled and skipped; w2 was in progress and is updated; w3 is new
+    await store.record("Octo", "Cat", INFO, stats((w1, 999), (w2, 4), (w3, 1)), {"score": 41.5}, now=NOW)
+    await store.record("octo", "cat", {**INFO, "stargazers_count": 121}, stats(pending=True), {"score": 42.0}, now=NOW)
+
+    history = await store.history("octo", "cat", days=30, now=NOW)
+    assert [w["total"] for w in history["weekly_commits"]] == [5, 4, 1]
+    assert [(s["date"], s["stars"], s["score"]) for s in history["snapshots"]] == [
+        ("2024-05-31", 120, 40.0), ("2024-06-01", 121, 42.0)
+    ]
+    assert (store.counters["weeks_appended"], store.counters["weeks_skipped"]) == (4, 1)
+    assert (await store.history("octo", "cat", days=1, now=NOW))["weekly_commits"] == []
+    await store.close()
+
+@pytest.mark.asyncio
+async def test_scoring_records_history(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    service = GitHubService(history=store)
+
+    async def fake_stats(owner, repo, days):
+        # The stats cover the analysis window; the full year of weeks goes to the history
+        return stats((NOW - WEEK, 3)), [{"week": NOW - 20 * WEEK, "total": 8}, {"week": NOW - WEEK, "total": 3}]
+
+    service._get_repo_stats = fake_stats
+    score = await service.calculate_vibe_score_from_info(INFO)
+    history = await store.history("octo", "cat", days=365, now=NOW)
+    assert history["snapshots"][0]["score"] == score["score"]
+    assert history["weekly_commits"] == [{"week": NOW - 20 * WEEK, "total": 8}, {"week": NOW - WEEK, "total": 3}]
+    await store.close()
+
+def test_history_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(github_endpoints, "history_store", HistoryStore(str(tmp_path / "history.db")))
+    response = TestClient(app).get("/api/v1/github/history", params={"owner": "nobody", "repo": "nothing"})
+    assert response.status_code == 200
+    assert response.json()["data"] == {"repo": "nobody/nothing", "snapshots": [], "weekly_commits": []}
@@ -0,0 +1,17 @@
+import pytest
+from app.services.http_client import HTTPClient
+from app.services.github_service import GitHubService
+
+@pytest.mark.asyncio
+async def test_http_client_reuses_one_session():
+    """The shared client hands out the same session until it is closed"""
+    client = HTTPClient()
+    assert client.session is None
+
+    session = await client.start()
+    assert await client.start() is session
+    assert GitHubService(session=client.session).session is session
+
+    await client.close()
+    assert client.session is None
+    assert session.closed
@@ -0,0 +1,171 @@
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.endpoints import leaderboard as leaderboard_endpoint
+from app.services.github_service import GitHubResponse, GitHubService
+from app.services.history import HistoryStore
+from app.services.rate_limiter import RequestShed
+from app.services.leaderboard import Leaderboard, LeaderboardStore, RankedIndex, org_board_id, repos_board_id
+
+API = "https://api.github.com"
+
+def info(name, stars=0):
+    return {
+        "full_name": name, "html_url": f"https://github.com/{name}", "description": None,
+        "language": "Python", "stargazers_count": stars,
+    }
+
+def score(value):
+    return {"score": value, "vibe": "😴 Mid"}
+
+def test_ranked_index_updates_one_repo_at_a_time():
+    index = RankedIndex()
+    for name, value in (("a/one", 50), ("b/two", 70), ("c/three", 60), ("d/four", 60)):
+        index.update(name, value, {"full_name": name})
+    assert [row["full_name"] for row in index.page(0, 10)] == ["b/two", "c/three", "d/four", "a/one"]
+
+    index.update("A/One", 90, {"full_name": "a/one"})  # rescored: moves, not duplicated
+    assert len(index) == 4 and index.rank("a/one") == 1 and index.rank("b/two") == 2
+    assert index.page(2, 2) == [{"rank": 3, "full_name": "c/three"}, {"rank": 4, "full_name": "d/four"}]
+
+    index.remove("b/two")
+    assert index.rank("c/three") == 2 and "b/two" not in index
+
+class FakeService:
+    """An organization of 5 repositories listed 2 per page; other/broken fails to score"""
+    base_url = API
+
+    def __init__(self):
+        self.pages = []
+        self.running = 0
+        self.max_running = 0
+
+    async def request(self, url):
+        page = int(dict(part.split("=") for part in url.split("?")[1].split("&")).get("page", 1))
+        self.pages.append(page)
+        names = [f"org/repo{i}" for i in range(5)] + ["org/broken"]
+        items = [{"full_name": name} for name in names[(page - 1) * 2:page * 2]]
+        link = f'<{API}/orgs/org/repos?per_page=100&page={page + 1}>; rel="next"' if page < 3 else None
+        return GitHubResponse(200, items, {"Link": link} if link else {})
+
+    def batch_loader(self):
+        return None  # no token: score over REST
+
+    async def get_repo_data(self, owner, repo):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if repo == "broken":
+            raise ValueError("Not Found")
+        return {"info": info(f"{owner}/{repo}", stars=int(repo[-1])), "stats": {}}
+
+    async def score_and_record_many(self, repos):
+        return [score(10 * data["info"]["stargazers_count"]) for data in repos]
+
+@pytest.mark.asyncio
+async def test_org_is_listed_page_by_page_and_scored_in_bounded_waves(monkeypatch):
+    monkeypatch.setattr(settings, "LEADERBOARD_MAX_CONCURRENCY", 2)
+    store = LeaderboardStore()
+    service = FakeService()
+    board = store.ensure(Leaderboard(org_board_id("Org"), org="Org"), lambda: service)
+    assert board.state == "ingesting"
+    await board.task
+
+    assert service.pages == [1, 2, 3] and service.max_running == 2
+    assert (board.state, len(board.members), len(board.index), list(board.failed)) == ("incomplete", 6, 5, ["org/broken"])
+    page = board.page(1, 3)
+    assert [(row["rank"], row["full_name"]) for row in page["entries"]] == [(1, "org/repo4"), (2, "org/repo3"), (3, "org/repo2")]
+
+    # Rescored elsewhere (e.g. a vibe-score request): it moves without re-ingesting the board
+    store.record_score(info("Org/Repo0"), score(95))
+    store.record_score(info("someone/else"), score(100))  # not on the board
+    assert board.index.rank("org/repo0") == 1 and len(board.index) == 5
+    assert store.ensure(Leaderboard(org_board_id("org"), org="org"), lambda: service) is board
+    assert board.task.done() and store.counters["ingests"] == 1
+
+class FakeLoader:
+    """GraphQL batch loads, as when a token is configured"""
+    async def load(self, owner, repo):
+        repo_info = {
+            **info(f"{owner}/{repo}", stars=100 * len(repo)), "forks_count": 0, "open_issues_count": 0,
+            # GraphQL pushedAt is null for a repository that was never pushed to
+            "pushed_at": None if repo == "empty" else "2024-01-01T00:00:00Z",
+        }
+        stats = {"commit_activity": {"total_commits": 10, "weeks": []}, "issues": {"open": 0}, "pull_requests": {"open": 0}}
+        return {"info": repo_info, "stats": stats}
+
+@pytest.mark.asyncio
+async def test_graphql_scores_reach_history_and_other_boards(tmp_path, monkeypatch):
+    store = LeaderboardStore()
+    history = HistoryStore(str(tmp_path / "history.db"))
+    service = GitHubService(history=history, leaderboards=store)
+    monkeypatch.setattr(service, "batch_loader", lambda: FakeLoader())
+    other = Leaderboard(repos_board_id(["a/one", "c/three"]), repos=[("a", "one"), ("c", "three")])
+    other.state, other.ingested_at = "ready", time.time()
+    store.ensure(other, lambda: None)
+
+    board = store.ensure(Leaderboard(repos_board_id(["a/one", "b/two"]), repos=[("a", "one"), ("b", "two")]), lambda: service)
+    await board.task
+    assert len(board.index) == 2 and "a/one" in other.index
+    assert len((await history.history("a", "one"))["snapshots"]) == 1
+    await history.close()
+
+def test_boards_are_read_page_by_page(monkeypatch):
+    store = LeaderboardStore()
+    board = Leaderboard(repos_board_id(["a/one", "b/two", "c/three"]), repos=[("a", "one"), ("b", "two"), ("c", "three")])
+    for name, value in (("a/one", 40), ("b/two", 80), ("c/three", 60)):
+        board.update(info(name), score(value))
+    board.state, board.ingested_at = "ready", time.time()
+    store.ensure(board, lambda: None)
+    monkeypatch.setattr(leaderboard_endpoint, "leaderboards", store)
+
+    client = TestClient(app)
+    second = client.get(f"/api/v1/leaderboard/{board.id}", params={"page": 2, "per_page": 2}).json()["data"]
+    assert [(row["rank"], row["full_name"]) for row in second["entries"]] == [(3, "a/one")]
+    assert second["scored"] == 3 and second["state"] == "ready"
+
+    # The same set of repositories, however written, is the same board
+    posted = client.post("/api/v1/leaderboard/repos", json={"repos": ["https://github.com/C/three", "b/two", "a/one"]})
+    assert posted.json()["data"]["id"] == board.id and posted.json()["data"]["entries"][0]["full_name"] == "b/two"
+
+    assert client.get("/api/v1/leaderboard/repos-unknown").status_code == 404
+    assert client.post("/api/v1/leaderboard/repos", json={"repos": ["not-a-repo"]}).status_code == 400
+    assert client.post("/api/v1/leaderboard/repos", json={"repos": []}).status_code == 400
+
+@pytest.mark.asyncio
+async def test_a_repo_that_cannot_be_scored_fails_alone(monkeypatch):
+    store = LeaderboardStore()
+    service = GitHubService(leaderboards=store)
+    monkeypatch.setattr(service, "batch_loader", lambda: FakeLoader())
+    repos = [("a", "one"), ("b", "empty"), ("c", "three")]
+    board = store.ensure(Leaderboard(repos_board_id([f"{o}/{r}" for o, r in repos]), repos=repos), lambda: service)
+    await board.task
+    assert (board.state, len(board.index), list(board.failed)) == ("incomplete", 2, ["b/empty"])
+
+class SheddingService(FakeService):
+    """Sheds the first ingest's low-priority requests"""
+    def __init__(self):
+        super().__init__()
+        self.shed = True
+
+    async def get_repo_data(self, owner, repo):
+        if self.shed:
+            raise RequestShed("low budget")
+        return await super().get_repo_data(owner, repo)
+
+@pytest.mark.asyncio
+async def test_a_shed_board_resumes_on_the_next_read():
+    store = LeaderboardStore()
+    service = SheddingService()
+    board = store.ensure(Leaderboard(repos_board_id(["org/repo1"]), repos=[("org", "repo1")]), lambda: service)
+    await board.task
+    assert (board.state, board.error, len(board.index)) == ("incomplete", "low budget", 0)
+
+    service.shed = False
+    assert store.ensure(Leaderboard(board.id, repos=[("org", "repo1")]), lambda: service).state == "ingesting"
+    await board.task
+    assert (board.state, len(board.index)) == ("ready", 1)
@@ -0,0 +1,60 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from app.services.llm_service import LLMClient, LLMTimeout
+
+class FakeCompletions:
+    """Stand-in for AsyncOpenAI().chat.completions with a fixed latency"""
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.active = 0
+        self.peak = 0
+        self.cancelled = 0
+
+    async def create(self, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        message = SimpleNamespace(content=f"  roasted by {kwargs['model']}  ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+def fake_client(latency: float, max_concurrency: int = 8):
+    llm = LLMClient(max_concurrency=max_concurrency)
+    completions = FakeCompletions(latency)
+    llm._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return llm, completions
+
+@pytest.mark.asyncio
+async def test_complete_limits_concurrency():
+    llm, completions = fake_client(latency=0.02, max_concurrency=2)
+    results = await asyncio.gather(*(llm.complete([], timeout=1) for _ in range(6)))
+    assert all(result.startswith("roasted by") for result in results)
+    assert completions.peak == 2
+    assert llm.counters["calls"] == 6
+
+@pytest.mark.asyncio
+async def test_timeout_cancels_the_call():
+    llm, completions = fake_client(latency=5)
+    start = time.perf_counter()
+    with pytest.raises(LLMTimeout):
+        await llm.complete([], timeout=0.05)
+    assert time.perf_counter() - start < 1
+    assert completions.cancelled == 1
+    assert llm.counters["timeouts"] == 1
+    assert llm.in_flight() == 0
+
+@pytest.mark.asyncio
+async def test_slow_calls_do_not_block_the_event_loop():
+    llm, _ = fake_client(latency=0.3)
+    calls = asyncio.gather(*(llm.complete([], timeout=1) for _ in range(4)))
+    start = time.perf_counter()
+    await asyncio.sleep(0.01)
+    assert time.perf_counter() - start < 0.1
+    await calls
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.cache import TieredCache
+from app.services.github_service import GitHubService, GitHubResponse
+from app.services.llm_service import LLMClient
+from app.services.metrics import Counter, Histogram, Registry, github_cache_lookups, upstream_requests
+
+URL = "https://api.github.com/repos/a/b"
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    requests = registry.register(Counter("requests_total", "Requests", ("path",)))
+    latency = registry.register(Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0)))
+    requests.labels('/a"b').inc()
+    for value in (0.05, 0.5, 5):
+        latency.labels().observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{path="/a\\"b"} 1' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "latency_seconds_count 3" in lines and "latency_seconds_sum 5.55" in lines
+    with pytest.raises(ValueError):
+        requests.labels()
+
+def test_metrics_endpoint_counts_requests_by_route_template():
+    client = TestClient(app)
+    client.get("/health")
+    client.get("/no-such-page")
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'gitvibe_http_requests_total{method="GET",route="/health",status="200"}' in body
+    assert 'gitvibe_http_requests_total{method="GET",route="unmatched",status="404"}' in body
+    assert 'gitvibe_http_request_duration_seconds_count{method="GET",route="/health"}' in body
+
+@pytest.mark.asyncio
+async def test_github_cache_lookups_are_counted(monkeypatch):
+    service = GitHubService(cache=TieredCache(10))
+
+    async def fake_send(url, extra_headers=None):
+        return GitHubResponse(200, {"stars": 1}, {})
+
+    monkeypatch.setattr(service, "_send", fake_send)
+    hits = github_cache_lookups.labels("github", "hit")
+    misses = github_cache_lookups.labels("github", "miss")
+    before = hits.value, misses.value
+    for _ in range(3):
+        await service._make_request(URL)
+    assert (hits.value - before[0], misses.value - before[1]) == (2, 1)
+
+@pytest.mark.asyncio
+async def test_llm_calls_are_counted_by_outcome():
+    async def create(**kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="roasted"))])
+
+    llm = LLMClient()
+    llm._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    ok = upstream_requests.labels("llm", "ok")
+    before = ok.value
+    assert await llm.complete([], timeout=1) == "roasted"
+    assert ok.value == before + 1
@@ -0,0 +1,65 @@
+import pytest
+from multidict import CIMultiDict
+from app.services.cache import TieredCache
+from app.services.github_service import GitHubService, GitHubResponse
+from app.services.pagination import parse_link_header, page_number, with_params, count_items, iter_items
+
+BASE = "https://api.github.com/repos/facebook/react/contributors"
+
+def link(**rels):
+    return ", ".join(f'<{url}>; rel="{rel}"' for rel, url in rels.items())
+
+def test_parse_link_header():
+    links = parse_link_header(link(next=f"{BASE}?per_page=1&page=2", last=f"{BASE}?per_page=1&page=1650"))
+    assert page_number(links["next"]) == 2
+    assert page_number(links["last"]) == 1650
+    assert parse_link_header(None) == {}
+
+def test_with_params_replaces_existing():
+    assert with_params(f"{BASE}?per_page=1&anon=1", per_page=100) == f"{BASE}?anon=1&per_page=100"
+
+@pytest.mark.asyncio
+async def test_count_items_reads_last_page_and_caches_link():
+    service = GitHubService(cache=TieredCache(max_entries=10))
+    calls = []
+
+    async def fake_send(url, extra_headers=None):
+        calls.append(url)
+        headers = CIMultiDict({"Link": link(next=f"{BASE}?per_page=1&page=2", last=f"{BASE}?per_page=1&page=1650")})
+        return GitHubResponse(200, [{"login": "gaearon"}], headers)
+
+    service._send = fake_send
+    assert await service.count_contributors("facebook", "react") == 1650
+    # Second count is served from the cache, Link header included
+    assert await service.count_contributors("facebook", "react") == 1650
+    assert calls == [f"{BASE}?per_page=1"]
+
+@pytest.mark.asyncio
+async def test_count_items_without_link_or_body():
+    service = GitHubService()
+    responses = iter([
+        GitHubResponse(200, [{"login": "solo"}], CIMultiDict()),
+        GitHubResponse(204, None, CIMultiDict()),
+    ])
+
+    async def fake_send(url, extra_headers=None):
+        return next(responses)
+
+    service._send = fake_send
+    assert await count_items(service, BASE) == 1
+    assert await count_items(service, BASE) == 0  # empty repository
+
+@pytest.mark.asyncio
+async def test_iter_items_follows_next_links():
+    service = GitHubService()
+    pages = {
+        f"{BASE}?per_page=2": ([1, 2], link(next=f"{BASE}?per_page=2&page=2")),
+        f"{BASE}?per_page=2&page=2": ([3], ""),
+    }
+
+    async def fake_send(url, extra_headers=None):
+        data, links = pages[url]
+        return GitHubResponse(200, data, CIMultiDict({"Link": links}))
+
+    service._send = fake_send
+    assert [item async for item in iter_items(service, BASE, per_page=2)] == [1, 2, 3]
@@ -0,0 +1,46 @@
+import asyncio
+import time
+import pytest
+from app.services.pipeline import run_stages
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently():
+    async def fetch(value):
+        await asyncio.sleep(0.05)
+        return value
+
+    start = time.perf_counter()
+    results, timings = await run_stages({
+        "a": (lambda: fetch(1), ()),
+        "b": (lambda: fetch(2), ()),
+        "c": (lambda: fetch(3), ()),
+        "total": (lambda a, b, c: a + b + c, ("a", "b", "c")),
+    })
+    elapsed = time.perf_counter() - start
+
+    assert results["total"] == 6
+    assert elapsed < 0.12
+    assert set(timings) == {"a", "b", "c", "total"}
+
+@pytest.mark.asyncio
+async def test_failing_stage_cancels_the_rest():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await run_stages({"slow": (slow, ()), "fail": (fail, ())})
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+@pytest.mark.asyncio
+async def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        await run_stages({"a": (lambda missing: missing, ("missing",))})
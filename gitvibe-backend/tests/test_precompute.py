@@ -0,0 +1,160 @@
+import asyncio
+import time
+import pytest
+from app.core.config import settings
+from app.services.cache import TieredCache
+from app.services.github_service import GitHubService, GitHubResponse
+from app.services.precompute import Precomputer
+from app.services.rate_limiter import RequestShed
+from app.services.roast_cache import RoastCache
+
+REPO = {
+    "name": "repo", "full_name": "owner/repo", "description": None, "html_url": "https://github.com/owner/repo",
+    "language": "Python", "stargazers_count": 120, "forks_count": 4, "open_issues_count": 3,
+    "subscribers_count": 2, "created_at": "2020-01-01T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z",
+    "pushed_at": "2024-01-01T00:00:00Z", "license": None,
+}
+
+class FakeScheduler:
+    def __init__(self, ratio=1.0, capacity=None):
+        self.ratio = ratio
+        self.limits = capacity or {"core": 5000, "search": 30, "graphql": 5000}
+
+    def budget_ratio(self, bucket):
+        return self.ratio
+
+    def capacity(self, bucket):
+        return self.limits[bucket]
+
+@pytest.fixture(autouse=True)
+def enable_precompute(monkeypatch):
+    monkeypatch.setattr(settings, "PRECOMPUTE_ENABLED", True)
+    monkeypatch.setattr(settings, "PRECOMPUTE_TRACKED_REPOS", "")
+    monkeypatch.setattr(settings, "PRECOMPUTE_TOP_N", 10)
+    monkeypatch.setattr(settings, "PRECOMPUTE_INTERVAL", 10)
+    monkeypatch.setattr(settings, "PRECOMPUTE_BUDGET_FRACTION", 0.25)
+
+def github(calls):
+    """A GitHubService with its own cache whose sends answer every repository part"""
+    service = GitHubService(cache=TieredCache(100))
+
+    async def fake_send(url, extra_headers=None):
+        calls.append(url)
+        if "/search/issues" in url:
+            return GitHubResponse(200, {"total_count": 5}, {})
+        if url.endswith("/stats/commit_activity"):
+            return GitHubResponse(200, [{"week": int(time.time()), "days": [1] * 7, "total": 7}], {})
+        if "/contributors" in url:
+            return GitHubResponse(200, [{"login": "a"}], {})
+        return GitHubResponse(200, REPO, {})
+
+    service._send = fake_send
+    return service
+
+def test_watchlist_is_tracked_repos_then_most_requested(monkeypatch):
+    monkeypatch.setattr(settings, "PRECOMPUTE_TRACKED_REPOS", "pinned/one, Busy/Repo")
+    monkeypatch.setattr(settings, "PRECOMPUTE_TOP_N", 3)  # a tracked repo can also be among them
+    monkeypatch.setattr(settings, "PRECOMPUTE_HALF_LIFE", 3600)
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    precomputer = Precomputer(scheduler=FakeScheduler())
+    for _ in range(4):
+        precomputer.record_request("old", "news")
+    clock[0] += 7200  # two half-lives: 4 requests now weigh 1
+    for name, count in (("busy/repo", 5), ("hot/new", 3), ("warm/one", 2)):
+        for _ in range(count):
+            precomputer.record_request(*name.split("/"))
+    assert precomputer.watchlist() == [("pinned", "one"), ("Busy", "Repo"), ("hot", "new"), ("warm", "one")]
+
+@pytest.mark.asyncio
+async def test_passes_refresh_due_parts_within_the_budget(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    # 30 search calls a minute (core is plentiful), a quarter of them for 10s passes: 1.25 credits,
+    # raised to the 5-call minimum, so 2 repositories (2 search calls each) fit
+    scheduler = FakeScheduler(capacity={"core": 100000, "search": 30, "graphql": 5000})
+    precomputer = Precomputer(scheduler=scheduler, roasts=RoastCache())
+    for name in ("a/one", "b/two", "c/three"):
+        precomputer.record_request(*name.split("/"))
+    calls = []
+    service = github(calls)
+
+    summary = await precomputer.run_once(lambda: service)
+    assert (summary["refreshed"], summary["deferred"]) == (2, 1)
+    assert len(calls) == 10  # every part of the two refreshed repositories, once
+
+    calls.clear()
+    summary = await precomputer.run_once(lambda: service)
+    assert (summary["fresh"], summary["deferred"], len(calls)) == (2, 1, 0)
+
+    clock[0] += 30  # earns 3.75 search credits
+    summary = await precomputer.run_once(lambda: service)
+    assert (summary["refreshed"], len(calls)) == (1, 5)
+    assert all("c/three" in url for url in calls)
+    assert precomputer.stats()["sustainable_repos"] == 93  # bound by search: 2 calls per repo per 25 minutes
+
+    # Parts are refreshed shortly before they expire, so users never see them expired
+    clock[0] += settings.CACHE_TTL_STATS - settings.PRECOMPUTE_REFRESH_AHEAD
+    calls.clear()
+    await precomputer.run_once(lambda: service)
+    assert calls and all("/stats/" in url or "/search/issues" in url for url in calls)
+
+class FakeService:
+    def __init__(self, error=None):
+        self.error = error
+        self.refreshed = []
+
+    def repo_urls(self, owner, repo):
+        return {"info": f"https://api.github.com/repos/{owner}/{repo}"}
+
+    async def due_parts(self, owner, repo, within):
+        return self.repo_urls(owner, repo)
+
+    async def refresh_parts(self, urls):
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        self.refreshed.extend(urls.values())
+        return []
+
+    async def calculate_vibe_score(self, owner, repo, days=30):
+        return {"score": 50}
+
+@pytest.mark.asyncio
+async def test_roast_pools_of_watched_repos_are_renewed(monkeypatch):
+    monkeypatch.setattr(settings, "PRECOMPUTE_REFRESH_AHEAD", 60)
+    roasts = RoastCache(ttl=30, pool_size=1)
+    precomputer = Precomputer(scheduler=FakeScheduler(), roasts=roasts)
+    generated = []
+
+    async def generate():
+        generated.append(1)
+        return f"roast {len(generated)}"
+
+    precomputer.record_roast("a", "one", "roast:a/one:quick", generate)  # not requested yet: ignored
+    precomputer.record_request("a", "one")
+    precomputer.record_roast("a", "one", "roast:a/one:quick", generate)
+    await precomputer.run_once(lambda: FakeService())
+    assert roasts.get("roast:a/one:quick") == "roast 1"
+
+    # The pool expires within PRECOMPUTE_REFRESH_AHEAD: a new one replaces it
+    await precomputer.run_once(lambda: FakeService())
+    assert roasts.get("roast:a/one:quick") == "roast 2"
+    assert precomputer.counters["roasts_renewed"] == 2
+    await roasts.close()
+
+@pytest.mark.asyncio
+async def test_low_budget_and_shedding_stop_the_pass(monkeypatch):
+    monkeypatch.setattr(settings, "PRECOMPUTE_MAX_CONCURRENCY", 1)
+    precomputer = Precomputer(scheduler=FakeScheduler(ratio=0.1))
+    precomputer.record_request("a", "one")
+    precomputer.record_request("b", "two")
+    assert (await precomputer.run_once(lambda: FakeService()))["watched"] == 0
+    assert precomputer.counters["skipped_budget"] == 1
+
+    precomputer.scheduler.ratio = 1.0
+    services = [FakeService(error=RequestShed("low budget")), FakeService()]
+    pending = iter(services)
+    summary = await precomputer.run_once(lambda: next(pending))
+    assert summary["refreshed"] == 0 and precomputer.counters["shed"] == 1
+    assert services[1].refreshed == []  # not attempted once the first was shed
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from app.core.config import settings
+from app.services.github_service import GitHubService, GitHubResponse
+from app.services.prefetch import Prefetcher
+from app.services.rate_limiter import Priority, RequestShed
+from app.services.singleflight import SingleFlight
+
+class FakeScheduler:
+    def __init__(self, ratio=1.0):
+        self.ratio = ratio
+
+    def budget_ratio(self, bucket):
+        return self.ratio
+
+class FakeService:
+    """Records which repos were warmed"""
+    def __init__(self, warmed, error=None, delay=0.0):
+        self.warmed = warmed
+        self.error = error
+        self.delay = delay
+
+    async def calculate_vibe_score(self, owner, repo, days=30):
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        self.warmed.append(f"{owner}/{repo}")
+        return {"score": 50}
+
+def hits(*names):
+    return [{"full_name": name} for name in names]
+
+@pytest.fixture(autouse=True)
+def enable_prefetch(monkeypatch):
+    monkeypatch.setattr(settings, "PREFETCH_ENABLED", True)
+    monkeypatch.setattr(settings, "PREFETCH_TOP_K", 2)
+
+@pytest.mark.asyncio
+async def test_warms_top_hits_and_counts_visits():
+    prefetcher = Prefetcher(scheduler=FakeScheduler())
+    warmed = []
+    assert prefetcher.schedule(hits("a/one", "b/two", "c/three"), lambda: FakeService(warmed)) == 2
+    assert prefetcher.schedule(hits("a/one"), lambda: FakeService(warmed)) == 0  # already in flight
+    await asyncio.sleep(0.01)
+    assert sorted(warmed) == ["a/one", "b/two"]
+
+    prefetcher.record_visit("A", "One")
+    prefetcher.record_visit("a", "one")  # one hit per prefetch
+    prefetcher.record_visit("c", "three")
+    stats = prefetcher.stats()
+    assert (stats["completed"], stats["hits"], stats["hit_rate"]) == (2, 1, 0.5)
+
+@pytest.mark.asyncio
+async def test_low_budget_skips_prefetch():
+    prefetcher = Prefetcher(scheduler=FakeScheduler(ratio=0.1))
+    assert prefetcher.schedule(hits("a/one", "b/two"), lambda: FakeService([])) == 0
+    assert prefetcher.counters["skipped_budget"] == 2
+
+@pytest.mark.asyncio
+async def test_shedding_cancels_the_remaining_prefetches():
+    prefetcher = Prefetcher(scheduler=FakeScheduler())
+    services = iter([FakeService([], error=RequestShed("low budget")), FakeService([], delay=1)])
+    prefetcher.schedule(hits("a/one", "b/two"), lambda: next(services))
+    await asyncio.sleep(0.05)
+    assert prefetcher.stats()["in_flight"] == 0
+    assert prefetcher.counters["cancelled"] == 2
+
+@pytest.mark.asyncio
+async def test_high_priority_caller_survives_a_shed_shared_call():
+    flights = SingleFlight()
+    low = GitHubService(flights=flights, priority=Priority.LOW)
+    high = GitHubService(flights=flights)
+
+    async def shed_load(url):
+        await asyncio.sleep(0.01)
+        raise RequestShed("low budget")
+
+    async def load(url):
+        return GitHubResponse(200, {"ok": True}, {})
+
+    low._load = shed_load
+    high._load = load
+    url = "https://api.github.com/repos/a/b"
+    low_call = asyncio.ensure_future(low.request(url))
+    await asyncio.sleep(0)
+    assert (await high.request(url)).data == {"ok": True}
+    with pytest.raises(RequestShed):
+        await low_call
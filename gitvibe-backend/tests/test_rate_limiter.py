@@ -0,0 +1,57 @@
+import time
+import pytest
+from app.core.config import settings
+from app.services.rate_limiter import RateLimitScheduler, RateLimitExceeded, Priority, bucket_for_url
+
+def headers(remaining, limit=5000, reset_in=3600, **extra):
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+        **extra,
+    }
+
+def test_buckets():
+    assert bucket_for_url("https://api.github.com/search/issues?q=x") == "search"
+    assert bucket_for_url("https://api.github.com/graphql") == "graphql"
+    assert bucket_for_url("https://api.github.com/repos/a/b") == "core"
+
+@pytest.mark.asyncio
+async def test_picks_token_with_most_budget():
+    scheduler = RateLimitScheduler(["tok-a", "tok-b"])
+    scheduler.record("tok-a", "core", 200, headers(remaining=10))
+    scheduler.record("tok-b", "core", 200, headers(remaining=4000))
+    assert await scheduler.acquire("core") == "tok-b"
+
+    scheduler.record("tok-a", "search", 200, headers(remaining=29, limit=30))
+    scheduler.record("tok-b", "search", 200, headers(remaining=2, limit=30))
+    assert await scheduler.acquire("search") == "tok-a"
+
+@pytest.mark.asyncio
+async def test_low_priority_is_shed_below_reserve():
+    scheduler = RateLimitScheduler(["tok"])
+    scheduler.record("tok", "core", 200, headers(remaining=100))
+    with pytest.raises(RateLimitExceeded):
+        await scheduler.acquire("core", Priority.LOW)
+    assert await scheduler.acquire("core", Priority.HIGH) == "tok"
+    assert scheduler.counters["shed"] == 1
+
+@pytest.mark.asyncio
+async def test_secondary_limit_blocks_token_until_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_MAX_WAIT", 0)
+    scheduler = RateLimitScheduler(["tok-a", "tok-b"])
+    scheduler.record("tok-a", "core", 200, headers(remaining=5000))
+    scheduler.record("tok-b", "core", 200, headers(remaining=10))
+    scheduler.record("tok-a", "core", 403, headers(remaining=4999, **{"Retry-After": "60"}))
+    assert await scheduler.acquire("core") == "tok-b"
+
+    scheduler.record("tok-b", "core", 200, headers(remaining=0))
+    with pytest.raises(RateLimitExceeded) as error:
+        await scheduler.acquire("core")
+    assert error.value.retry_after > 0
+
+def test_snapshot_masks_tokens():
+    scheduler = RateLimitScheduler(["ghp_secret1234"])
+    snapshot = scheduler.snapshot()
+    assert list(snapshot["tokens"]) == ["…1234"]
+    assert set(snapshot["tokens"]["…1234"]) == {"core", "search", "graphql"}
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.deps import get_github_service
+from app.core.config import settings
+from app.services.cache import TieredCache, cache_key
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpen
+from app.services.github_service import GitHubService, GitHubResponse, GitHubAPIError, GitHubUnavailable
+from app.services.revalidator import Revalidator
+from app.services import freshness
+from app.services.llm_service import LLMClient, LLMTimeout
+
+URL = "https://api.github.com/repos/a/b"
+
+def test_breaker_opens_probes_and_closes(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    breaker = CircuitBreaker("github", failure_threshold=2, reset_timeout=10)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpen) as error:
+        breaker.before_call()
+    assert error.value.retry_after == 10
+
+    clock[0] += 10
+    breaker.before_call()  # the single half-open probe
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock[0] += 10
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.counters["opened"] == 2
+
+async def expired_cache(seconds_ago):
+    cache = TieredCache(10)
+    await cache.set(cache_key(URL), {"stars": 1}, ttl=-seconds_ago, etag='"v1"')
+    return cache
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing_in_background(monkeypatch):
+    revalidator = Revalidator()
+    service = GitHubService(cache=await expired_cache(10), revalidator=revalidator)
+    refreshed = asyncio.Event()
+
+    async def fake_send(url, extra_headers=None):
+        assert extra_headers == {"If-None-Match": '"v1"'}
+        refreshed.set()
+        return GitHubResponse(200, {"stars": 2}, {})
+
+    monkeypatch.setattr(service, "_send", fake_send)
+    data, tracker = await freshness.tracked(lambda: service._make_request(URL))
+    assert data == {"stars": 1}
+    assert tracker.state == "stale" and tracker.stale_seconds >= 10
+
+    await asyncio.wait_for(refreshed.wait(), 1)
+    await asyncio.sleep(0)
+    assert await service._make_request(URL) == {"stars": 2}
+    assert revalidator.counters["refreshed"] == 1
+
+@pytest.mark.asyncio
+async def test_old_entry_is_served_stale_only_when_github_is_failing(monkeypatch):
+    old = settings.CACHE_STALE_WHILE_REVALIDATE + 60
+    service = GitHubService(cache=await expired_cache(old), revalidator=Revalidator())
+    errors = [GitHubUnavailable("GitHub API request timed out"), GitHubAPIError("Not Found (Status: 404)", 404)]
+
+    async def failing_send(url, extra_headers=None):
+        raise errors.pop(0)
+
+    monkeypatch.setattr(service, "_send", failing_send)
+    assert await service._make_request(URL) == {"stars": 1}
+    with pytest.raises(GitHubAPIError):
+        await service._make_request(URL)
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_calling_github(monkeypatch):
+    breaker = CircuitBreaker("github", failure_threshold=1, reset_timeout=30)
+    service = GitHubService(breakers={"core": breaker})
+    calls = []
+
+    async def down(url, extra_headers=None):
+        calls.append(url)
+        raise GitHubUnavailable("GitHub API request timed out")
+
+    monkeypatch.setattr(service, "_send_with_retries", down)
+    with pytest.raises(GitHubUnavailable):
+        await service._make_request(URL)
+    with pytest.raises(CircuitOpen):
+        await service._make_request(URL)
+    assert len(calls) == 1
+    # Search has its own circuit
+    assert breaker.state == "open" and "search" not in service.breakers
+
+def test_endpoints_report_freshness_and_503_on_open_circuit():
+    class FakeService:
+        def parse_repo_url(self, url):
+            return "a", "b"
+
+        async def get_repo_info(self, url):
+            freshness.note_stale(42)
+            return {"full_name": "a/b"}
+
+        async def calculate_vibe_score(self, owner, repo, days=30):
+            raise CircuitOpen("github", retry_after=12.5)
+
+    app.dependency_overrides[get_github_service] = lambda: FakeService()
+    try:
+        client = TestClient(app)
+        info = client.get("/api/v1/github/repo-info", params={"repo_url": "https://github.com/a/b"})
+        score = client.get("/api/v1/github/vibe-score", params={"owner": "a", "repo": "b"})
+    finally:
+        app.dependency_overrides.clear()
+    assert info.headers["X-Data-Freshness"] == "stale"
+    assert info.headers["X-Data-Stale-Seconds"] == "42"
+    assert score.status_code == 503 and score.headers["Retry-After"] == "13"
+
+@pytest.mark.asyncio
+async def test_llm_circuit_opens_after_timeouts():
+    async def hang(**kwargs):
+        await asyncio.sleep(1)
+
+    llm = LLMClient(breaker=CircuitBreaker("llm", failure_threshold=2, reset_timeout=30))
+    llm._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=hang)))
+    for _ in range(2):
+        with pytest.raises(LLMTimeout):
+            await llm.complete([], timeout=0.01)
+
+    async def rejected():
+        start = time.monotonic()
+        with pytest.raises(CircuitOpen):
+            await llm.complete([], timeout=5)
+        return time.monotonic() - start
+
+    elapsed, tracker = await freshness.tracked(rejected)
+    assert elapsed < 0.1 and tracker.degraded == {"llm"}
+    assert llm.counters["rejected"] == 1 and llm.stats()["circuit"]["state"] == "open"
@@ -0,0 +1,65 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.endpoints import roast
+from app.services.llm_service import llm_client, LLMTimeout
+from app.services.roast_batch import batch_messages, parse_batch_roasts
+from app.services.roast_cache import RoastCache
+
+client = TestClient(app)
+
+def test_parse_json_object_in_fences():
+    text = '```json\n{"1": "First roast.", "2": "  ", "3": "Third roast.", "9": "out of range"}\n```'
+    assert parse_batch_roasts(text, 3) == {0: "First roast.", 2: "Third roast."}
+
+def test_parse_json_list_and_prose():
+    text = 'Sure! Here you go: [{"id": 2, "roast": "Two."}, {"id": "1", "roast": "One."}] Enjoy.'
+    assert parse_batch_roasts(text, 2) == {0: "One.", 1: "Two."}
+
+def test_parse_numbered_lines_when_json_is_broken():
+    text = '{"1": "unterminated\n1. "One liner."\n2) Two liner.\n[3] Three liner.\nnot numbered'
+    assert parse_batch_roasts(text, 3) == {0: "One liner.", 1: "Two liner.", 2: "Three liner."}
+
+def test_batch_messages_number_every_repo():
+    prompt = batch_messages([("a", "x", 50, "meh"), ("b", "y", 90, "wow")])[1]["content"]
+    assert '1. a/x (Score: 50/100) starter: "meh"' in prompt
+    assert '2. b/y (Score: 90/100) starter: "wow"' in prompt
+
+def batch_body(count):
+    return {"repos": [
+        {"repo_name": f"repo{i}", "owner": "org", "vibe": "chill", "score": 10 * i, "stars": 5}
+        for i in range(count)
+    ]}
+
+def test_batch_packs_repos_and_falls_back_per_item(monkeypatch):
+    prompts = []
+
+    async def fake_complete(messages, max_tokens=60, temperature=0.4, timeout=None):
+        prompts.append(messages[1]["content"])
+        if len(prompts) == 2:
+            raise LLMTimeout("slow model")
+        # The model drops item 2 of each chunk
+        return json.dumps({"1": "AI one.", "3": "AI three."})
+
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "ROAST_BATCH_CHUNK_SIZE", 3)
+    monkeypatch.setattr(llm_client, "complete", fake_complete)
+    monkeypatch.setattr(roast, "roast_cache", RoastCache(max_entries=50, ttl=60, pool_size=2))
+
+    data = client.post("/api/v1/roast/batch", json=batch_body(5)).json()
+
+    assert data["llm_calls"] == 2 and len(prompts) == 2
+    assert [item["ai_enhanced"] for item in data["roasts"]] == [True, False, True, False, False]
+    assert data["roasts"][0]["roast"] == "AI one."
+    assert data["roasts"][1]["roast"] and data["roasts"][1]["cached"] is False  # template fallback
+    assert data["roasts"][4]["repo_name"] == "repo4"
+
+    # Parsed roasts went into the pools
+    again = client.post("/api/v1/roast/batch", json={"repos": batch_body(1)["repos"]}).json()
+    assert again["llm_calls"] == 0 and again["roasts"][0]["cached"] is True
+
+def test_batch_rejects_oversized_requests(monkeypatch):
+    monkeypatch.setattr(settings, "ROAST_BATCH_MAX_REPOS", 3)
+    assert client.post("/api/v1/roast/batch", json=batch_body(4)).status_code == 400
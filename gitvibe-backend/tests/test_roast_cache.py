@@ -0,0 +1,92 @@
+import asyncio
+import itertools
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.endpoints import roast
+from app.services.llm_service import llm_client
+from app.services.roast_cache import RoastCache, roast_key
+
+def test_key_buckets_small_metric_changes():
+    key = roast_key("Facebook", "React", "chill", 81.5, 210_000, 700, 2)
+    assert key == roast_key("facebook", "react", "chill", 87.0, 230_000, 950, 5)
+    assert key != roast_key("facebook", "react", "chill", 91.0, 230_000, 950, 5)
+    assert key != roast_key("facebook", "react", "chill", 81.5, 210_000, 1200, 2)
+
+def test_pool_rotates_and_expires():
+    cache = RoastCache(max_entries=10, ttl=60, pool_size=2)
+    cache.add("k", "one")
+    cache.add("k", "two")
+    cache.add("k", "three")  # pool is full
+    assert [cache.get("k") for _ in range(3)] == ["one", "two", "one"]
+
+    expired = RoastCache(max_entries=10, ttl=-1, pool_size=2)
+    expired.add("k", "one")
+    assert expired.get("k") is None
+    assert expired.counters["misses"] == 1
+
+def test_cache_is_bounded():
+    cache = RoastCache(max_entries=2, ttl=60, pool_size=1)
+    for key in ("a", "b", "c"):
+        cache.add(key, key)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+
+@pytest.mark.asyncio
+async def test_refill_waits_for_idle_and_fills_pool(monkeypatch):
+    monkeypatch.setattr(settings, "ROAST_REFILL_IDLE_DELAY", 0.01)
+    idle = False
+    cache = RoastCache(max_entries=10, ttl=60, pool_size=3, is_idle=lambda: idle)
+    counter = itertools.count()
+
+    async def generate():
+        return f"roast {next(counter)}"
+
+    cache.add("k", "first")
+    cache.schedule_refill("k", generate)
+    await asyncio.sleep(0.05)
+    assert cache.size("k") == 1  # busy: nothing generated yet
+
+    idle = True
+    await asyncio.sleep(0.05)
+    assert cache.size("k") == 3
+    assert cache.pending_refills() == 0
+    assert cache.counters["refilled"] == 2
+    await cache.close()
+
+@pytest.mark.asyncio
+async def test_refill_stops_on_duplicates():
+    cache = RoastCache(max_entries=10, ttl=60, pool_size=3)
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        return "same"
+
+    cache.add("k", "same")
+    cache.schedule_refill("k", generate)
+    await asyncio.sleep(0.05)
+    assert len(calls) == 1
+    assert cache.pending_refills() == 0
+    await cache.close()
+
+def test_generate_serves_repeat_roasts_from_the_pool(monkeypatch):
+    calls = []
+
+    async def fake_complete(messages, max_tokens=60, temperature=0.4, timeout=None):
+        calls.append(temperature)
+        return f"AI roast {len(calls)}"
+
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(llm_client, "complete", fake_complete)
+    monkeypatch.setattr(roast, "roast_cache", RoastCache(max_entries=10, ttl=60, pool_size=1))
+
+    client = TestClient(app)
+    params = {"repo_name": "react", "owner": "facebook", "vibe": "chill", "score": 80, "stars": 5}
+    first = client.get("/api/v1/roast/generate", params=params).json()
+    second = client.get("/api/v1/roast/generate", params={**params, "stars": 7}).json()
+
+    assert first["roast"] == second["roast"] == "AI roast 1"
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert len(calls) == 1
@@ -0,0 +1,92 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.endpoints import roast
+from app.services.llm_service import LLMClient, LLMTimeout
+from app.services.roast_cache import RoastCache
+
+class FakeStream:
+    """Stand-in for openai.AsyncStream yielding one chunk per token"""
+    def __init__(self, tokens, delay):
+        self.tokens = tokens
+        self.delay = delay
+        self.closed = False
+
+    async def __aiter__(self):
+        for token in self.tokens:
+            await asyncio.sleep(self.delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+    async def close(self):
+        self.closed = True
+
+class FakeCompletions:
+    def __init__(self, tokens, delay=0.0):
+        self.tokens = tokens
+        self.delay = delay
+        self.streams = []
+
+    async def create(self, stream=False, **kwargs):
+        assert stream
+        self.streams.append(FakeStream(self.tokens, self.delay))
+        return self.streams[-1]
+
+def fake_llm(tokens, delay=0.0):
+    llm = LLMClient(max_concurrency=2)
+    completions = FakeCompletions(tokens, delay)
+    llm._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return llm, completions
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+@pytest.mark.asyncio
+async def test_stream_yields_tokens():
+    llm, _ = fake_llm(["Nice ", "repo", "."])
+    assert [token async for token in llm.stream([], timeout=1)] == ["Nice ", "repo", "."]
+    assert llm.in_flight() == 0
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_stops_the_generation():
+    llm, completions = fake_llm(["a", "b", "c"], delay=0.01)
+    tokens = llm.stream([], timeout=1)
+    assert await tokens.__anext__() == "a"
+    await tokens.aclose()
+    assert completions.streams[0].closed
+    assert llm.counters["cancelled"] == 1
+    assert llm.in_flight() == 0
+
+@pytest.mark.asyncio
+async def test_slow_first_token_times_out(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_TIMEOUT_SECONDS", 0.05)
+    llm, completions = fake_llm(["late"], delay=1)
+    with pytest.raises(LLMTimeout):
+        [token async for token in llm.stream([], timeout=5)]
+    assert completions.streams[0].closed
+
+def test_stream_endpoint_sends_template_first(monkeypatch):
+    llm, _ = fake_llm(["Roasted", " well."])
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(roast, "llm_client", llm)
+    monkeypatch.setattr(roast, "roast_cache", RoastCache(max_entries=10, ttl=60, pool_size=1))
+
+    client = TestClient(app)
+    params = {"repo_name": "react", "owner": "facebook", "vibe": "chill", "score": 80}
+    response = client.get("/api/v1/roast/stream", params=params)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["template", "token", "token", "done"]
+    assert events[-1][1] == {"roast": "Roasted well.", "ai_enhanced": True, "cached": False}
+
+    # The finished roast went into the pool
+    events = parse_events(client.get("/api/v1/roast/stream", params=params).text)
+    assert [name for name, _ in events] == ["template", "done"]
+    assert events[-1][1]["cached"] is True
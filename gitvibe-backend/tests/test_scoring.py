@@ -0,0 +1,55 @@
+import json
+import random
+from datetime import datetime, timedelta
+import numpy as np
+from app.services.scoring import score_repo, score_records, repo_record, round1, competition_rank
+
+NOW = datetime(2024, 6, 1, 12, 30, 15, 250000)
+
+def record(owner, repo, stars, issues, commits, pushed, pending=False):
+    info = {"pushed_at": pushed.strftime("%Y-%m-%dT%H:%M:%SZ"), "stargazers_count": stars, "open_issues_count": issues}
+    stats = {"commit_activity": {"total_commits": commits}, "pending": pending}
+    return owner, repo, info, stats
+
+def random_records(n, seed=7):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        pushed = NOW - timedelta(seconds=rng.randint(-86400, 40 * 86400))
+        records.append(record(
+            rng.choice(["torvalds", "org", "someone"]), rng.choice(["linux", f"repo{i}"]),
+            rng.choice([0, 5, 9, rng.randint(0, 5000)]), rng.choice([0, 201, rng.randint(0, 400)]),
+            rng.randint(0, 80), pushed, rng.random() < 0.1
+        ))
+    return records
+
+def test_batch_matches_per_repo_scoring():
+    records = random_records(2000)
+    # Threshold boundaries: 80, 60, 40, 20 exactly
+    records += [
+        record("a", "b", 1000, 0, 50, NOW),
+        record("a", "c", 0, 0, 50, NOW - timedelta(days=20)),
+        record("a", "d", 0, 0, 50, NOW - timedelta(days=20, hours=-1)),
+        record("a", "e", 500, 0, 25, NOW - timedelta(days=20)),
+        # Capped popularity
+        record("a", "f", 1000, 0, 5, NOW),
+        record("a", "g", 250000, 0, 5, NOW),
+    ]
+    batch = score_records([repo_record(*r) for r in records], now=NOW)
+    expected = [score_repo(*r, now=NOW) for r in records]
+    assert batch.to_dicts() == expected
+    # Same JSON too: 100 and 100.0 compare equal but serialize differently
+    for got, want in zip(batch.to_dicts(), expected):
+        assert json.dumps(got) == json.dumps(want)
+
+def test_round1_matches_python_round():
+    values = [0.05, 0.15, 0.25, 0.35, 2.675, 1.45, 64.05, 99.95, 12.25, 0.3 * 0.5 + 0.1]
+    values += [random.Random(1).uniform(0, 100) for _ in range(1000)]
+    assert round1(np.array(values)).tolist() == [round(v, 1) for v in values]
+
+def test_ranks_share_ties_and_follow_score():
+    assert competition_rank(np.array([50.0, 80.0, 50.0, 10.0])).tolist() == [2, 1, 2, 4]
+    batch = score_records([repo_record(*r) for r in random_records(50)], now=NOW)
+    ordered = batch.score[batch.order()]
+    assert (np.diff(ordered) <= 0).all()
+    assert batch.rank[batch.order()[0]] == 1
@@ -0,0 +1,109 @@
+import asyncio
+import re
+import pytest
+from app.core.config import settings
+from app.services.github_service import GitHubService
+from app.services.search_service import SearchService, RepoIndex, normalize_query
+
+def hit(full_name, stars, description=""):
+    owner, name = full_name.split("/")
+    return {
+        "id": hash(full_name), "name": name, "full_name": full_name, "description": description,
+        "html_url": f"https://github.com/{full_name}", "stargazers_count": stars, "forks_count": 0,
+        "language": None, "owner": {"login": owner, "avatar_url": ""},
+    }
+
+class FakeGitHub:
+    """Answers search pages from a fixed corpus and records upstream queries"""
+    def __init__(self, corpus, delay=0.0):
+        self.corpus = corpus
+        self.delay = delay
+        self.queries = []
+
+    async def search_repositories_page(self, query, per_page):
+        self.queries.append(query)
+        await asyncio.sleep(self.delay)
+        found = sorted(
+            (item for item in self.corpus if all(w in f"{item['full_name']} {item['description']}".lower() for w in query.split())),
+            key=lambda item: -item["stargazers_count"]
+        )
+        return found[:per_page], len(found)
+
+CORPUS = [
+    hit("facebook/react", 220000, "UI library"),
+    hit("remix-run/react-router", 52000, "Declarative routing for React"),
+    hit("reactjs/redux", 60000, "State container"),
+    hit("vuejs/vue", 200000, "Progressive framework"),
+]
+
+def test_normalize_query():
+    assert normalize_query("  React   Router ") == "react router"
+
+def test_search_url_is_encoded():
+    url = GitHubService()._search_url("c++ language:c#", 5)
+    assert "q=c%2B%2B+language%3Ac%23&" in url
+
+def test_index_ranks_prefix_matches_by_stars():
+    index = RepoIndex(max_repos=3)
+    index.add(CORPUS)
+    assert len(index) == 3  # least starred repo (react-router) dropped
+    assert [r["full_name"] for r in index.prefix("re", 5)] == ["facebook/react", "reactjs/redux"]
+    assert [r["full_name"] for r in index.prefix("facebook/", 5)] == ["facebook/react"]
+
+@pytest.mark.asyncio
+async def test_prefix_extensions_and_index_avoid_github(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_DEBOUNCE_SECONDS", 0)
+    github = FakeGitHub(CORPUS)
+    search = SearchService()
+
+    first = await search.search(github, "React", limit=5)
+    assert first["source"] == "github" and len(first["items"]) == 3
+    # "react" was complete (3 matches <= fetch size), so extensions filter it locally
+    router = await search.search(github, "react rout", limit=1)
+    assert router["source"] == "prefix"
+    assert [r["full_name"] for r in router["items"]] == ["remix-run/react-router"]
+    # Seen repos answer name prefixes from the index
+    assert (await search.search(github, "fac", limit=1))["source"] == "index"
+    assert (await search.search(github, "REACT", limit=2))["source"] == "exact"
+    assert github.queries == ["react"]
+
+@pytest.mark.asyncio
+async def test_burst_only_fetches_the_last_keystroke(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_DEBOUNCE_SECONDS", 0.05)
+    github = FakeGitHub(CORPUS, delay=0.01)
+    search = SearchService()
+
+    async def type_ahead(text):
+        calls = []
+        for i in range(1, len(text) + 1):
+            calls.append(asyncio.ensure_future(search.search(github, text[:i])))
+            await asyncio.sleep(0.01)
+        return await asyncio.gather(*calls)
+
+    results, same = await asyncio.gather(type_ahead("vue"), search.search(github, "vue"))
+    assert github.queries == ["vue"]
+    assert [r["source"] for r in results[:2]] == ["debounced", "debounced"]
+    assert results[2]["items"][0]["full_name"] == same["items"][0]["full_name"] == "vuejs/vue"
+
+class TermGitHub(FakeGitHub):
+    """Matches whole terms, as GitHub search does"""
+    async def search_repositories_page(self, query, per_page):
+        self.queries.append(query)
+        found = [
+            item for item in self.corpus
+            if all(w in re.split(r"[^a-z0-9]+", f"{item['full_name']} {item['description']}".lower()) for w in query.split())
+        ]
+        return found[:per_page], len(found)
+
+@pytest.mark.asyncio
+async def test_short_prefix_answers_go_to_github(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_DEBOUNCE_SECONDS", 0)
+    github = TermGitHub([hit("someone/xyzab", 10), hit("other/tool", 5, "xyzabc helper")])
+    search = SearchService()
+
+    assert len((await search.search(github, "xyzab", limit=5))["items"]) == 1
+    # "xyzab" was complete but GitHub matches terms: "xyzabc" finds a repo it did not
+    longer = await search.search(github, "xyzabc", limit=5)
+    assert longer["source"] == "github"
+    assert [r["full_name"] for r in longer["items"]] == ["other/tool"]
+    assert github.queries == ["xyzab", "xyzabc"]
@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from app.services.singleflight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"stars": 42}
+
+    results = await asyncio.gather(*(flights.do("repo", fetch) for _ in range(10)))
+    assert calls == 1
+    assert all(result == {"stars": 42} for result in results)
+    assert flights.counters == {"leaders": 1, "shared": 9}
+    assert flights.in_flight() == 0
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_waiter():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(flights.do("k", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_the_shared_call_running():
+    flights = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(flights.do("k", slow))
+    second = asyncio.ensure_future(flights.do("k", slow))
+    await started.wait()
+    first.cancel()
+    assert await second == "done"
+    assert first.cancelled()
+
+@pytest.mark.asyncio
+async def test_shared_call_is_cancelled_when_all_waiters_leave():
+    flights = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.ensure_future(flights.do("k", slow))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    assert flights.in_flight() == 0
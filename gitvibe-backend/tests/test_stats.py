@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from app.core.config import settings
+from app.services.cache import TieredCache
+from app.services.github_service import GitHubService, GitHubResponse
+from app.services.stats import StatsWarmer
+
+@pytest.mark.asyncio
+async def test_202_serves_pending_stats_and_warms_cache(monkeypatch):
+    monkeypatch.setattr(settings, "STATS_POLL_INITIAL_DELAY", 0.01)
+    weeks = [{"week": 2_000_000_000, "days": [1, 0, 0, 0, 0, 0, 0], "total": 1}]
+    computing = {"done": False}
+
+    async def fake_send(url, extra_headers=None):
+        if "commit_activity" in url:
+            if not computing["done"]:
+                computing["done"] = True
+                return GitHubResponse(202, None, {})
+            return GitHubResponse(200, weeks, {})
+        return GitHubResponse(200, {"total_count": 3}, {})
+
+    warmer = StatsWarmer()
+    service = GitHubService(cache=TieredCache(10), warmer=warmer)
+    monkeypatch.setattr(service, "_send", fake_send)
+
+    stats = await service.get_repo_stats("a", "b")
+    assert stats["pending"] is True
+    assert stats["commit_activity"]["total_commits"] == 0
+    assert warmer.pending() == 1
+
+    for _ in range(100):
+        if warmer.pending() == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert warmer.counters["warmed"] == 1
+
+    stats = await service.get_repo_stats("a", "b")
+    assert stats["pending"] is False
+    assert stats["commit_activity"]["total_commits"] == 1
+
+@pytest.mark.asyncio
+async def test_empty_repo_scores_without_commit_activity(monkeypatch):
+    async def fake_send(url, extra_headers=None):
+        if "commit_activity" in url or "/contributors" in url:
+            return GitHubResponse(204, None, {})
+        if "/search/issues" in url:
+            return GitHubResponse(200, {"total_count": 0}, {})
+        return GitHubResponse(200, {
+            "name": "b", "full_name": "a/b", "description": None, "html_url": "https://github.com/a/b",
+            "language": None, "stargazers_count": 0, "forks_count": 0, "open_issues_count": 0,
+            "subscribers_count": 0, "created_at": "2024-01-01T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z",
+            "pushed_at": "2024-01-01T00:00:00Z", "license": None,
+        }, {})
+
+    service = GitHubService(cache=TieredCache(10))
+    monkeypatch.setattr(service, "_send", fake_send)
+    score = await service.calculate_vibe_score("a", "b")
+    assert score["stats"]["total_commits"] == 0
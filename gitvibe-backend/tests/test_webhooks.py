@@ -0,0 +1,97 @@
+import asyncio
+import hashlib
+import hmac
+import json
+from pathlib import Path
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.deps import get_github_service
+from app.core.config import settings
+from app.services.cache import TieredCache
+from app.services.github_service import GitHubService
+from app.services.roast_cache import RoastCache, roast_key
+from app.services.webhooks import webhooks
+
+FIXTURES = Path(__file__).parent / "fixtures" / "webhooks"
+SECRET = "It's a Secret to Everybody"
+PARTS = ("info", "contributors", "commit_activity", "open_issues", "open_prs")
+
+def delivery(event):
+    body = (FIXTURES / f"{event}.json").read_bytes()
+    signature = "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return body, {"X-GitHub-Event": event, "X-Hub-Signature-256": signature, "Content-Type": "application/json"}
+
+@pytest.fixture
+def repo_caches(monkeypatch):
+    """A service whose cache holds every part of octo-org/hello-world and of another repo"""
+    service = GitHubService(cache=TieredCache(100))
+    roasts = RoastCache()
+
+    async def fill():
+        for owner, repo in (("octo-org", "hello-world"), ("octo-org", "other")):
+            keys = service.repo_cache_keys(owner, repo)
+            for part in PARTS:
+                await service.cache.set(keys[part], {"stargazers_count": 1337, "open_issues_count": 17}, ttl=3600, etag='"v1"')
+            roasts.add(roast_key(owner, repo, "chill", 80, 1337, 17, 1), f"{repo} roast")
+
+    asyncio.run(fill())
+    monkeypatch.setattr(settings, "GITHUB_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(webhooks, "roasts", roasts)
+    app.dependency_overrides[get_github_service] = lambda: service
+    yield service, roasts
+    app.dependency_overrides.clear()
+
+def cached(service, repo="hello-world"):
+    """Each part's (value, fresh, etag), as the next lookup would see it"""
+    keys = service.repo_cache_keys("octo-org", repo)
+    entries = {part: service.cache.l1.get(keys[part]) for part in PARTS}
+    return {part: (entry.value, entry.is_fresh(), entry.etag) for part, entry in entries.items()}
+
+@pytest.mark.parametrize("event, updated, invalidated, roasts_dropped", [
+    ("star", {"stargazers_count": 1338, "open_issues_count": 17}, [], 0),
+    ("issues", {"stargazers_count": 1338, "open_issues_count": 18}, ["open_issues"], 0),
+    ("push", None, ["info", "contributors", "commit_activity"], 1),
+    ("release", None, ["info"], 1),
+])
+def test_events_touch_only_the_affected_entries(repo_caches, event, updated, invalidated, roasts_dropped):
+    service, roasts = repo_caches
+    other_before = cached(service, "other")
+    body, headers = delivery(event)
+    response = TestClient(app).post("/api/v1/webhooks/github", content=body, headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["repository"] == "Octo-Org/Hello-World"
+    assert data["invalidated"] == invalidated and data["roast_pools_dropped"] == roasts_dropped
+    after = cached(service)
+    for part in PARTS:
+        value, fresh, etag = after[part]
+        # Invalidated entries keep their ETag, so the refetch is a conditional request
+        assert etag == '"v1"' and fresh == (part not in invalidated)
+    if updated is not None:
+        assert data["updated"] == ["info"] and after["info"][0] == {**updated, "watchers_count": 1338, "forks_count": 212}
+    assert len(roasts._pools) == 2 - roasts_dropped
+    assert cached(service, "other") == other_before
+
+def test_irrelevant_actions_are_ignored(repo_caches):
+    service, _ = repo_caches
+    before = cached(service)
+    body, headers = delivery("pull_request")  # "labeled" changes nothing we cache
+    response = TestClient(app).post("/api/v1/webhooks/github", content=body, headers=headers)
+    assert response.json()["data"]["ignored"] is True
+    assert cached(service) == before
+
+def test_unsigned_or_tampered_deliveries_are_rejected(repo_caches, monkeypatch):
+    service, _ = repo_caches
+    before = cached(service)
+    client = TestClient(app)
+    body, headers = delivery("star")
+    tampered = body.replace(b"1338", b"9999")
+    assert client.post("/api/v1/webhooks/github", content=tampered, headers=headers).status_code == 401
+    del headers["X-Hub-Signature-256"]
+    assert client.post("/api/v1/webhooks/github", content=body, headers=headers).status_code == 401
+    assert cached(service) == before
+
+    monkeypatch.setattr(settings, "GITHUB_WEBHOOK_SECRET", "")
+    assert client.post("/api/v1/webhooks/github", content=body, headers=delivery("star")[1]).status_code == 404